@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class AnalysisStore:
+    """In-memory analyses keyed by session ID, expiring after a TTL and evicted LRU-first past a memory budget"""
+
+    def __init__(self, ttl_seconds: float = 3600, max_items: int = 1000, max_bytes: int = 256 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    @staticmethod
+    def estimate_size(entry: dict) -> int:
+        """Rough footprint of an entry; the document texts dominate"""
+        return 1024 + sum(len(value) for value in entry.values() if isinstance(value, str))
+
+    def put(self, session_id: str, entry: dict):
+        size = self.estimate_size(entry)
+        with self._lock:
+            self._discard(session_id)
+            self._entries[session_id] = (time.monotonic() + self.ttl_seconds, size, entry)
+            self._bytes += size
+            self._evict()
+
+    def get(self, session_id: str):
+        """Return the stored entry, or None if it never existed, expired or was evicted"""
+        with self._lock:
+            item = self._entries.get(session_id)
+            if item is None:
+                self._stats['misses'] += 1
+                return None
+            if item[0] < time.monotonic():
+                self._discard(session_id)
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self._stats['hits'] += 1
+            return item[2]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'items': len(self._entries), 'bytes': self._bytes}
+
+    def _discard(self, session_id: str):
+        item = self._entries.pop(session_id, None)
+        if item is not None:
+            self._bytes -= item[1]
+
+    def _evict(self):
+        # Drop expired entries first, then least recently used ones until within budget
+        now = time.monotonic()
+        for session_id in [key for key, item in self._entries.items() if item[0] < now]:
+            self._discard(session_id)
+            self._stats['expired'] += 1
+        while self._entries and (len(self._entries) > self.max_items or self._bytes > self.max_bytes):
+            session_id = next(iter(self._entries))
+            self._discard(session_id)
+            self._stats['evictions'] += 1
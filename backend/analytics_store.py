@@ -0,0 +1,248 @@
+import os
+import threading
+
+import numpy as np
+
+from keyword_table import KeywordTable
+
+# Fixed-width columns, one value per analysis. history_id is written last and
+# its length is the committed row count, so a partly written append is ignored.
+COLUMNS = {
+    'created_at': np.int64,
+    'jd_id': np.int32,
+    'match_score': np.float32,
+    'ats_score': np.float32,
+    'completeness_score': np.float32,
+    'action_verbs_score': np.float32,
+    'quantifiable_impact_score': np.float32,
+    'matched_end': np.int64,
+    'missing_end': np.int64,
+    'history_id': np.int64
+}
+
+# Keyword lists stored as flat KeywordTable ID arrays; row i owns ids[end[i-1]:end[i]]
+KEYWORD_LISTS = ('matched', 'missing')
+
+SCORE_COLUMNS = ('match_score', 'ats_score', 'completeness_score', 'action_verbs_score', 'quantifiable_impact_score')
+
+
+class _StringTable:
+    """Append-only string <-> integer ID table persisted one value per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.values = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.values = [line.rstrip('\n') for line in f]
+        self.ids = {value: i for i, value in enumerate(self.values)}
+
+    def intern(self, value: str) -> int:
+        value = value.replace('\n', ' ')
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(value + '\n')
+            self.values.append(value)
+            self.ids[value] = value_id
+        return value_id
+
+
+class AnalyticsStore:
+    """Columnar copy of analysis history for aggregate queries.
+
+    Each column is a raw NumPy file that is only ever appended to and is read
+    through a memory map, so a query touches just the columns it needs and
+    never parses JSON. Keywords are stored as their KeywordTable IDs, the same
+    ones history rows are packed with, and JD file names are interned here.
+    Rows are appended in history ID order; appending a row whose history ID is
+    not newer than the last one stored is a no-op, so catching up from the
+    database is idempotent.
+    """
+
+    def __init__(self, directory: str, keyword_table: KeywordTable):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.keyword_table = keyword_table
+        self._discard_legacy_keywords()
+        self.job_descriptions = _StringTable(os.path.join(directory, 'job_descriptions.txt'))
+        self._lock = threading.Lock()
+        self._count = self._recover()
+
+    def __len__(self):
+        return self._count
+
+    def last_history_id(self) -> int:
+        with self._lock:
+            if not self._count:
+                return 0
+            return int(self._column('history_id', self._count)[-1])
+
+    def append(self, rows: list) -> int:
+        """Store analysis rows ({'history_id', 'created_at', 'jd_filename', scores..., 'matched', 'missing'}).
+
+        'matched' and 'missing' are keyword ID lists from the KeywordTable.
+        Returns how many were new.
+        """
+        with self._lock:
+            last = int(self._column('history_id', self._count)[-1]) if self._count else 0
+            rows = [row for row in rows if row['history_id'] > last]
+            if not rows:
+                return 0
+
+            columns = {
+                'created_at': [row['created_at'] for row in rows],
+                'jd_id': [self.job_descriptions.intern(row['jd_filename']) for row in rows],
+                'history_id': [row['history_id'] for row in rows]
+            }
+            for name in SCORE_COLUMNS:
+                columns[name] = [row[name] or 0.0 for row in rows]
+
+            # Variable-length keyword IDs go first; the end offsets that expose them are written after
+            for kind in KEYWORD_LISTS:
+                ids = [keyword_id for row in rows for keyword_id in row[kind]]
+                offset = int(self._column(f'{kind}_end', self._count)[-1]) if self._count else 0
+                columns[f'{kind}_end'] = offset + np.cumsum([len(row[kind]) for row in rows])
+                with open(self._path(f'{kind}_ids'), 'ab') as f:
+                    np.asarray(ids, dtype=np.int32).tofile(f)
+
+            for name, dtype in COLUMNS.items():
+                with open(self._path(name), 'ab') as f:
+                    np.asarray(columns[name], dtype=dtype).tofile(f)
+
+            self._count += len(rows)
+            return len(rows)
+
+    def missing_skills(self, jd_filename: str = None, since: float = None, limit: int = 20) -> dict:
+        """Keywords most often missing from resumes, optionally for one JD and/or after a unix time"""
+        return self._keyword_counts('missing', jd_filename, since, limit)
+
+    def matched_skills(self, jd_filename: str = None, since: float = None, limit: int = 20) -> dict:
+        """Keywords most often matched, with the same filters as missing_skills"""
+        return self._keyword_counts('matched', jd_filename, since, limit)
+
+    def score_distribution(self, column: str = 'match_score', since: float = None, jd_filename: str = None,
+                           bins: int = 10) -> dict:
+        """Histogram over 0-100 and summary statistics for one score column"""
+        if column not in SCORE_COLUMNS:
+            raise ValueError(f"Unknown score column: {column}")
+
+        count, mask = self._select(jd_filename, since)
+        scores = self._column(column, count) if count else np.empty(0, dtype=np.float32)
+        if mask is not None:
+            scores = scores[mask]
+
+        counts, edges = np.histogram(scores, bins=bins, range=(0, 100))
+        result = {
+            'column': column,
+            'analyses': int(len(scores)),
+            'buckets': [
+                {'from': round(float(low), 2), 'to': round(float(high), 2), 'count': int(n)}
+                for low, high, n in zip(edges[:-1], edges[1:], counts)
+            ]
+        }
+        if len(scores):
+            p50, p90 = np.percentile(scores, [50, 90])
+            result.update({
+                'mean': round(float(scores.mean(dtype=np.float64)), 2),
+                'median': round(float(p50), 2),
+                'p90': round(float(p90), 2),
+                'min': round(float(scores.min()), 2),
+                'max': round(float(scores.max()), 2)
+            })
+        return result
+
+    def stats(self) -> dict:
+        # No lock: append() holds it while writing column files, and sizes are fine to read mid-append
+        return {
+            'rows': self._count,
+            'keywords': len(self.keyword_table),
+            'job_descriptions': len(self.job_descriptions.values)
+        }
+
+    def _keyword_counts(self, kind: str, jd_filename: str, since: float, limit: int) -> dict:
+        count, mask = self._select(jd_filename, since)
+        if not count:
+            return {'analyses': 0, 'skills': []}
+
+        ends = self._column(f'{kind}_end', count)
+        total = int(ends[-1])
+        ids = self._column(f'{kind}_ids', total) if total else np.empty(0, dtype=np.int32)
+        if mask is not None:
+            # Expand the row mask to one flag per stored keyword ID
+            lengths = np.diff(ends, prepend=0)
+            ids = ids[np.repeat(mask, lengths)]
+            analyses = int(mask.sum())
+        else:
+            analyses = count
+
+        counts = np.bincount(ids)
+        top = [keyword_id for keyword_id in np.argsort(-counts, kind='stable')[:limit].tolist()
+               if counts[keyword_id] > 0]
+        return {
+            'analyses': analyses,
+            'skills': [
+                {
+                    'keyword': keyword,
+                    'count': int(counts[keyword_id]),
+                    'share': round(float(counts[keyword_id]) / analyses, 4) if analyses else 0.0
+                }
+                for keyword_id, keyword in zip(top, self.keyword_table.keywords(top))
+            ]
+        }
+
+    def _select(self, jd_filename: str, since: float) -> tuple:
+        """(committed row count, boolean row mask or None for all rows)"""
+        with self._lock:
+            count = self._count
+        mask = None
+        if jd_filename is not None:
+            jd_id = self.job_descriptions.ids.get(jd_filename)
+            if jd_id is None or not count:
+                return count, np.zeros(count, dtype=bool)
+            mask = self._column('jd_id', count) == jd_id
+        if since is not None and count:
+            recent = self._column('created_at', count) >= since
+            mask = recent if mask is None else mask & recent
+        return count, mask
+
+    def _column(self, name: str, length: int) -> np.ndarray:
+        dtype = np.int32 if name.endswith('_ids') else COLUMNS[name]
+        return np.memmap(self._path(name), dtype=dtype, mode='r', shape=(length,))
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.bin')
+
+    def _discard_legacy_keywords(self):
+        """Drop columns written when the store kept its own keywords.txt IDs.
+
+        The store is only a copy of analysis history, so it is emptied and
+        the next sync rebuilds it with KeywordTable IDs.
+        """
+        legacy = os.path.join(self.directory, 'keywords.txt')
+        if not os.path.exists(legacy):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.bin'):
+                os.remove(os.path.join(self.directory, name))
+        os.remove(legacy)
+
+    def _recover(self) -> int:
+        """Committed row count; trims whatever an interrupted append left past it"""
+        path = self._path('history_id')
+        count = os.path.getsize(path) // np.dtype(np.int64).itemsize if os.path.exists(path) else 0
+        for name, dtype in COLUMNS.items():
+            self._truncate(self._path(name), count * np.dtype(dtype).itemsize)
+        for kind in KEYWORD_LISTS:
+            total = int(self._column(f'{kind}_end', count)[-1]) if count else 0
+            self._truncate(self._path(f'{kind}_ids'), total * np.dtype(np.int32).itemsize)
+        return count
+
+    @staticmethod
+    def _truncate(path: str, size: int):
+        if not os.path.exists(path):
+            open(path, 'wb').close()
+        elif os.path.getsize(path) > size:
+            with open(path, 'r+b') as f:
+                f.truncate(size)
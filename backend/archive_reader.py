@@ -0,0 +1,90 @@
+import os
+import tarfile
+import zipfile
+
+SUPPORTED_SUFFIXES = ('.pdf', '.docx')
+
+
+def iter_archive_members(path: str, max_member_bytes: int, max_members: int):
+    """Iterate {'name', 'content', 'error'} for each file in a ZIP or tar archive, one at a time.
+
+    Only the member being yielded is held in memory. Problems with a single
+    member (wrong type, too large, unreadable) are yielded as errors so the
+    caller can carry on; an archive that cannot be opened at all raises
+    ValueError.
+    """
+    if zipfile.is_zipfile(path):
+        members = _iter_zip(path, max_member_bytes)
+    elif tarfile.is_tarfile(path):
+        members = _iter_tar(path, max_member_bytes)
+    else:
+        raise ValueError("Archive must be a ZIP or tar file")
+    return _limit_members(members, max_members)
+
+
+def _limit_members(members, max_members: int):
+    count = 0
+    for member in members:
+        if count >= max_members:
+            members.close()
+            yield {'name': None, 'content': None,
+                   'error': f"Archive has more than {max_members} files; the rest were skipped"}
+            return
+        count += 1
+        yield member
+
+
+def _check_member(name: str, size: int, max_member_bytes: int):
+    if not name.lower().endswith(SUPPORTED_SUFFIXES):
+        return "Only PDF and DOCX files are supported"
+    if size > max_member_bytes:
+        return f"File exceeds the {max_member_bytes} byte limit"
+    return None
+
+
+def _is_junk(name: str) -> bool:
+    # Resource forks and metadata that macOS adds when zipping a folder
+    return name.startswith('__MACOSX/') or os.path.basename(name).startswith('._')
+
+
+def _iter_zip(path: str, max_member_bytes: int):
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.is_dir() or _is_junk(info.filename):
+                continue
+
+            error = _check_member(info.filename, info.file_size, max_member_bytes)
+            if error is None:
+                try:
+                    with archive.open(info) as f:
+                        # Don't trust the declared size of a compressed member
+                        content = f.read(max_member_bytes + 1)
+                    if len(content) > max_member_bytes:
+                        error = f"File exceeds the {max_member_bytes} byte limit"
+                except Exception as e:
+                    error = f"Could not read file from archive: {str(e)}"
+
+            if error is not None:
+                yield {'name': info.filename, 'content': None, 'error': error}
+            else:
+                yield {'name': info.filename, 'content': content, 'error': None}
+
+
+def _iter_tar(path: str, max_member_bytes: int):
+    # Stream mode reads members sequentially instead of indexing the whole archive first
+    with tarfile.open(path, mode='r|*') as archive:
+        for info in archive:
+            if not info.isfile() or _is_junk(info.name):
+                continue
+
+            error = _check_member(info.name, info.size, max_member_bytes)
+            if error is None:
+                try:
+                    content = archive.extractfile(info).read()
+                except Exception as e:
+                    error = f"Could not read file from archive: {str(e)}"
+
+            if error is not None:
+                yield {'name': info.name, 'content': None, 'error': error}
+            else:
+                yield {'name': info.name, 'content': content, 'error': None}
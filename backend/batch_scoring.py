@@ -0,0 +1,161 @@
+import numpy as np
+
+# Quality check weights applied in calculate_match_score, in the order they are summed
+QUALITY_COLUMNS = ('ats_score', 'completeness_score', 'action_verbs_score', 'quantifiable_impact_score')
+QUALITY_WEIGHTS = np.array([0.15, 0.10, 0.10, 0.15])
+
+
+class KeywordVocabulary:
+    """Fixed keyword -> column index mapping shared by resume and JD vectors"""
+
+    def __init__(self, keywords=()):
+        self.index = {}
+        self.keywords = []
+        for keyword in keywords:
+            self.add(keyword)
+
+    def add(self, keyword: str) -> int:
+        column = self.index.get(keyword)
+        if column is None:
+            column = len(self.keywords)
+            self.index[keyword] = column
+            self.keywords.append(keyword)
+        return column
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def encode(self, skill_sets) -> np.ndarray:
+        """Encode keyword collections as a dense boolean matrix, one row per document"""
+        rows = []
+        cols = []
+        for row, skills in enumerate(skill_sets):
+            for keyword in skills:
+                rows.append(row)
+                cols.append(self.add(keyword))
+
+        matrix = np.zeros((len(skill_sets), len(self)), dtype=bool)
+        matrix[rows, cols] = True
+        return matrix
+
+
+class ComparisonResult:
+    """One resume's summary in a comparison or bulk screen.
+
+    Slotted because a bulk run holds one per resume until the response is
+    built; to_dict() produces the API form. near_duplicates is left out of
+    the API form when it was never checked (None).
+    """
+
+    __slots__ = ('filename', 'match_score', 'matched_keywords_count', 'missing_keywords_count',
+                 'ats_score', 'completeness_score', 'near_duplicates')
+
+    def __init__(self, filename: str, match_score: float, matched_keywords_count: int,
+                 missing_keywords_count: int, ats_score: float, completeness_score: float,
+                 near_duplicates: list = None):
+        self.filename = filename
+        self.match_score = match_score
+        self.matched_keywords_count = matched_keywords_count
+        self.missing_keywords_count = missing_keywords_count
+        self.ats_score = ats_score
+        self.completeness_score = completeness_score
+        self.near_duplicates = near_duplicates
+
+    def to_dict(self) -> dict:
+        result = {name: getattr(self, name) for name in self.__slots__}
+        if self.near_duplicates is None:
+            del result['near_duplicates']
+        return result
+
+
+def quality_matrix(additional_analyses: list) -> np.ndarray:
+    """Stack per-resume quality scores into an (N, 4) float array"""
+    return np.array(
+        [[analysis[column] for column in QUALITY_COLUMNS] for analysis in additional_analyses],
+        dtype=np.float64
+    ).reshape(len(additional_analyses), len(QUALITY_COLUMNS))
+
+
+def batch_match_scores(resume_matrix: np.ndarray, vocabulary: KeywordVocabulary, jd_skills: dict,
+                       quality: np.ndarray, high_value_skills) -> dict:
+    """Vectorized calculate_match_score for N resumes against one JD.
+
+    resume_matrix is (N, V) boolean over vocabulary, quality is (N, 4) in
+    QUALITY_COLUMNS order. Returns unrounded score components as arrays.
+    """
+    count = resume_matrix.shape[0]
+    if not jd_skills:
+        zeros = np.zeros(count)
+        return {'final_score': zeros, 'base_score': zeros, 'bonus': zeros, 'penalty': zeros,
+                'matched_count': np.zeros(count, dtype=np.int64)}
+
+    # JD keywords the resumes were never encoded with can't match anything
+    jd_keywords = list(jd_skills.keys())
+    jd_weights = np.array([jd_skills[k] for k in jd_keywords], dtype=np.float64)
+    columns = np.array([vocabulary.index.get(k, -1) for k in jd_keywords], dtype=np.int64)
+    known = (columns >= 0) & (columns < resume_matrix.shape[1])
+    columns[~known] = 0
+
+    matched = resume_matrix[:, columns] & known
+    matched_weight = matched.astype(np.float64) @ jd_weights
+    matched_count = matched.sum(axis=1)
+
+    high_value = set(high_value_skills)
+    key_mask = np.array([k in high_value for k in jd_keywords], dtype=bool)
+    high_value_matches = matched[:, key_mask].sum(axis=1)
+
+    return scores_from_sums(
+        matched_weight, high_value_matches, matched_count, quality,
+        sum(jd_skills.values()), int(key_mask.sum())
+    )
+
+
+def scores_from_sums(matched_weight: np.ndarray, high_value_matches: np.ndarray, matched_count: np.ndarray,
+                     quality: np.ndarray, jd_total_weight: float, key_count: int) -> dict:
+    """calculate_match_score arithmetic from per-resume sums instead of keyword sets.
+
+    matched_weight is the summed JD weight of each resume's matched keywords,
+    high_value_matches how many of the JD's key_count high-value keywords it
+    matched. Lets stored analyses be re-scored from running totals.
+    """
+    count = len(matched_weight)
+    if jd_total_weight > 0:
+        base_score = (matched_weight / jd_total_weight) * 100
+    else:
+        base_score = np.zeros(count)
+
+    # Same left-to-right order of additions as the scalar function
+    weighted_quality = quality * QUALITY_WEIGHTS
+    final_score = (base_score * 0.5) + weighted_quality[:, 0] + weighted_quality[:, 1] \
+        + weighted_quality[:, 2] + weighted_quality[:, 3]
+
+    bonus = np.minimum(high_value_matches * 3, 15).astype(np.float64)
+    final_score = final_score + bonus
+
+    if key_count:
+        penalty = ((key_count - high_value_matches) / key_count) * 20
+        final_score = final_score - penalty
+    else:
+        penalty = np.zeros(count)
+
+    return {
+        'final_score': np.clip(final_score, 0, 100),
+        'base_score': base_score,
+        'bonus': bonus,
+        'penalty': penalty,
+        'matched_count': matched_count
+    }
+
+
+def round_scores(scores: np.ndarray) -> list:
+    """Round to 2 decimals exactly like Python's round().
+
+    np.round agrees with round() except right at a half-cent boundary, so
+    only those few values go through the Python path.
+    """
+    rounded = np.round(scores, 2)
+    scaled = scores * 100
+    ambiguous = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for index in ambiguous.tolist():
+        rounded[index] = round(float(scores[index]), 2)
+    return rounded.tolist()
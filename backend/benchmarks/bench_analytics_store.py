@@ -0,0 +1,93 @@
+"""Benchmark aggregate queries on the columnar analytics store against JSON history rows in SQLite
+
+Run from the backend directory:
+    python benchmarks/bench_analytics_store.py
+"""
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics_store import AnalyticsStore
+from database import ConnectionPool
+from keyword_table import KeywordTable
+from main import SKILL_KEYWORDS
+
+KEYWORDS = [keyword for data in SKILL_KEYWORDS.values() for keyword in data['keywords']]
+JD_FILES = [f"jd_{i}.pdf" for i in range(200)]
+NOW = int(time.time())
+
+def build_rows(start: int, count: int, rng: random.Random, keyword_table: KeywordTable) -> list:
+    rows = []
+    for history_id in range(start + 1, start + count + 1):
+        jd_keywords = rng.sample(KEYWORDS, 15)
+        split = rng.randint(0, 15)
+        rows.append({
+            'history_id': history_id,
+            'created_at': NOW - rng.randint(0, 90 * 86400),
+            'jd_filename': rng.choice(JD_FILES),
+            'match_score': rng.random() * 100,
+            'ats_score': rng.choice([70, 80, 90, 100]),
+            'completeness_score': rng.choice([40.0, 60.0, 80.0, 100.0]),
+            'action_verbs_score': rng.random() * 100,
+            'quantifiable_impact_score': rng.choice([0, 10, 30, 50, 100]),
+            'matched': keyword_table.ids(jd_keywords[:split]),
+            'missing': keyword_table.ids(jd_keywords[split:]),
+            'missing_keywords': jd_keywords[split:]
+        })
+    return rows
+
+def sqlite_missing_skills(conn: sqlite3.Connection) -> list:
+    """The same aggregate computed by parsing JSON keyword columns row by row"""
+    counts = Counter()
+    for (missing,) in conn.execute('SELECT missing_keywords FROM history'):
+        counts.update(json.loads(missing))
+    return counts.most_common(20)
+
+def time_call(func, repeat: int = 5) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2] * 1000
+
+def main():
+    rng = random.Random(7)
+    since = NOW - 30 * 86400
+    print(f"{'rows':>10}{'json scan ms':>16}{'missing ms':>12}{'missing/jd ms':>15}{'scores 30d ms':>15}")
+    with tempfile.TemporaryDirectory() as workdir:
+        pool = ConnectionPool(os.path.join(workdir, 'keywords.db'), size=1)
+        with pool.connection() as keyword_conn:
+            KeywordTable.create_schema(keyword_conn)
+        keyword_table = KeywordTable(pool)
+        store = AnalyticsStore(os.path.join(workdir, 'analytics'), keyword_table)
+        conn = sqlite3.connect(os.path.join(workdir, 'history.db'))
+        conn.execute('CREATE TABLE history (id INTEGER PRIMARY KEY, jd_filename TEXT, missing_keywords TEXT)')
+        for size in (100000, 1000000):
+            while len(store) < size:
+                rows = build_rows(len(store), min(100000, size - len(store)), rng, keyword_table)
+                store.append(rows)
+                if size <= 100000:
+                    conn.executemany(
+                        'INSERT INTO history VALUES (?, ?, ?)',
+                        [(row['history_id'], row['jd_filename'], json.dumps(row['missing_keywords'])) for row in rows]
+                    )
+            conn.commit()
+
+            sqlite_ms = time_call(lambda: sqlite_missing_skills(conn), 3) if size <= 100000 else float('nan')
+            missing_ms = time_call(lambda: store.missing_skills())
+            per_jd_ms = time_call(lambda: store.missing_skills(JD_FILES[0]))
+            scores_ms = time_call(lambda: store.score_distribution(since=since))
+            print(f"{size:>10}{sqlite_ms:>16.1f}{missing_ms:>12.1f}{per_jd_ms:>15.1f}{scores_ms:>15.1f}")
+        conn.close()
+        pool.close_all()
+
+if __name__ == "__main__":
+    main()
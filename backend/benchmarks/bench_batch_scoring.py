@@ -0,0 +1,67 @@
+"""Benchmark vectorized batch scoring against calling calculate_match_score per resume
+
+Run from the backend directory:
+    python benchmarks/bench_batch_scoring.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import init_db, current_taxonomy, calculate_match_score, batch_calculate_match_scores
+from batch_scoring import KeywordVocabulary, batch_match_scores, quality_matrix, round_scores
+
+# The taxonomy can come from the database, whose schema main only creates at startup
+init_db()
+TAXONOMY = current_taxonomy()
+KEYWORD_MATCHER = TAXONOMY.keyword_matcher
+HIGH_VALUE_SKILLS = TAXONOMY.high_value_skills
+
+def build_pool(size: int, seed: int = 7) -> tuple:
+    """Random resume keyword sets and quality scores"""
+    rng = random.Random(seed)
+    keywords = list(KEYWORD_MATCHER['weights'])
+    resumes = [dict.fromkeys(rng.sample(keywords, rng.randint(5, 30)), 1.0) for _ in range(size)]
+    analyses = [
+        {
+            'ats_score': rng.choice([100, 90, 80, 70]),
+            'completeness_score': rng.choice([40.0, 60.0, 80.0, 100.0]),
+            'action_verbs_score': rng.random() * 100,
+            'quantifiable_impact_score': rng.choice([0, 10, 30, 50, 100])
+        }
+        for _ in range(size)
+    ]
+    jd_skills = {k: KEYWORD_MATCHER['weights'][k] for k in rng.sample(keywords, 20)}
+    return resumes, analyses, jd_skills
+
+def main():
+    print(f"{'resumes':>10}{'scalar ms':>12}{'batch ms':>12}{'rescore ms':>12}{'speedup':>10}")
+    for size in (1000, 10000, 100000):
+        resumes, analyses, jd_skills = build_pool(size)
+        
+        start = time.perf_counter()
+        scalar = [calculate_match_score(r, jd_skills, a)[0] for r, a in zip(resumes, analyses)]
+        scalar_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        batch = batch_calculate_match_scores(resumes, jd_skills, analyses)
+        batch_ms = (time.perf_counter() - start) * 1000
+        
+        if scalar != batch:
+            raise SystemExit(f"Batch scores differ from scalar scores for {size} resumes")
+        
+        # Re-scoring an already encoded pool after the JD weights change
+        vocabulary = KeywordVocabulary()
+        matrix = vocabulary.encode(resumes)
+        quality = quality_matrix(analyses)
+        reweighted = {k: w * 1.1 for k, w in jd_skills.items()}
+        start = time.perf_counter()
+        round_scores(batch_match_scores(matrix, vocabulary, reweighted, quality, HIGH_VALUE_SKILLS)['final_score'])
+        rescore_ms = (time.perf_counter() - start) * 1000
+        
+        print(f"{size:>10}{scalar_ms:>12.1f}{batch_ms:>12.1f}{rescore_ms:>12.1f}{scalar_ms / rescore_ms:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark MinHash fingerprinting and LSH near-duplicate lookups as the index grows
+
+Run from the backend directory:
+    python benchmarks/bench_duplicate_index.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_text
+from database import ConnectionPool
+from duplicate_index import DuplicateIndex, NUM_PERMUTATIONS, text_fingerprint
+
+def time_call(func, repeat: int) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2] * 1000
+
+def main():
+    print(f"{'resume words':<16}{'fingerprint ms':>16}")
+    for words in (600, 6000):
+        text = generate_text(words, seed=words)
+        print(f"{words:<16}{time_call(lambda: text_fingerprint(text), 20):>16.3f}")
+
+    base = generate_text(600, seed=1)
+    lines = base.split('\n')
+    query = text_fingerprint('\n'.join(lines[:3] + ['Rebuilt the reporting pipeline in two weeks.'] + lines[4:]))
+    rng = np.random.default_rng(7)
+
+    print(f"\n{'indexed resumes':<16}{'lsh lookup ms':>16}{'linear scan ms':>16}{'found':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        pool = ConnectionPool(os.path.join(workdir, 'duplicates.db'), size=2)
+        with pool.connection() as conn:
+            DuplicateIndex.create_schema(conn)
+        index = DuplicateIndex(pool)
+        index.add(text_fingerprint(base), 'original.pdf')
+        signatures = [text_fingerprint(base)['signature']]
+
+        for size in (1000, 10000, 100000):
+            # Unrelated resumes: random signatures share no band with the query
+            filler = rng.integers(0, 2 ** 32, (size - len(signatures), NUM_PERMUTATIONS), dtype=np.uint64)
+            with pool.connection() as conn:
+                with conn:
+                    for row, signature in enumerate(filler.astype(np.uint32), start=len(signatures)):
+                        DuplicateIndex._add(conn, {'text_hash': f'filler-{row}', 'signature': signature}, f'{row}.pdf')
+            signatures.extend(filler.astype(np.uint32))
+            matrix = np.array(signatures)
+
+            lookup_ms = time_call(lambda: index.find(query), 20)
+            scan_ms = time_call(lambda: (matrix == query['signature']).sum(axis=1), 5)
+            print(f"{size:<16}{lookup_ms:>16.3f}{scan_ms:>16.3f}{len(index.find(query)):>8}")
+        pool.close_all()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark re-scoring stored analyses after a one-keyword JD edit against re-running every analysis
+
+Run from the backend directory:
+    python benchmarks/bench_jd_rescore.py
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the benchmark's history rows out of the real database
+WORKDIR = tempfile.mkdtemp(prefix='bench_jd_rescore_')
+os.environ.setdefault('RESUME_MATCHER_DB', os.path.join(WORKDIR, 'history.db'))
+
+from corpus import generate_text
+from main import (init_db, current_taxonomy, extract_skills_and_qualifications, build_match_analysis,
+                  save_match_analysis, rescore_job_description, history_writer)
+
+def main():
+    init_db()
+    taxonomy = current_taxonomy()
+    jd_skills = extract_skills_and_qualifications(generate_text(400, seed=1, kind='jd'), taxonomy)
+    # The edit: one keyword the JD did not have before
+    extra = next(k for k in taxonomy.keyword_matcher['weights'] if k not in jd_skills)
+    edited = {**jd_skills, extra: taxonomy.keyword_matcher['weights'][extra]}
+
+    print(f"{'analyses':>10}{'full re-analysis s':>20}{'incremental ms':>16}{'speedup':>10}")
+    stored = []
+    for size in (500, 5000):
+        jd_filename = f"jd-{size}.pdf"
+        session_id = str(uuid.uuid4())
+        while len(stored) < size:
+            text = generate_text(600, seed=len(stored))
+            stored.append({'text': text, 'skills': extract_skills_and_qualifications(text, taxonomy)})
+        for i, document in enumerate(stored):
+            analysis = build_match_analysis(document, f"resume-{i}.pdf", jd_skills, taxonomy)
+            save_match_analysis(session_id, analysis, jd_filename, jd_skills, taxonomy)
+        history_writer.flush()
+
+        # What an edit costs without stored state: every resume analyzed again (text already extracted)
+        start = time.perf_counter()
+        for i, document in enumerate(stored):
+            build_match_analysis(
+                {'text': document['text'], 'skills': extract_skills_and_qualifications(document['text'], taxonomy)},
+                f"resume-{i}.pdf", edited, taxonomy
+            )
+        full_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = rescore_job_description(jd_filename, edited, taxonomy)
+        incremental_ms = (time.perf_counter() - start) * 1000
+        if result['rescored'] != size:
+            raise SystemExit(f"Expected {size} re-scored analyses, got {result['rescored']}")
+        print(f"{size:>10}{full_s:>20.2f}{incremental_ms:>16.1f}{full_s * 1000 / incremental_ms:>9.0f}x")
+    history_writer.stop()
+
+if __name__ == "__main__":
+    main()
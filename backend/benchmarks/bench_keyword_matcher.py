@@ -0,0 +1,108 @@
+"""Benchmark the single-pass keyword matcher against the per-keyword regex loop,
+and check that its cost stays flat as the taxonomy grows
+
+Run from the backend directory:
+    python benchmarks/bench_keyword_matcher.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import SKILL_KEYWORDS, QUALIFICATION_KEYWORDS
+from taxonomy import build_keyword_matcher, match_keywords
+
+# Built-in taxonomy without synonyms, so results can be checked against the legacy loop
+KEYWORD_MATCHER = build_keyword_matcher(SKILL_KEYWORDS, QUALIFICATION_KEYWORDS)
+
+FILLER_WORDS = [
+    'team', 'project', 'delivered', 'customer', 'platform', 'service', 'design', 'data',
+    'system', 'feature', 'quality', 'release', 'support', 'users', 'performance', 'the',
+    'with', 'and', 'for', 'using', 'built', 'across', 'multiple', 'teams', 'code'
+]
+
+# Roughly 500 words per page
+WORDS_PER_PAGE = 500
+
+def legacy_match(text: str) -> dict:
+    """Original implementation: one regex search per taxonomy keyword"""
+    found_keywords = {}
+    for taxonomy in (SKILL_KEYWORDS, QUALIFICATION_KEYWORDS):
+        for category, data in taxonomy.items():
+            for keyword in data['keywords']:
+                if re.search(r'\b' + re.escape(keyword) + r'\b', text):
+                    found_keywords[keyword] = data['weight']
+    return found_keywords
+
+def build_text(pages: int, keyword_density: float = 0.03, seed: int = 42) -> str:
+    """Build normalized synthetic text with a given share of taxonomy keywords"""
+    rng = random.Random(seed)
+    keywords = list(KEYWORD_MATCHER['weights'])
+    words = []
+    for _ in range(pages * WORDS_PER_PAGE):
+        if rng.random() < keyword_density:
+            words.append(rng.choice(keywords))
+        else:
+            words.append(rng.choice(FILLER_WORDS))
+    return re.sub(r"[^a-z0-9\s+#\.]", " ", " ".join(words))
+
+def time_call(func, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+def synthetic_taxonomy(terms: int, seed: int = 7) -> dict:
+    """Built-in taxonomy padded with made-up multi-word skills up to `terms` entries"""
+    rng = random.Random(seed)
+    taxonomy = {name: dict(data) for name, data in SKILL_KEYWORDS.items()}
+    taxonomy.update(QUALIFICATION_KEYWORDS)
+    existing = sum(len(data['keywords']) for data in taxonomy.values())
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    extra = set()
+    while len(extra) < max(terms - existing, 0):
+        words = [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        extra.add(' '.join(words))
+    taxonomy['synthetic'] = {'keywords': sorted(extra), 'weight': 1.0}
+    return taxonomy
+
+def flat_alternation_matcher(taxonomy: dict) -> dict:
+    """Same matcher with the previous longest-first flat alternation instead of the trie"""
+    matcher = build_keyword_matcher(taxonomy)
+    terms = sorted(matcher['weights'], key=len, reverse=True)
+    matcher['pattern'] = re.compile(r'\b(?=(' + '|'.join(re.escape(term) for term in terms) + r')\b)')
+    return matcher
+
+def main():
+    cases = [
+        ("resume (2 pages)", build_text(2), 200),
+        ("long document (50 pages)", build_text(50), 20)
+    ]
+    
+    print(f"{'case':<28}{'chars':>10}{'legacy ms':>12}{'matcher ms':>12}{'speedup':>10}")
+    for name, text, repeat in cases:
+        if legacy_match(text) != match_keywords(text, KEYWORD_MATCHER):
+            raise SystemExit(f"Result mismatch for {name}")
+        legacy_ms = time_call(legacy_match, text, repeat)
+        matcher_ms = time_call(lambda t: match_keywords(t, KEYWORD_MATCHER), text, repeat)
+        print(f"{name:<28}{len(text):>10}{legacy_ms:>12.3f}{matcher_ms:>12.3f}{legacy_ms / matcher_ms:>9.1f}x")
+    
+    text = build_text(2)
+    print(f"\n{'taxonomy terms':<28}{'build ms':>10}{'flat ms':>12}{'trie ms':>12}")
+    for terms in (60, 1000, 10000):
+        taxonomy = synthetic_taxonomy(terms)
+        start = time.perf_counter()
+        matcher = build_keyword_matcher(taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+        flat = flat_alternation_matcher(taxonomy)
+        if match_keywords(text, matcher) != match_keywords(text, flat):
+            raise SystemExit(f"Trie and flat matchers disagree at {terms} terms")
+        flat_ms = time_call(lambda t: match_keywords(t, flat), text, 20)
+        trie_ms = time_call(lambda t: match_keywords(t, matcher), text, 20)
+        print(f"{len(matcher['weights']):<28}{build_ms:>10.1f}{flat_ms:>12.3f}{trie_ms:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Compare history keyword columns stored as JSON strings against packed keyword IDs,
+and comparison results held as dicts against slotted records
+
+Run from the backend directory:
+    python benchmarks/bench_keyword_storage.py
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the taxonomy lookup away from the real database
+WORKDIR = tempfile.mkdtemp(prefix='bench_keyword_storage_')
+os.environ.setdefault('RESUME_MATCHER_DB', os.path.join(WORKDIR, 'history.db'))
+
+from corpus import generate_text
+from batch_scoring import ComparisonResult
+from database import ConnectionPool
+from keyword_table import KeywordTable
+from main import current_taxonomy, extract_skills_and_qualifications, calculate_match_score
+
+KEYWORD_COLUMNS = ('matched_keywords', 'missing_keywords', 'resume_skills', 'jd_skills')
+DOCUMENTS = 500
+ROWS = 200000
+RECORDS = 100000
+
+
+def keyword_rows(taxonomy) -> list:
+    """Keyword columns of DOCUMENTS analyses against one JD"""
+    jd_skills = extract_skills_and_qualifications(generate_text(400, seed=1, kind='jd'), taxonomy)
+    rows = []
+    for seed in range(DOCUMENTS):
+        resume_skills = extract_skills_and_qualifications(generate_text(600, seed=seed), taxonomy)
+        _, matched, missing, _ = calculate_match_score(resume_skills, jd_skills, {
+            'ats_score': 0, 'completeness_score': 0, 'action_verbs_score': 0, 'quantifiable_impact_score': 0
+        }, taxonomy)
+        rows.append((matched, missing, list(resume_skills), list(jd_skills)))
+    return rows
+
+
+def database_bytes(path: str, rows: list) -> int:
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE history (id INTEGER PRIMARY KEY, {', '.join(KEYWORD_COLUMNS)})")
+    conn.executemany(
+        f"INSERT INTO history ({', '.join(KEYWORD_COLUMNS)}) VALUES (?, ?, ?, ?)",
+        (rows[i % len(rows)] for i in range(ROWS))
+    )
+    conn.commit()
+    conn.execute('VACUUM')
+    conn.close()
+    return os.path.getsize(path)
+
+
+def decode_ms(rows: list, decode) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        for value in row:
+            decode(value)
+    return (time.perf_counter() - start) * 1000 / len(rows)
+
+
+def records_bytes(build) -> int:
+    tracemalloc.start()
+    records = [build(i) for i in range(RECORDS)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return size
+
+
+def main():
+    taxonomy = current_taxonomy()
+    rows = keyword_rows(taxonomy)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        pool = ConnectionPool(os.path.join(workdir, 'keywords.db'), size=2)
+        with pool.connection() as conn:
+            KeywordTable.create_schema(conn)
+        table = KeywordTable(pool)
+        json_rows = [tuple(json.dumps(column) for column in row) for row in rows]
+        packed_rows = [tuple(table.encode(column) for column in row) for row in rows]
+
+        print(f"{'storage':<10}{'bytes/row':>12}{f'db MB ({ROWS} rows)':>22}{'decode us/row':>16}")
+        for label, encoded, decode in (('json', json_rows, json.loads), ('packed', packed_rows, table.decode)):
+            per_row = sum(len(value) for row in encoded for value in row) / len(encoded)
+            size = database_bytes(os.path.join(workdir, f"{label}.db"), encoded)
+            print(f"{label:<10}{per_row:>12.1f}{size / 1e6:>22.1f}{decode_ms(encoded, decode) * 1000:>16.1f}")
+        pool.close_all()
+
+    as_dict = records_bytes(lambda i: {
+        "filename": f"resume_{i}.pdf", "match_score": i / 1000, "matched_keywords_count": i % 20,
+        "missing_keywords_count": i % 7, "ats_score": 90, "completeness_score": 80.0, "near_duplicates": []
+    })
+    as_record = records_bytes(lambda i: ComparisonResult(
+        f"resume_{i}.pdf", i / 1000, i % 20, i % 7, 90, 80.0, []
+    ))
+    print(f"\n{'comparison results':<20}{f'MB for {RECORDS}':>14}")
+    print(f"{'dict':<20}{as_dict / 1e6:>14.1f}")
+    print(f"{'ComparisonResult':<20}{as_record / 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
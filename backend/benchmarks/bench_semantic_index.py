@@ -0,0 +1,52 @@
+"""Benchmark semantic encoding per resume and ranking a JD against the memory-mapped vector index
+
+Run from the backend directory:
+    python benchmarks/bench_semantic_index.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_text
+from semantic_index import VectorIndex
+from main import semantic_encoder
+
+def time_call(func, repeat: int) -> float:
+    """Median milliseconds per call"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[len(samples) // 2] * 1000
+
+def main():
+    print(f"{'resume words':<16}{'encode ms':>12}{'cached ms':>12}")
+    for words in (600, 6000):
+        text = generate_text(words, seed=words)
+        encode_ms = time_call(lambda: semantic_encoder.encode(text), 20)
+        semantic_encoder.encode_cached(text)
+        cached_ms = time_call(lambda: semantic_encoder.encode_cached(text), 20)
+        print(f"{words:<16}{encode_ms:>12.3f}{cached_ms:>12.3f}")
+
+    jd_vector = semantic_encoder.encode(generate_text(400, seed=1, kind='jd'))
+    rng = np.random.default_rng(7)
+    print(f"\n{'indexed resumes':<16}{'fill s':>12}{'search ms':>12}")
+    with tempfile.TemporaryDirectory() as workdir:
+        index = VectorIndex(workdir, semantic_encoder.dimensions, 'bench')
+        for size in (1000, 10000, 100000):
+            start = time.perf_counter()
+            for row in range(len(index), size):
+                vector = rng.random(semantic_encoder.dimensions, dtype=np.float32)
+                index.add(f"resume-{row}", vector / np.linalg.norm(vector))
+            fill_s = time.perf_counter() - start
+            search_ms = time_call(lambda: index.search(jd_vector, 10), 5)
+            print(f"{size:<16}{fill_s:>12.1f}{search_ms:>12.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Measure import time, baseline memory and warmup cost of the API module in fresh processes
+
+Run from the backend directory:
+    python benchmarks/bench_startup.py
+
+Each scenario runs in its own interpreter so module caches do not carry over.
+"eager" imports the libraries main used to load at import time, for comparison.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('pandas', 'reportlab.platypus', 'PyPDF2', 'docx')
+
+PROBE = """
+import json, sys, time
+
+params = json.loads(sys.argv[1])
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+result = {}
+start = time.perf_counter()
+if params['eager']:
+    import pandas, reportlab.platypus, PyPDF2, docx
+import main
+result['import_s'] = time.perf_counter() - start
+result['import_rss_mb'] = rss_mb()
+result['heavy_loaded'] = [name for name in params['heavy'] if name in sys.modules]
+
+if params['warm']:
+    import asyncio
+    main.init_db()
+    start = time.perf_counter()
+    asyncio.run(main.warmup(params['preload']))
+    result['warmup_s'] = time.perf_counter() - start
+    result['warm_rss_mb'] = rss_mb()
+
+    # First analysis after startup, as the first request would see it
+    text = main.WARMUP_TEXT + ' kubernetes terraform' * 50
+    start = time.perf_counter()
+    main.analyze_resume_quality(text)
+    main.extract_skills_and_qualifications(text)
+    result['first_analysis_ms'] = (time.perf_counter() - start) * 1000
+print(json.dumps(result))
+"""
+
+SCENARIOS = [
+    ('eager imports', dict(eager=True, warm=False, preload=False)),
+    ('lazy imports', dict(eager=False, warm=False, preload=False)),
+    ('lazy + warmup', dict(eager=False, warm=True, preload=False)),
+    ('lazy + preload', dict(eager=False, warm=True, preload=True)),
+]
+
+
+def run(workdir: str, runs: int = 5, **params) -> dict:
+    env = {
+        **os.environ,
+        'PYTHONPATH': BACKEND_DIR,
+        'RESUME_MATCHER_DB': os.path.join(workdir, 'bench.db'),
+        'EXTRACTION_CACHE_DB': os.path.join(workdir, 'bench_cache.db'),
+        'ANALYSIS_WORKERS': '0'
+    }
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE, json.dumps({'heavy': HEAVY_MODULES, **params})],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    # Median run by import time
+    return sorted(samples, key=lambda sample: sample['import_s'])[len(samples) // 2]
+
+
+def main():
+    print(f"{'scenario':<18}{'import ms':>11}{'RSS MB':>9}{'warmup ms':>11}{'warm RSS':>10}{'1st analysis ms':>17}  heavy modules loaded")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, params in SCENARIOS:
+            result = run(workdir, **params)
+            warmup = f"{result['warmup_s'] * 1000:>11.1f}{result['warm_rss_mb']:>10.1f}" if 'warmup_s' in result else f"{'-':>11}{'-':>10}"
+            first = f"{result['first_analysis_ms']:>17.2f}" if 'first_analysis_ms' in result else f"{'-':>17}"
+            print(f"{name:<18}{result['import_s'] * 1000:>11.1f}{result['import_rss_mb']:>9.1f}{warmup}{first}  "
+                  f"{', '.join(result['heavy_loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
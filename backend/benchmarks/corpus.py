@@ -0,0 +1,122 @@
+"""Synthetic resume / job description generator for benchmarks
+
+Documents are built from the real keyword taxonomy so every analysis stage
+has work to do. Size is set in words and keyword density is the share of
+words drawn from the taxonomy.
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FILLER_WORDS = [
+    'team', 'project', 'customer', 'platform', 'service', 'design', 'data', 'system',
+    'feature', 'quality', 'release', 'support', 'users', 'performance', 'the', 'with',
+    'and', 'for', 'using', 'across', 'multiple', 'teams', 'code', 'product', 'reliable'
+]
+
+IMPACT_PHRASES = [
+    'increased by {n}%', 'reduced by {n}%', 'improved by {n}%', 'saved ${n}000',
+    'led team of {n}', 'handled {n} requests', 'managed ${n}0000 budget'
+]
+
+SECTIONS = ['Summary', 'Experience', 'Education', 'Skills', 'Contact']
+
+
+def taxonomy_keywords() -> tuple:
+    """Return (taxonomy keywords, action verbs)"""
+    from main import SKILL_KEYWORDS, QUALIFICATION_KEYWORDS, ACTION_VERBS
+    keywords = []
+    for taxonomy in (SKILL_KEYWORDS, QUALIFICATION_KEYWORDS):
+        for data in taxonomy.values():
+            keywords.extend(data['keywords'])
+    return keywords, ACTION_VERBS['strong'] + ACTION_VERBS['weak']
+
+
+def generate_text(words: int, keyword_density: float = 0.05, seed: int = 0, kind: str = 'resume') -> str:
+    """Build a document of roughly `words` words split into resume-style sections"""
+    rng = random.Random(seed)
+    keywords, verbs = taxonomy_keywords()
+
+    lines = []
+    per_section = max(words // len(SECTIONS), 1)
+    for section in SECTIONS:
+        lines.append(section if kind == 'resume' else f"{section} requirements")
+        sentence = []
+        for _ in range(per_section):
+            roll = rng.random()
+            if roll < keyword_density:
+                sentence.append(rng.choice(keywords))
+            elif roll < keyword_density + 0.02:
+                sentence.append(rng.choice(verbs))
+            elif roll < keyword_density + 0.03:
+                sentence.append(rng.choice(IMPACT_PHRASES).format(n=rng.randint(2, 95)))
+            else:
+                sentence.append(rng.choice(FILLER_WORDS))
+
+            if len(sentence) >= 14:
+                lines.append(' '.join(sentence).capitalize() + '.')
+                sentence = []
+        if sentence:
+            lines.append(' '.join(sentence).capitalize() + '.')
+
+    if kind == 'resume':
+        lines.append(f"{rng.randint(1, 12)}+ years of experience")
+    return '\n'.join(lines)
+
+
+def write_pdf(text: str, path: str):
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    pdf = canvas.Canvas(path, pagesize=letter)
+    width, height = letter
+    y = height - 50
+    for line in text.split('\n'):
+        # Wrap long lines at ~95 characters
+        while line:
+            chunk, line = line[:95], line[95:]
+            if y < 50:
+                pdf.showPage()
+                y = height - 50
+            pdf.drawString(40, y, chunk)
+            y -= 14
+    pdf.save()
+
+
+def write_docx(text: str, path: str):
+    from docx import Document
+
+    doc = Document()
+    for line in text.split('\n'):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def write_document(text: str, path: str):
+    if path.endswith('.pdf'):
+        write_pdf(text, path)
+    elif path.endswith('.docx'):
+        write_docx(text, path)
+    else:
+        raise ValueError(f"Unsupported document type: {path}")
+
+
+def build_corpus(out_dir: str, resumes: int = 10, words: int = 600, keyword_density: float = 0.05,
+                 formats: tuple = ('pdf', 'docx'), seed: int = 0) -> dict:
+    """Write one JD and `resumes` resumes per format. Returns {'jd': path, 'resumes': [paths]}"""
+    os.makedirs(out_dir, exist_ok=True)
+
+    jd_path = os.path.join(out_dir, 'job_description.pdf')
+    write_pdf(generate_text(max(words // 2, 50), keyword_density * 2, seed, kind='jd'), jd_path)
+
+    paths = []
+    for index in range(resumes):
+        text = generate_text(words, keyword_density, seed + index + 1)
+        for fmt in formats:
+            path = os.path.join(out_dir, f"resume_{index:04d}.{fmt}")
+            write_document(text, path)
+            paths.append(path)
+
+    return {'jd': jd_path, 'resumes': paths}
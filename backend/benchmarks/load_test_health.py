@@ -0,0 +1,142 @@
+"""Measure /health latency while concurrent /match/ uploads are in flight
+
+Run from the backend directory:
+    python benchmarks/load_test_health.py
+    python benchmarks/load_test_health.py --url http://localhost:8000
+
+Without --url the app runs in-process on this script's event loop (lifespan
+included), so any upload stage that blocks the loop shows up directly as
+/health latency. Every upload is a distinct generated resume so extraction
+and analysis caches never hit.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MIME_TYPES = {
+    '.pdf': 'application/pdf',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+
+def percentiles(samples: list) -> dict:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {'n': len(ordered), 'p50': pick(0.5), 'p95': pick(0.95), 'p99': pick(0.99), 'max': ordered[-1] * 1000}
+
+
+def upload(path: str) -> tuple:
+    with open(path, 'rb') as f:
+        return os.path.basename(path), f.read(), MIME_TYPES[os.path.splitext(path)[1]]
+
+
+async def sample_health(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> list:
+    """/health round-trip times until stop is set"""
+    samples = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get('/health')
+        response.raise_for_status()
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def post_matches(client: httpx.AsyncClient, queue: asyncio.Queue, jd: tuple, latencies: list, errors: list):
+    while True:
+        try:
+            resume = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        response = await client.post('/match/', files={'resume': resume, 'jd': jd})
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(response.status_code)
+
+
+async def run(client: httpx.AsyncClient, corpus: dict, args) -> dict:
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_health(client, stop, args.interval))
+    await asyncio.sleep(args.idle_seconds)
+    stop.set()
+    idle = await sampler
+
+    jd = upload(corpus['jd'])
+    queue = asyncio.Queue()
+    for path in corpus['resumes']:
+        queue.put_nowait(upload(path))
+
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_health(client, stop, args.interval))
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(post_matches(client, queue, jd, latencies, errors) for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    loaded = await sampler
+
+    return {'idle': idle, 'loaded': loaded, 'match': latencies, 'errors': errors, 'elapsed': elapsed}
+
+
+async def run_in_process(corpus: dict, args) -> dict:
+    import main as app_module
+
+    async with app_module.lifespan(app_module.app):
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://app', timeout=None) as client:
+            return await run(client, corpus, args)
+
+
+async def run_against_server(corpus: dict, args) -> dict:
+    async with httpx.AsyncClient(base_url=args.url, timeout=None) as client:
+        return await run(client, corpus, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='base URL of a running server (default: run the app in-process)')
+    parser.add_argument('--requests', type=int, default=40, help='/match/ uploads to send')
+    parser.add_argument('--concurrency', type=int, default=16, help='uploads in flight at once')
+    parser.add_argument('--words', type=int, default=1500, help='resume size in words')
+    parser.add_argument('--interval', type=float, default=0.01, help='seconds between /health probes')
+    parser.add_argument('--idle-seconds', type=float, default=2.0, help='probe time before the load starts')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Keep databases, caches and job spool out of the source tree
+        os.chdir(workdir)
+        os.environ.setdefault('RESUME_MATCHER_DB', os.path.join(workdir, 'load.db'))
+        os.environ.setdefault('EXTRACTION_CACHE_DB', os.path.join(workdir, 'load_cache.db'))
+        os.environ.setdefault('JOB_SPOOL_DIR', os.path.join(workdir, 'jobs'))
+
+        from corpus import build_corpus
+
+        print(f"Generating {args.requests} resumes of {args.words} words...")
+        corpus = build_corpus(
+            os.path.join(workdir, 'corpus'), resumes=(args.requests + 1) // 2, words=args.words
+        )
+        corpus['resumes'] = corpus['resumes'][:args.requests]
+        result = asyncio.run(run_against_server(corpus, args) if args.url else run_in_process(corpus, args))
+
+    print(f"\n{'':<22}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, samples in (('/health idle', result['idle']), ('/health under load', result['loaded']),
+                           ('/match/', result['match'])):
+        if samples:
+            stats = percentiles(samples)
+            print(f"{label:<22}{stats['n']:>6}{stats['p50']:>10.1f}{stats['p95']:>10.1f}"
+                  f"{stats['p99']:>10.1f}{stats['max']:>10.1f}")
+    print(f"\n{len(result['match'])} uploads in {result['elapsed']:.1f}s "
+          f"({len(result['match']) / result['elapsed']:.1f}/s), {len(result['errors'])} errors {result['errors'][:5]}")
+
+
+if __name__ == "__main__":
+    main()
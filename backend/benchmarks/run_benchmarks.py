@@ -0,0 +1,229 @@
+"""Time every public analysis stage and the HTTP endpoints on a synthetic corpus
+
+Run from the backend directory:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --output new.json --baseline results.json
+
+Results are written as JSON (one entry per stage and document size). With
+--baseline, any stage whose median got slower than --threshold exits non-zero.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def summarize(samples: list) -> dict:
+    samples_ms = sorted(s * 1000 for s in samples)
+    return {
+        'runs': len(samples_ms),
+        'mean_ms': round(statistics.fmean(samples_ms), 4),
+        'median_ms': round(statistics.median(samples_ms), 4),
+        'p95_ms': round(samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))], 4),
+        'min_ms': round(samples_ms[0], 4)
+    }
+
+
+def measure(func, repeat: int, setup=None) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+
+def run_stage_benchmarks(main, corpus, words: int, repeat: int) -> dict:
+    results = {}
+    suffix = f"[{words}w]"
+
+    jd_text = main.extract_text_from_file(corpus['jd'])
+    jd_skills = main.extract_skills_and_qualifications(jd_text)
+
+    for path in corpus['resumes'][:2]:
+        fmt = os.path.splitext(path)[1].lstrip('.')
+        results[f"extract_text_from_file.{fmt}{suffix}"] = measure(
+            lambda: main.extract_text_from_file(path), repeat
+        )
+
+    resume_text = main.extract_text_from_file(corpus['resumes'][0])
+    resume_skills = main.extract_skills_and_qualifications(resume_text)
+    additional_analysis = {
+        'ats_score': main.check_ats_friendliness(resume_text, corpus['resumes'][0])['score'],
+        'completeness_score': main.check_section_completeness(resume_text)['score'],
+        'action_verbs_score': main.analyze_action_verbs(resume_text)['score'],
+        'quantifiable_impact_score': main.check_quantifiable_impact(resume_text)['score']
+    }
+    matched = set(resume_skills) & set(jd_skills)
+
+    results[f"extract_skills_and_qualifications{suffix}"] = measure(
+        lambda: main.extract_skills_and_qualifications(resume_text), repeat
+    )
+    results[f"analyze_resume_quality{suffix}"] = measure(lambda: main.analyze_resume_quality(resume_text), repeat)
+    results[f"analyze_action_verbs{suffix}"] = measure(lambda: main.analyze_action_verbs(resume_text), repeat)
+    results[f"check_quantifiable_impact{suffix}"] = measure(lambda: main.check_quantifiable_impact(resume_text), repeat)
+    results[f"calculate_match_score{suffix}"] = measure(
+        lambda: main.calculate_match_score(resume_skills, jd_skills, additional_analysis), repeat
+    )
+    results[f"highlight_text{suffix}"] = measure(lambda: main.highlight_text(resume_text, matched), repeat)
+
+    score, matched_keywords, missing_keywords, breakdown = main.calculate_match_score(
+        resume_skills, jd_skills, additional_analysis
+    )
+    report_data = {
+        'resume': 'resume.pdf', 'job_description': 'jd.pdf', 'match_score': score,
+        'matched_keywords': matched_keywords, 'missing_keywords': missing_keywords, 'breakdown': breakdown,
+        'improvement_suggestions': ['Add more quantifiable achievements with numbers and percentages']
+    }
+
+    results[f"generate_pdf_report{suffix}"] = measure(
+        lambda: main.generate_pdf_report(report_data), max(repeat // 5, 1)
+    )
+    return results
+
+
+def run_endpoint_benchmarks(main, corpus, words: int, repeat: int) -> dict:
+    from fastapi.testclient import TestClient
+
+    results = {}
+    suffix = f"[{words}w]"
+
+    def upload(path: str, field: str):
+        with open(path, 'rb') as f:
+            return (field, (os.path.basename(path), f.read(), 'application/octet-stream'))
+
+    jd = upload(corpus['jd'], 'jd')
+    resume = upload(corpus['resumes'][0], 'resume')
+    resumes = [upload(path, 'resumes') for path in corpus['resumes']]
+
+    with TestClient(main.app) as client:
+        def post(url: str, files: list):
+            response = client.post(url, files=files)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} returned {response.status_code}: {response.text[:200]}")
+
+        # Cold runs clear the extraction cache so every upload is parsed again
+        for cached in (False, True):
+            label = 'cached' if cached else 'cold'
+            setup = None if cached else main.get_extraction_cache().clear
+            results[f"POST /match/ {label}{suffix}"] = measure(
+                lambda: post('/match/', [resume, jd]), repeat, setup
+            )
+            results[f"POST /highlight-keywords/ {label}{suffix}"] = measure(
+                lambda: post('/highlight-keywords/', [resume, jd]), repeat, setup
+            )
+            comparison = measure(
+                lambda: post('/compare-multiple/', [jd] + resumes), max(repeat // 5, 1), setup
+            )
+            comparison['resumes_per_second'] = round(len(resumes) / (comparison['median_ms'] / 1000), 2)
+            results[f"POST /compare-multiple/ {label} x{len(resumes)}{suffix}"] = comparison
+
+    return results
+
+
+def compare_with_baseline(results: dict, baseline_path: str, threshold: float) -> list:
+    with open(baseline_path) as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    print(f"\n{'benchmark':<58}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = (current['median_ms'] - previous['median_ms']) / previous['median_ms'] if previous['median_ms'] else 0.0
+        flag = '  REGRESSION' if change > threshold else ''
+        print(f"{name:<58}{previous['median_ms']:>12.3f}{current['median_ms']:>12.3f}{change:>9.1%}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[600, 6000], help='document sizes in words')
+    parser.add_argument('--density', type=float, default=0.05, help='share of words taken from the taxonomy')
+    parser.add_argument('--resumes', type=int, default=5, help='resumes per format for /compare-multiple/')
+    parser.add_argument('--repeat', type=int, default=20, help='runs per stage')
+    parser.add_argument('--skip-endpoints', action='store_true', help='only time the analysis functions')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--baseline', help='JSON results from an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed median slowdown before failing')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Keep databases, caches and reports out of the source tree
+        os.chdir(workdir)
+        os.environ.setdefault('RESUME_MATCHER_DB', os.path.join(workdir, 'bench.db'))
+        os.environ.setdefault('EXTRACTION_CACHE_DB', os.path.join(workdir, 'bench_cache.db'))
+        os.environ.setdefault('JOB_SPOOL_DIR', os.path.join(workdir, 'jobs'))
+
+        import main as app_module
+        from corpus import build_corpus
+
+        app_module.init_db()
+        results = {}
+        for words in args.sizes:
+            corpus = build_corpus(
+                os.path.join(workdir, f"corpus_{words}"), resumes=args.resumes, words=words,
+                keyword_density=args.density
+            )
+            print(f"Running stage benchmarks for {words}-word documents...")
+            results.update(run_stage_benchmarks(app_module, corpus, words, args.repeat))
+            if not args.skip_endpoints:
+                print(f"Running endpoint benchmarks for {words}-word documents...")
+                results.update(run_endpoint_benchmarks(app_module, corpus, words, args.repeat))
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'params': vars(args)
+        },
+        'results': results
+    }
+
+    print(f"\n{'benchmark':<58}{'median ms':>12}{'p95 ms':>12}")
+    for name, stats in results.items():
+        print(f"{name:<58}{stats['median_ms']:>12.3f}{stats['p95_ms']:>12.3f}")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {output}")
+
+    if baseline:
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
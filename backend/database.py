@@ -0,0 +1,166 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DATABASE_PATH = os.getenv('RESUME_MATCHER_DB', 'resume_matcher_enhanced.db')
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections opened in WAL mode"""
+
+    def __init__(self, db_path: str, size: int = 4, busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        self.size = size
+        self.busy_timeout_ms = busy_timeout_ms
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # cached_statements keeps the prepared statements for our fixed SQL strings
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=128)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={self.busy_timeout_ms}')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; blocks when all connections are in use"""
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if self._created < self.size:
+                    self._created += 1
+                    try:
+                        conn = self._connect()
+                    except Exception:
+                        self._created -= 1
+                        raise
+        if conn is None:
+            conn = self._idle.get()
+
+        try:
+            yield conn
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close_all(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._created -= 1
+
+
+class BackgroundWriter:
+    """Single writer thread that groups queued inserts into one transaction per batch"""
+
+    def __init__(self, pool: ConnectionPool, batch_size: int = 200, flush_interval: float = 0.05,
+                 on_batch=None):
+        self.pool = pool
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {'rows_written': 0, 'batches': 0, 'errors': 0}
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+                self._thread.start()
+
+    def submit(self, sql: str, params: tuple):
+        """Queue a write; it is committed with the next batch"""
+        self.start()
+        self._queue.put((sql, params))
+
+    def flush(self):
+        """Block until every queued write has been committed"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+
+    def stats(self) -> dict:
+        return {**self._stats, 'pending': self._queue.qsize()}
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list):
+        # Group consecutive writes with the same SQL so each group is one executemany
+        groups = []
+        for sql, params in batch:
+            if groups and groups[-1][0] == sql:
+                groups[-1][1].append(params)
+            else:
+                groups.append((sql, [params]))
+
+        start = time.perf_counter()
+        try:
+            with self.pool.connection() as conn:
+                with conn:
+                    for sql, rows in groups:
+                        conn.executemany(sql, rows)
+        except Exception as e:
+            print(f"Batched write failed, retrying rows individually: {str(e)}")
+            self._write_individually(batch)
+            return
+
+        self._stats['rows_written'] += len(batch)
+        self._stats['batches'] += 1
+        if self.on_batch is not None:
+            self.on_batch(len(batch), time.perf_counter() - start)
+
+    def _write_individually(self, batch: list):
+        with self.pool.connection() as conn:
+            for sql, params in batch:
+                try:
+                    with conn:
+                        conn.execute(sql, params)
+                    self._stats['rows_written'] += 1
+                except Exception as e:
+                    self._stats['errors'] += 1
+                    print(f"Dropped write after error: {str(e)}")
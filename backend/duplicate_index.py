@@ -0,0 +1,212 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+from database import ConnectionPool
+
+TOKEN_REGEX = re.compile(r'[a-z0-9]+')
+
+# Word shingle length; editing one line of a resume changes only the shingles that overlap it
+SHINGLE_WORDS = 5
+
+# 128 hash functions split into 16 bands of 8 rows: two documents share at
+# least one band bucket with probability 1 - (1 - J^8)^16, i.e. ~90% at
+# Jaccard 0.8 and under 1% at 0.4
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+
+# Largest prime below 2**32, so (a * x + b) % p fits uint64 and every value fits uint32
+HASH_PRIME = np.uint64(4294967291)
+_rng = np.random.default_rng(20240607)
+HASH_A = _rng.integers(1, int(HASH_PRIME), NUM_PERMUTATIONS, dtype=np.uint64)
+HASH_B = _rng.integers(0, int(HASH_PRIME), NUM_PERMUTATIONS, dtype=np.uint64)
+
+# Upper bound on bucket-mates compared per lookup, so a pathological bucket can't make one lookup slow
+MAX_CANDIDATES = 1000
+
+
+def normalized_text_hash(text: str, tokens: list = None) -> str:
+    """Hash of the text's lowercase words, ignoring punctuation, spacing and layout"""
+    if tokens is None:
+        tokens = TOKEN_REGEX.findall(text.lower())
+    return hashlib.sha256(' '.join(tokens).encode('utf-8')).hexdigest()
+
+
+def text_fingerprint(text: str) -> dict:
+    """Exact hash of the normalized text and its MinHash signature (None if too short to shingle)"""
+    tokens = TOKEN_REGEX.findall(text.lower())
+    text_hash = normalized_text_hash(text, tokens)
+    if len(tokens) < SHINGLE_WORDS:
+        return {'text_hash': text_hash, 'signature': None}
+
+    shingles = {' '.join(tokens[i:i + SHINGLE_WORDS]) for i in range(len(tokens) - SHINGLE_WORDS + 1)}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    # One row per hash function; the minimum over all shingles is that function's signature value
+    permuted = (np.outer(HASH_A, hashes) + HASH_B[:, None]) % HASH_PRIME
+    return {'text_hash': text_hash, 'signature': permuted.min(axis=1).astype(np.uint32)}
+
+
+def band_buckets(signature: np.ndarray) -> list:
+    """One 64-bit bucket ID per LSH band; the band number is hashed in so bands never collide"""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(band.to_bytes(2, 'little') + rows.tobytes(), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+    return buckets
+
+
+class DuplicateIndex:
+    """Exact and near-duplicate lookup for resumes by extracted text.
+
+    Documents are keyed by the hash of their normalized text, so the same
+    resume exported to a different file still counts as identical. Near
+    duplicates are found with MinHash signatures indexed by LSH band buckets:
+    a lookup reads the handful of documents sharing a bucket, whatever the
+    index size, and compares signatures only for those.
+
+    Also stores finished /match/ results by (resume text, JD text, taxonomy
+    version) so an identical resubmission returns the earlier analysis.
+    """
+
+    def __init__(self, pool: ConnectionPool, threshold: float = 0.8):
+        self.pool = pool
+        self.threshold = threshold
+        # Serializes lookup-then-add so two concurrent copies can't both miss each other
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {'lookups': 0, 'exact_matches': 0, 'near_matches': 0, 'analysis_hits': 0, 'analysis_misses': 0}
+
+    @staticmethod
+    def create_schema(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS duplicate_documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text_hash TEXT NOT NULL UNIQUE,
+                filename TEXT NOT NULL,
+                signature BLOB,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS duplicate_buckets (
+                bucket INTEGER NOT NULL,
+                document_id INTEGER NOT NULL,
+                PRIMARY KEY (bucket, document_id)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS duplicate_analyses (
+                analysis_key TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+
+    def check_and_add(self, fingerprint: dict, filename: str, limit: int = 5) -> list:
+        """Earlier documents identical or similar to this one, best first; then index it.
+
+        Returns [{'filename', 'similarity', 'exact'}], where similarity is the
+        estimated Jaccard similarity of the two texts' word shingles.
+        """
+        with self._lock, self.pool.connection() as conn:
+            matches = self._find(conn, fingerprint, limit)
+            with conn:
+                self._add(conn, fingerprint, filename)
+        return matches
+
+    def find(self, fingerprint: dict, limit: int = 5) -> list:
+        """check_and_add without indexing the document"""
+        with self.pool.connection() as conn:
+            return self._find(conn, fingerprint, limit)
+
+    def add(self, fingerprint: dict, filename: str):
+        with self._lock, self.pool.connection() as conn:
+            with conn:
+                self._add(conn, fingerprint, filename)
+
+    def cached_analysis(self, analysis_key: str):
+        """(session_id, result) stored for an identical resume/JD pair, or None"""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                'SELECT session_id, result FROM duplicate_analyses WHERE analysis_key = ?', (analysis_key,)
+            ).fetchone()
+        self._count('analysis_misses' if row is None else 'analysis_hits')
+        return None if row is None else (row['session_id'], json.loads(row['result']))
+
+    def store_analysis(self, analysis_key: str, session_id: str, result: dict):
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute(
+                    'INSERT OR IGNORE INTO duplicate_analyses (analysis_key, session_id, result) VALUES (?, ?, ?)',
+                    (analysis_key, session_id, json.dumps(result))
+                )
+
+    def stats(self) -> dict:
+        """Lookup counters since startup (no database access, so cheap enough for /health)"""
+        with self._stats_lock:
+            return {**self._stats, 'threshold': self.threshold}
+
+    def _count(self, *names: str):
+        with self._stats_lock:
+            for name in names:
+                self._stats[name] += 1
+
+    @staticmethod
+    def analysis_key(resume_text_hash: str, jd_text_hash: str, taxonomy_version: str) -> str:
+        return f"{resume_text_hash}:{jd_text_hash}@{taxonomy_version}"
+
+    def _find(self, conn: sqlite3.Connection, fingerprint: dict, limit: int) -> list:
+        matches = []
+        exact = conn.execute(
+            'SELECT id, filename FROM duplicate_documents WHERE text_hash = ?', (fingerprint['text_hash'],)
+        ).fetchone()
+        if exact is not None:
+            matches.append({'filename': exact['filename'], 'similarity': 1.0, 'exact': True})
+
+        similar = []
+        signature = fingerprint['signature']
+        if signature is not None:
+            buckets = band_buckets(signature)
+            candidates = conn.execute(
+                f'''SELECT d.filename, d.signature FROM duplicate_documents d
+                    WHERE d.id IN (
+                        SELECT DISTINCT document_id FROM duplicate_buckets
+                        WHERE bucket IN ({','.join('?' * len(buckets))})
+                        LIMIT {MAX_CANDIDATES}
+                    ) AND d.text_hash != ?''',
+                (*buckets, fingerprint['text_hash'])
+            ).fetchall()
+
+            for row in candidates:
+                other = np.frombuffer(row['signature'], dtype=np.uint32)
+                similarity = float(np.count_nonzero(other == signature)) / NUM_PERMUTATIONS
+                if similarity >= self.threshold:
+                    similar.append({'filename': row['filename'], 'similarity': round(similarity, 3), 'exact': False})
+
+        similar.sort(key=lambda match: match['similarity'], reverse=True)
+        self._count('lookups', *(['exact_matches'] if matches else []), *(['near_matches'] if similar else []))
+        return (matches + similar)[:limit]
+
+    @staticmethod
+    def _add(conn: sqlite3.Connection, fingerprint: dict, filename: str):
+        signature = fingerprint['signature']
+        cursor = conn.execute(
+            'INSERT OR IGNORE INTO duplicate_documents (text_hash, filename, signature) VALUES (?, ?, ?)',
+            (fingerprint['text_hash'], filename, None if signature is None else signature.tobytes())
+        )
+        if cursor.rowcount and signature is not None:
+            conn.executemany(
+                'INSERT OR IGNORE INTO duplicate_buckets (bucket, document_id) VALUES (?, ?)',
+                [(bucket, cursor.lastrowid) for bucket in band_buckets(signature)]
+            )
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Disk hits are remembered and their last_access written in one batch once this many pile up
+TOUCH_BATCH_SIZE = 64
+
+# Eviction trims the disk cache this share below max_disk_items, so it runs once per that many new entries
+EVICTION_HEADROOM = 0.1
+
+
+class ExtractionCache:
+    """Two-level (memory + SQLite) cache of extracted text and keywords keyed by content hash"""
+
+    def __init__(self, db_path: str, max_memory_items: int = 256, max_disk_items: int = 10000):
+        self.db_path = db_path
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        # content_hash -> last access time of disk hits not yet written back
+        self._touched = {}
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS extraction_cache (
+                content_hash TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_access ON extraction_cache(last_access)'
+        )
+        self._conn.commit()
+        # Approximate row count: starts exact, then counts every put as new until eviction recounts
+        self._disk_items = self._conn.execute('SELECT COUNT(*) FROM extraction_cache').fetchone()[0]
+
+    @staticmethod
+    def make_key(content: bytes, suffix: str, version: str = '') -> str:
+        """Hash file bytes together with the suffix, since the suffix picks the parser.
+
+        version names the taxonomy the keywords were extracted with, so a
+        taxonomy change misses the cache instead of returning stale keywords.
+        """
+        return ExtractionCache.key_for_digest(hashlib.sha256(content).hexdigest(), suffix, version)
+
+    @staticmethod
+    def key_for_digest(hexdigest: str, suffix: str, version: str = '') -> str:
+        """Cache key from a sha256 hex digest computed elsewhere (e.g. while streaming)"""
+        return f"{hexdigest}{suffix}@{version}" if version else f"{hexdigest}{suffix}"
+
+    def get(self, key: str):
+        """Return {'text', 'skills'} for a cached document, or None on a miss"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return {'text': entry['text'], 'skills': dict(entry['skills'])}
+
+            row = self._conn.execute(
+                'SELECT text, skills FROM extraction_cache WHERE content_hash = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH_SIZE:
+                self._write_touched()
+                self._conn.commit()
+            entry = {'text': row[0], 'skills': json.loads(row[1])}
+            self._remember(key, entry)
+            self._stats['disk_hits'] += 1
+            return {'text': entry['text'], 'skills': dict(entry['skills'])}
+
+    def put(self, key: str, text: str, skills: dict):
+        """Store a freshly extracted document in both cache levels"""
+        entry = {'text': text, 'skills': dict(skills)}
+        with self._lock:
+            self._remember(key, entry)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO extraction_cache (content_hash, text, skills, last_access) VALUES (?, ?, ?, ?)',
+                (key, text, json.dumps(entry['skills']), time.time())
+            )
+            self._touched.pop(key, None)
+            self._disk_items += 1
+            if self._disk_items > self.max_disk_items:
+                self._evict_disk()
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._disk_items = 0
+            self._conn.execute('DELETE FROM extraction_cache')
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Counters read without the lock: put() holds it across SQLite writes, and /health must not wait on those"""
+        counts = dict(self._stats)
+        lookups = counts['memory_hits'] + counts['disk_hits'] + counts['misses']
+        hits = counts['memory_hits'] + counts['disk_hits']
+        return {
+            **counts,
+            'hits': hits,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'memory_items': len(self._memory)
+        }
+
+    def _remember(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def _write_touched(self):
+        self._conn.executemany(
+            'UPDATE extraction_cache SET last_access = ? WHERE content_hash = ?',
+            [(accessed, key) for key, accessed in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _evict_disk(self):
+        """Drop the least recently used rows down to the headroom mark and recount"""
+        self._write_touched()
+        keep = int(self.max_disk_items * (1 - EVICTION_HEADROOM))
+        count = self._conn.execute('SELECT COUNT(*) FROM extraction_cache').fetchone()[0]
+        if count > keep:
+            self._conn.execute(
+                '''DELETE FROM extraction_cache WHERE content_hash IN (
+                       SELECT content_hash FROM extraction_cache ORDER BY last_access LIMIT ?
+                   )''',
+                (count - keep,)
+            )
+        self._disk_items = min(count, keep)
@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import uuid
+
+from database import ConnectionPool
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+# How often finished jobs past their retention period are deleted
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted while the queue is at its depth limit"""
+
+
+class JobQueue:
+    """Bounded asyncio worker pool whose jobs, inputs and results survive restarts.
+
+    Job rows live in SQLite and uploaded files are kept in the spool directory,
+    so jobs that were queued or running when the process stopped are picked up
+    again by start(). Spooled files are deleted when a job finishes; the job
+    row and its result are kept for retention_seconds after that, then purged.
+    """
+
+    def __init__(self, pool: ConnectionPool, spool_dir: str, workers: int = 2, max_pending: int = 100,
+                 retention_seconds: float = 7 * 86400):
+        self.pool = pool
+        self.spool_dir = spool_dir
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._handlers = {}
+        self._queue = None
+        self._tasks = []
+        # Submissions that passed the depth check and are still spooling
+        self._reserved = 0
+
+    @staticmethod
+    def create_schema(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at)')
+        conn.commit()
+
+    def register(self, kind: str, handler):
+        """handler(files, params) is an async callable returning a JSON-serializable result.
+
+        files are the submitted file records, each with its 'field' and its
+        'path' inside the job's spool directory.
+        """
+        self._handlers[kind] = handler
+
+    def pending(self) -> int:
+        return (self._queue.qsize() if self._queue is not None else 0) + self._reserved
+
+    def check_capacity(self):
+        """Raise QueueFull if a submit now would be rejected; lets callers refuse before reading uploads"""
+        if self.pending() >= self.max_pending:
+            raise QueueFull(f"Job queue is full ({self.max_pending} pending)")
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+
+        # Re-queue work interrupted by a restart
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute('UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?', (QUEUED, RUNNING))
+            rows = conn.execute(
+                'SELECT id FROM jobs WHERE status = ? ORDER BY created_at', (QUEUED,)
+            ).fetchall()
+        for row in rows:
+            self._queue.put_nowait(row['id'])
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._purge_periodically()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, kind: str, files: list, params: dict = None) -> str:
+        """Queue a job for (field, file) pairs, taking over the files already spooled to disk.
+
+        file is a record with the upload's 'path', 'filename', 'size' and
+        'digest'; the file is moved into the job's spool directory. Moves and
+        the job insert run in a thread, off the event loop.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        # Count the slot before spooling, so concurrent submits can't all pass the check
+        self.check_capacity()
+        self._reserved += 1
+
+        job_id = str(uuid.uuid4())
+        try:
+            await asyncio.to_thread(self._spool, job_id, kind, files, params)
+            self._queue.put_nowait(job_id)
+        finally:
+            self._reserved -= 1
+        return job_id
+
+    def _spool(self, job_id: str, kind: str, files: list, params: dict):
+        job_dir = os.path.join(self.spool_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        spooled = []
+        for index, (field, upload) in enumerate(files):
+            path = os.path.join(job_dir, f"{index}{os.path.splitext(upload['filename'])[1]}")
+            shutil.move(upload['path'], path)
+            spooled.append({**upload, 'field': field, 'path': path})
+
+        payload = {'files': spooled, 'params': params or {}}
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute(
+                    'INSERT INTO jobs (id, kind, status, payload) VALUES (?, ?, ?, ?)',
+                    (job_id, kind, QUEUED, json.dumps(payload))
+                )
+
+    def get(self, job_id: str):
+        """Return the job row with its result decoded, or None"""
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                '''SELECT id, kind, status, result, error, created_at, started_at, finished_at
+                   FROM jobs WHERE id = ?''',
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def purge_finished(self) -> int:
+        """Delete completed and failed jobs that finished more than retention_seconds ago"""
+        with self.pool.connection() as conn:
+            with conn:
+                cursor = conn.execute(
+                    """DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < datetime('now', ?)""",
+                    (COMPLETED, FAILED, f"-{int(self.retention_seconds)} seconds")
+                )
+        return cursor.rowcount
+
+    async def _purge_periodically(self):
+        while True:
+            try:
+                purged = await asyncio.to_thread(self.purge_finished)
+                if purged:
+                    print(f"Purged {purged} finished jobs")
+            except Exception as e:
+                print(f"Job purge failed: {str(e)}")
+            await asyncio.sleep(PURGE_INTERVAL_SECONDS)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        claimed = await asyncio.to_thread(self._claim, job_id)
+        if claimed is None:
+            return
+
+        kind, payload = claimed
+        try:
+            files = await asyncio.to_thread(self._load_files, payload)
+            result = await self._handlers[kind](files, payload['params'])
+            status, result_json, error = COMPLETED, json.dumps(result), None
+        except asyncio.CancelledError:
+            # Shutting down: leave the job for the next start()
+            raise
+        except Exception as e:
+            status, result_json, error = FAILED, None, getattr(e, 'detail', None) or str(e)
+
+        await asyncio.to_thread(self._finish, job_id, status, result_json, error)
+
+    def _claim(self, job_id: str):
+        """Mark a job running and return (kind, payload); None if the job no longer exists"""
+        with self.pool.connection() as conn:
+            with conn:
+                row = conn.execute('SELECT kind, payload FROM jobs WHERE id = ?', (job_id,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    'UPDATE jobs SET status = ?, started_at = CURRENT_TIMESTAMP WHERE id = ?',
+                    (RUNNING, job_id)
+                )
+
+        return row['kind'], json.loads(row['payload'])
+
+    @staticmethod
+    def _load_files(payload: dict) -> list:
+        """File records of a job; ones queued before sizes and digests were recorded get them now"""
+        files = []
+        for spooled in payload['files']:
+            if 'digest' not in spooled:
+                digest = hashlib.sha256()
+                with open(spooled['path'], 'rb') as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(chunk)
+                spooled = {**spooled, 'size': os.path.getsize(spooled['path']), 'digest': digest.hexdigest()}
+            files.append(spooled)
+        return files
+
+    def _finish(self, job_id: str, status: str, result_json: str, error: str):
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute(
+                    '''UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = CURRENT_TIMESTAMP
+                       WHERE id = ?''',
+                    (status, result_json, error, job_id)
+                )
+        shutil.rmtree(os.path.join(self.spool_dir, job_id), ignore_errors=True)
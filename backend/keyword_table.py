@@ -0,0 +1,136 @@
+import json
+import sqlite3
+import sys
+import threading
+from array import array
+
+from database import ConnectionPool
+
+INSERT_KEYWORD_SQL = "INSERT INTO keyword_ids (keyword) VALUES (?) ON CONFLICT(keyword) DO NOTHING"
+
+# array typecode per stored ID width; the first byte of a packed list is the width
+ID_TYPECODES = {2: 'H', 4: 'I'}
+
+
+def pack_ids(ids) -> bytes:
+    """Sorted, de-duplicated keyword IDs as a little-endian array prefixed with the ID width.
+
+    Taxonomies stay far below 65536 keywords, so a list usually costs 2 bytes
+    per keyword instead of the ~10 its JSON string takes.
+    """
+    ids = sorted(set(ids))
+    packed = array('H' if not ids or ids[-1] < 65536 else 'I', ids)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return bytes([packed.itemsize]) + packed.tobytes()
+
+
+def unpack_ids(blob: bytes) -> array:
+    ids = array(ID_TYPECODES[blob[0]])
+    ids.frombytes(memoryview(blob)[1:])
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    return ids
+
+
+class KeywordTable:
+    """Keyword <-> integer ID table behind the packed keyword columns.
+
+    The database allocates the IDs, so every server process sharing it agrees
+    on them. Each process keeps the table in memory (it only grows with the
+    vocabulary, not with stored analyses): loaded at startup, extended when
+    it interns a new keyword, and topped up when it meets an ID another
+    process stored.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        self._ids = {}
+        self._keywords = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def create_schema(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_ids (
+                id INTEGER PRIMARY KEY,
+                keyword TEXT NOT NULL UNIQUE
+            )
+        ''')
+        conn.commit()
+
+    def load(self):
+        """Replace the in-memory table with the stored one"""
+        with self.pool.connection() as conn:
+            rows = conn.execute('SELECT id, keyword FROM keyword_ids').fetchall()
+        with self._lock:
+            self._keywords = {row['id']: row['keyword'] for row in rows}
+            self._ids = {row['keyword']: row['id'] for row in rows}
+
+    def _remember(self, rows):
+        with self._lock:
+            for row in rows:
+                self._ids[row['keyword']] = row['id']
+                self._keywords[row['id']] = row['keyword']
+
+    def ids(self, keywords) -> list:
+        """Sorted IDs for keywords, interning the ones not seen before.
+
+        Interning writes to the database, so call this off the event loop.
+        """
+        missing = sorted({keyword for keyword in keywords if keyword not in self._ids})
+        if missing:
+            placeholders = ', '.join('?' * len(missing))
+            with self.pool.connection() as conn:
+                # One transaction: the rows read back hold whichever ID was stored first, by any process
+                conn.executemany(INSERT_KEYWORD_SQL, [(keyword,) for keyword in missing])
+                rows = conn.execute(
+                    f'SELECT id, keyword FROM keyword_ids WHERE keyword IN ({placeholders})', missing
+                ).fetchall()
+                conn.commit()
+            self._remember(rows)
+        ids = self._ids
+        return sorted({ids[keyword] for keyword in keywords})
+
+    def keywords(self, ids) -> list:
+        keywords = self._keywords
+        try:
+            return [keywords[keyword_id] for keyword_id in ids]
+        except KeyError:
+            pass
+        # Interned by another process since this one loaded the table
+        unknown = sorted({keyword_id for keyword_id in ids if keyword_id not in keywords})
+        placeholders = ', '.join('?' * len(unknown))
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f'SELECT id, keyword FROM keyword_ids WHERE id IN ({placeholders})', unknown
+            ).fetchall()
+        self._remember(rows)
+        keywords = self._keywords
+        return [keywords[keyword_id] for keyword_id in ids]
+
+    def encode(self, keywords) -> bytes:
+        """Packed column value for a keyword collection"""
+        return pack_ids(self.ids(keywords))
+
+    def decode(self, value) -> list:
+        """Keywords from a stored column: packed IDs, or a JSON list in rows written before packing.
+
+        Packed lists come back in alphabetical order, the order analyses return them in.
+        """
+        if value is None:
+            return []
+        if isinstance(value, bytes):
+            return sorted(self.keywords(unpack_ids(value)))
+        return json.loads(value)
+
+    def decode_ids(self, value) -> list:
+        """Keyword IDs from a stored column, in any form decode() accepts"""
+        if value is None:
+            return []
+        if isinstance(value, bytes):
+            return unpack_ids(value).tolist()
+        return self.ids(json.loads(value))
+
+    def __len__(self):
+        return len(self._ids)
@@ -1,25 +1,63 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse, Response
 from fastapi.staticfiles import StaticFiles
 import os
-from PyPDF2 import PdfReader
-from docx import Document
 import re
 import sqlite3
 import json
 import tempfile
 import uuid
+import threading
 from datetime import datetime
-import pandas as pd
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
 import io
+import asyncio
+import heapq
+import hashlib
+import html
+import base64
+from functools import lru_cache, partial
+import numpy as np
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from extraction_cache import ExtractionCache
+from database import DATABASE_PATH, ConnectionPool, BackgroundWriter
+from resume_corpus import ResumeCorpus
+from archive_reader import iter_archive_members
+from analysis_store import AnalysisStore
+from taxonomy import TaxonomyRegistry, TaxonomySnapshot, match_keywords
+from semantic_index import SemanticEncoder, VectorIndex
+from analytics_store import AnalyticsStore, SCORE_COLUMNS
+from keyword_table import KeywordTable
+from match_state import MatchState, diff_keyword_sets
+from duplicate_index import DuplicateIndex, normalized_text_hash, text_fingerprint
+from job_queue import JobQueue, QueueFull, COMPLETED, FAILED
+import metrics
+from metrics import stage_timer, timed_stage
+from batch_scoring import (
+    QUALITY_COLUMNS, ComparisonResult, KeywordVocabulary, batch_match_scores, quality_matrix, round_scores,
+    scores_from_sums
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_db()
+    # Open the file-backed stores now rather than inside the first request that needs one
+    await asyncio.to_thread(open_storage)
+    if WARMUP_ON_STARTUP:
+        print(f"Warmup finished: {await warmup(WARMUP_PRELOAD)}")
+    await job_queue.start()
+    taxonomy_watcher = asyncio.create_task(watch_taxonomy_file()) if taxonomy_registry.file_path else None
+    yield
+    if taxonomy_watcher is not None:
+        taxonomy_watcher.cancel()
+    await job_queue.stop()
+    shutdown_analysis_pool()
+    history_writer.stop()
+    db_pool.close_all()
 
-app = FastAPI(title="AI-Powered Resume Matcher API - Enhanced Version")
+app = FastAPI(title="AI-Powered Resume Matcher API - Enhanced Version", lifespan=lifespan)
 
 # CORS for frontend
 origins = [
@@ -36,9 +74,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Use the route template so /history/{session_id} is one series
+        route = request.scope.get('route')
+        path = route.path if route is not None else 'unmatched'
+        metrics.REQUEST_DURATION.observe(
+            time.perf_counter() - start, method=request.method, path=path, status=status
+        )
+
 # Database setup
+db_pool = ConnectionPool(DATABASE_PATH, size=int(os.getenv('DB_POOL_SIZE', '4')))
+history_writer = BackgroundWriter(
+    db_pool, on_batch=lambda rows, seconds: metrics.STAGE_DURATION.observe(seconds, stage='sqlite_write')
+)
+resume_corpus = ResumeCorpus(db_pool)
+
+# Keyword <-> ID table; history keyword columns store packed ID arrays instead of JSON strings
+keyword_table = KeywordTable(db_pool)
+
+# Matched-weight sums per analysis, so JD edits re-score stored rows without re-parsing
+match_state = MatchState(db_pool, keyword_table)
+
+# Resumes seen so far by normalized-text hash and MinHash signature
+duplicate_index = DuplicateIndex(db_pool, threshold=float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8')))
+
+# Background analysis jobs; uploads are spooled to disk until the job finishes
+job_queue = JobQueue(
+    db_pool,
+    os.getenv('JOB_SPOOL_DIR', 'job_uploads'),
+    workers=int(os.getenv('JOB_WORKERS', '2')),
+    max_pending=int(os.getenv('JOB_QUEUE_LIMIT', '100')),
+    retention_seconds=float(os.getenv('JOB_RETENTION_SECONDS', str(7 * 86400)))
+)
+
 def init_db():
-    conn = sqlite3.connect('resume_matcher_enhanced.db', check_same_thread=False)
+    with db_pool.connection() as conn:
+        create_schema(conn)
+        ResumeCorpus.create_schema(conn)
+        JobQueue.create_schema(conn)
+        TaxonomyRegistry.create_schema(conn)
+        KeywordTable.create_schema(conn)
+        MatchState.create_schema(conn)
+        DuplicateIndex.create_schema(conn)
+    keyword_table.load()
+
+def create_schema(conn: sqlite3.Connection):
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -74,10 +162,150 @@ def init_db():
         )
     ''')
     
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analysis_history_session_created
+        ON analysis_history(session_id, created_at)
+    ''')
+    
+    # History pages are ordered by (created_at, id); each filter column gets an
+    # index in that order so a page is one index range scan (rowid = id is implicit)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analysis_history_created
+        ON analysis_history(created_at)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analysis_history_resume_created
+        ON analysis_history(resume_filename, created_at)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analysis_history_jd_created
+        ON analysis_history(jd_filename, created_at)
+    ''')
+    
     conn.commit()
-    conn.close()
 
-init_db()
+# Stores below open files on first use, not at import; getters may race from request threads
+_storage_lock = threading.Lock()
+_extraction_cache = None
+_analytics_store = None
+_semantic_index = None
+
+def get_extraction_cache() -> ExtractionCache:
+    """Cache of extracted text/keywords keyed by upload content hash, opened on first use"""
+    global _extraction_cache
+    if _extraction_cache is None:
+        with _storage_lock:
+            if _extraction_cache is None:
+                _extraction_cache = ExtractionCache(
+                    os.getenv('EXTRACTION_CACHE_DB', 'resume_matcher_cache.db'),
+                    max_memory_items=int(os.getenv('EXTRACTION_CACHE_MEMORY_ITEMS', '256')),
+                    max_disk_items=int(os.getenv('EXTRACTION_CACHE_DISK_ITEMS', '10000'))
+                )
+    return _extraction_cache
+
+def get_analytics_store() -> AnalyticsStore:
+    """Columnar copy of analysis_history for aggregate queries; catches up from the table on demand"""
+    global _analytics_store
+    if _analytics_store is None:
+        with _storage_lock:
+            if _analytics_store is None:
+                _analytics_store = AnalyticsStore(os.getenv('ANALYTICS_DIR', 'analytics_store'), keyword_table)
+    return _analytics_store
+
+ANALYTICS_SYNC_BATCH = 5000
+
+# Recent /match/ analyses, so highlighting and reports can be requested by session ID
+analysis_store = AnalysisStore(
+    ttl_seconds=float(os.getenv('ANALYSIS_STORE_TTL_SECONDS', '3600')),
+    max_items=int(os.getenv('ANALYSIS_STORE_MAX_ITEMS', '1000')),
+    max_bytes=int(os.getenv('ANALYSIS_STORE_MAX_BYTES', str(256 * 1024 * 1024)))
+)
+
+# Limits for uploaded documents; extraction stops early at the page/character caps
+MAX_UPLOAD_BYTES = int(os.getenv('MAX_UPLOAD_BYTES', str(20 * 1024 * 1024)))
+MAX_DOCUMENT_PAGES = int(os.getenv('MAX_DOCUMENT_PAGES', '50'))
+MAX_EXTRACTED_CHARS = int(os.getenv('MAX_EXTRACTED_CHARS', '200000'))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+DOCX_PARAGRAPHS_PER_PAGE = 40
+
+# Extraction time above which a document is counted and logged as slow
+SLOW_DOCUMENT_SECONDS = float(os.getenv('SLOW_DOCUMENT_SECONDS', '2.0'))
+
+# Worker processes for CPU-bound extraction/analysis (0 runs everything in-process)
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', str(os.cpu_count() or 1)))
+_analysis_pool = None
+
+def get_analysis_pool():
+    """Create the analysis process pool on first use"""
+    global _analysis_pool
+    if _analysis_pool is None and ANALYSIS_WORKERS > 0:
+        _analysis_pool = ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS)
+    return _analysis_pool
+
+def shutdown_analysis_pool():
+    global _analysis_pool
+    if _analysis_pool is not None:
+        _analysis_pool.shutdown(cancel_futures=True)
+        _analysis_pool = None
+
+# Resumes scored at once by the streaming comparison endpoint
+COMPARE_STREAM_CONCURRENCY = int(os.getenv('COMPARE_STREAM_CONCURRENCY', str(max(ANALYSIS_WORKERS, 1) * 2)))
+
+# Bulk archive screening: archive size cap, files per archive, and resumes scored at once
+MAX_ARCHIVE_BYTES = int(os.getenv('MAX_ARCHIVE_BYTES', str(500 * 1024 * 1024)))
+BULK_MAX_MEMBERS = int(os.getenv('BULK_MAX_MEMBERS', '5000'))
+BULK_SCREEN_CONCURRENCY = int(os.getenv('BULK_SCREEN_CONCURRENCY', str(COMPARE_STREAM_CONCURRENCY)))
+
+# Most reports rendered by one /generate-reports/ call
+MAX_BATCH_REPORTS = int(os.getenv('MAX_BATCH_REPORTS', '200'))
+
+# Threads for the blocking calls handlers make between pool stages: SQLite
+# reads and commits, temp-file writes, cache lookups. Kept apart from the
+# event loop's default executor so cheap endpoints never queue behind uploads.
+BLOCKING_THREADS = int(os.getenv('BLOCKING_THREADS', '8'))
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_THREADS, thread_name_prefix='blocking')
+
+# Most calls in flight per stage. Work over the limit waits here, on the event
+# loop, instead of piling up in an executor queue where it would hold its
+# arguments in memory and delay every other request's work behind it.
+STAGE_CONCURRENCY = {
+    'parse': int(os.getenv('PARSE_CONCURRENCY', str(max(ANALYSIS_WORKERS, 1)))),
+    'analyze': int(os.getenv('ANALYZE_CONCURRENCY', str(max(ANALYSIS_WORKERS, 1)))),
+    'render': int(os.getenv('RENDER_CONCURRENCY', str(max(ANALYSIS_WORKERS // 2, 1)))),
+    'blocking': BLOCKING_THREADS
+}
+stage_semaphores = {stage: asyncio.Semaphore(limit) for stage, limit in STAGE_CONCURRENCY.items()}
+
+async def run_blocking(func, *args):
+    """Run a blocking call on the blocking-work threads"""
+    async with stage_semaphores['blocking']:
+        return await asyncio.get_running_loop().run_in_executor(blocking_executor, func, *args)
+
+async def run_in_analysis_pool(func, *args, stage: str = 'analyze'):
+    """Run func in the analysis process pool (on a blocking-work thread when the pool is disabled).
+    
+    stage names the concurrency limit the call counts against.
+    """
+    async with stage_semaphores[stage]:
+        pool = get_analysis_pool()
+        if pool is None:
+            return await asyncio.get_running_loop().run_in_executor(blocking_executor, func, *args)
+        result, error, updates = await asyncio.get_running_loop().run_in_executor(
+            pool, call_with_metrics, func, *args
+        )
+    # Stage timings and document counters recorded in the worker belong on this process's /metrics
+    metrics.REGISTRY.apply(updates)
+    if error is not None:
+        raise error
+    return result
+
+def call_with_metrics(func, *args) -> tuple:
+    """Run func in a pool worker; returns (result, exception, metric updates it recorded)"""
+    with metrics.capture() as updates:
+        try:
+            return func(*args), None, updates
+        except Exception as e:
+            return None, e, updates
 
 # Enhanced keyword categories with weights
 SKILL_KEYWORDS = {
@@ -118,6 +346,9 @@ QUALIFICATION_KEYWORDS = {
     }
 }
 
+# Skills that earn a bonus when matched and a penalty when missing
+HIGH_VALUE_SKILLS = ['python', 'java', 'javascript', 'aws', 'docker', 'kubernetes', 'react', 'machine learning']
+
 # Action verbs for analysis
 ACTION_VERBS = {
     'strong': ['achieved', 'implemented', 'developed', 'managed', 'led', 'optimized', 'increased', 
@@ -133,6 +364,88 @@ EXPERIENCE_PATTERNS = [
     r'(\d+)\s*years?.*experience'
 ]
 
+# Alternative spellings reported under the taxonomy term they stand for
+DEFAULT_SYNONYMS = {
+    'k8s': 'kubernetes',
+    'postgres': 'postgresql',
+    'golang': 'go',
+    'nodejs': 'node',
+    'reactjs': 'react',
+    'vuejs': 'vue',
+    'sklearn': 'scikit'
+}
+
+# The constants above are the built-in taxonomy; TAXONOMY_FILE (JSON with the
+# same sections) or the taxonomy_* tables replace it, and POST
+# /taxonomy/reload swaps in changes without a restart
+taxonomy_registry = TaxonomyRegistry(
+    defaults={
+        'skills': SKILL_KEYWORDS,
+        'qualifications': QUALIFICATION_KEYWORDS,
+        'action_verbs': ACTION_VERBS,
+        'high_value_skills': HIGH_VALUE_SKILLS,
+        'synonyms': DEFAULT_SYNONYMS
+    },
+    pool=db_pool,
+    file_path=os.getenv('TAXONOMY_FILE')
+)
+TAXONOMY_RELOAD_INTERVAL = float(os.getenv('TAXONOMY_RELOAD_INTERVAL', '30'))
+
+def current_taxonomy() -> TaxonomySnapshot:
+    return taxonomy_registry.current()
+
+# Related terms that count towards a skill category for semantic scoring only;
+# they are never reported as keyword matches
+RELATED_CONCEPT_TERMS = {
+    'programming': ['golang', 'scala', 'ruby', 'php', 'object oriented', 'programming'],
+    'web_frameworks': ['frontend', 'front end', 'backend', 'back end', 'full stack', 'rest api', 'graphql',
+                       'next.js', 'fastapi', 'web development'],
+    'database': ['nosql', 'postgres', 'cassandra', 'dynamodb', 'elasticsearch', 'data warehouse', 'etl'],
+    'cloud_devops': ['devops', 'ansible', 'helm', 'k8s', 'cloudformation', 'continuous integration',
+                     'continuous delivery', 'microservices', 'serverless', 'infrastructure as code'],
+    'data_science': ['deep learning', 'neural network', 'neural networks', 'nlp', 'natural language processing',
+                     'computer vision', 'data analysis', 'statistics', 'keras', 'artificial intelligence'],
+    'tools': ['github', 'gitlab', 'bitbucket', 'trello', 'notion']
+}
+
+# Optional semantic similarity alongside keyword matching (?semantic=true, or on by default with SEMANTIC_SCORING=1)
+SEMANTIC_SCORING = os.getenv('SEMANTIC_SCORING', '0').lower() in ('1', 'true', 'yes')
+semantic_encoder = SemanticEncoder(
+    {
+        category: {'keywords': data['keywords'] + RELATED_CONCEPT_TERMS.get(category, []), 'weight': data['weight']}
+        for category, data in SKILL_KEYWORDS.items()
+    },
+    dimensions=int(os.getenv('SEMANTIC_DIMENSIONS', '1024')),
+    cache_size=int(os.getenv('SEMANTIC_CACHE_ITEMS', '1024'))
+)
+
+def get_semantic_index() -> VectorIndex:
+    """Vectors of corpus resumes keyed by their content hash, ranked with one matrix product per block"""
+    global _semantic_index
+    if _semantic_index is None:
+        with _storage_lock:
+            if _semantic_index is None:
+                _semantic_index = VectorIndex(
+                    os.getenv('SEMANTIC_INDEX_DIR', 'semantic_index'), semantic_encoder.dimensions,
+                    semantic_encoder.version
+                )
+    return _semantic_index
+
+def open_storage():
+    """Open every file-backed store up front (called from the lifespan)"""
+    get_extraction_cache()
+    get_semantic_index()
+    get_analytics_store()
+
+def similarity_to_score(similarity: float) -> float:
+    """Cosine similarity as a 0-100 score"""
+    return round(max(similarity, 0.0) * 100, 2)
+
+def semantic_score(resume_text: str, jd_text: str) -> float:
+    """Semantic similarity of a resume and a JD as a 0-100 score"""
+    with stage_timer("semantic_score"):
+        return similarity_to_score(semantic_encoder.similarity(resume_text, jd_text))
+
 # ATS unfriendly elements
 ATS_UNFRIENDLY_ELEMENTS = [
     'table', 'column', 'image', 'graphic', 'chart', 'infographic',
@@ -144,83 +457,265 @@ REQUIRED_SECTIONS = [
     'summary', 'experience', 'education', 'skills', 'contact'
 ]
 
+def iter_docx_pages(file_path: str):
+    """python-docx has no pages, so group paragraphs into fixed-size chunks"""
+    # Parser libraries are imported on first use to keep worker startup cheap (see warmup)
+    from docx import Document
+    
+    doc = Document(file_path)
+    chunk = []
+    for p in doc.paragraphs:
+        if p.text.strip():
+            chunk.append(p.text)
+            if len(chunk) >= DOCX_PARAGRAPHS_PER_PAGE:
+                yield "\n".join(chunk)
+                chunk = []
+    if chunk:
+        yield "\n".join(chunk)
+
+def iter_document_pages(file_path: str, max_pages: int = None, max_chars: int = None):
+    """Yield extracted text one page at a time, stopping early at the page or character cap"""
+    max_pages = MAX_DOCUMENT_PAGES if max_pages is None else max_pages
+    max_chars = MAX_EXTRACTED_CHARS if max_chars is None else max_chars
+    
+    if file_path.endswith(".pdf"):
+        from PyPDF2 import PdfReader
+        
+        # PdfReader parses each page lazily, so pages past the cap are never touched
+        pages = (page.extract_text() for page in PdfReader(file_path).pages)
+    elif file_path.endswith(".docx"):
+        pages = iter_docx_pages(file_path)
+    else:
+        return
+    
+    chars = 0
+    for index, page_text in enumerate(pages):
+        if index >= max_pages:
+            metrics.TRUNCATED_DOCUMENTS.inc(limit='pages')
+            return
+        if not page_text:
+            continue
+        if chars + len(page_text) > max_chars:
+            metrics.TRUNCATED_DOCUMENTS.inc(limit='chars')
+            yield page_text[:max_chars - chars]
+            return
+        chars += len(page_text)
+        yield page_text
+
+@timed_stage("extract_text")
 def extract_text_from_file(file_path: str) -> str:
     """Extract text from PDF or DOCX files with error handling"""
     try:
-        if file_path.endswith(".pdf"):
-            text = ""
-            pdf = PdfReader(file_path)
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            return text.strip()
-        elif file_path.endswith(".docx"):
-            doc = Document(file_path)
-            return "\n".join([p.text for p in doc.paragraphs if p.text.strip()])
-        else:
-            return ""
+        return "\n".join(iter_document_pages(file_path)).strip()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error extracting text: {str(e)}")
 
-def extract_skills_and_qualifications(text: str) -> dict:
+# Additional technical skills such as "react + node" or "html5"
+TECHNICAL_PATTERNS = [
+    re.compile(r'\b[a-z]+\s*\+\s*[a-z]+\b'),
+    re.compile(r'\b[a-z]{2,}\d+\b'),
+]
+
+# Words in the longest technical pattern or experience phrase ("10 + years", "react + node")
+MIN_CARRY_WORDS = 3
+
+def extract_skills_and_qualifications(text: str, taxonomy: TaxonomySnapshot = None) -> dict:
     """Extract skills and qualifications from text with weights"""
-    text = text.lower()
-    
-    # Remove special characters but keep important symbols like +, #
-    text = re.sub(r"[^a-z0-9\s+#\.]", " ", text)
-    
-    found_keywords = {}
+    return extract_skills_from_pages([text], taxonomy)
+
+@timed_stage("extract_skills")
+def extract_skills_from_pages(pages, taxonomy: TaxonomySnapshot = None) -> dict:
+    """Extract skills and qualifications from a stream of page texts.
     
-    # Extract skills from predefined categories with weights
-    for category, data in SKILL_KEYWORDS.items():
-        for skill in data['keywords']:
-            if re.search(r'\b' + re.escape(skill) + r'\b', text):
-                found_keywords[skill] = data['weight']
+    Pages are normalized and matched one at a time, each behind the last few
+    words of the page before it, so a term or phrase broken by a page break
+    is found just as in the "\n"-joined text. Results are ordered the same
+    way as for the joined text.
+    """
+    matcher = (taxonomy or current_taxonomy()).keyword_matcher
+    carry_words = max(matcher['max_term_words'], MIN_CARRY_WORDS)
+    taxonomy_found = {}
+    experience_years = 0
+    technical_found = [{} for _ in TECHNICAL_PATTERNS]
+    tail = None
     
-    # Extract qualifications with weights
-    for category, data in QUALIFICATION_KEYWORDS.items():
-        for qual in data['keywords']:
-            if re.search(r'\b' + re.escape(qual) + r'\b', text):
-                found_keywords[qual] = data['weight']
+    for page in pages:
+        # Remove special characters but keep important symbols like +, #
+        page = re.sub(r"[^a-z0-9\s+#\.]", " ", page.lower())
+        if tail is not None:
+            page = tail + "\n" + page
+        # rsplit only walks back over the words it splits off
+        head = page.rsplit(None, carry_words)
+        tail = page[len(head[0]):] if len(head) > carry_words else page
+        
+        # Extract skills and qualifications with weights in a single pass
+        taxonomy_found.update(match_keywords(page, matcher))
+        
+        # Extract experience years
+        experience_years = max(experience_years, find_experience_years(page))
+        
+        for pattern, found in zip(TECHNICAL_PATTERNS, technical_found):
+            for match in pattern.findall(page):
+                found[match] = 1.0
     
-    # Extract experience years
-    experience_years = extract_experience(text)
+    found_keywords = {
+        term: taxonomy_found[term] for term in sorted(taxonomy_found, key=matcher['order'].__getitem__)
+    }
     if experience_years > 0:
         found_keywords['experience'] = min(experience_years * 0.1, 1.0)
+    for found in technical_found:
+        found_keywords.update(found)
     
-    # Extract additional technical skills using patterns
-    technical_patterns = [
-        r'\b[a-z]+\s*\+\s*[a-z]+\b',
-        r'\b[a-z]{2,}\d+\b',
-    ]
+    return found_keywords
+
+def extract_document_from_path(file_path: str, filename: str, size: int, taxonomy: TaxonomySnapshot = None) -> dict:
+    """Extract text and keywords from a document already on disk"""
+    start = time.perf_counter()
+    with stage_timer("extract_text"):
+        try:
+            pages = list(iter_document_pages(file_path))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error extracting text: {str(e)}")
     
-    for pattern in technical_patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
-            found_keywords[match] = 1.0
+    elapsed = time.perf_counter() - start
+    metrics.DOCUMENTS_PARSED.inc(format=os.path.splitext(filename)[1].lstrip('.').lower() or 'unknown')
+    metrics.BYTES_PROCESSED.inc(size)
+    if elapsed > SLOW_DOCUMENT_SECONDS:
+        metrics.SLOW_DOCUMENTS.inc()
+        print(f"Slow extraction: {filename} ({size} bytes) took {elapsed:.2f}s")
     
-    return found_keywords
+    return {'text': "\n".join(pages).strip(), 'skills': extract_skills_from_pages(pages, taxonomy)}
 
-def extract_experience(text: str) -> int:
-    """Extract years of experience from text"""
-    text = text.lower()
-    max_experience = 0
+def extract_document(content: bytes, filename: str, taxonomy: TaxonomySnapshot = None) -> dict:
+    """Extract text and keywords from upload bytes without touching the cache"""
+    with stage_timer("temp_file_write"):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp:
+            temp.write(content)
+            temp_path = temp.name
+    
+    try:
+        return extract_document_from_path(temp_path, filename, len(content), taxonomy)
+    finally:
+        os.unlink(temp_path)
+
+def extract_in_worker(extract, *args) -> dict:
+    """Call an extract_document* function in a pool worker; HTTP errors come back as picklable RuntimeErrors"""
+    try:
+        return extract(*args)
+    except HTTPException as e:
+        raise RuntimeError(e.detail)
+
+async def iter_upload_chunks(upload: UploadFile, max_bytes: int = None):
+    """Yield an upload in UPLOAD_CHUNK_SIZE pieces, raising 413 as soon as it passes max_bytes"""
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    size = 0
+    while True:
+        chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            return
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"{upload.filename} exceeds the {max_bytes} byte upload limit"
+            )
+        yield chunk
+
+async def spool_upload(upload: UploadFile, max_bytes: int = None) -> dict:
+    """Copy an upload to a temp file in chunks, hashing it on the way and enforcing the size cap.
     
-    for pattern in EXPERIENCE_PATTERNS:
-        matches = re.findall(pattern, text)
-        for match in matches:
+    File creation and every chunk write happen on the blocking-work threads.
+    """
+    suffix = os.path.splitext(upload.filename)[1]
+    digest = hashlib.sha256()
+    size = 0
+    
+    with stage_timer("temp_file_write"):
+        temp = await run_blocking(partial(tempfile.NamedTemporaryFile, delete=False, suffix=suffix))
+        try:
             try:
-                years = int(match)
-                max_experience = max(max_experience, years)
-            except ValueError:
-                continue
+                async for chunk in iter_upload_chunks(upload, max_bytes):
+                    size += len(chunk)
+                    digest.update(chunk)
+                    await run_blocking(temp.write, chunk)
+            finally:
+                await run_blocking(temp.close)
+        except BaseException:
+            await run_blocking(os.unlink, temp.name)
+            raise
     
-    return max_experience
+    return {
+        'path': temp.name,
+        'filename': upload.filename,
+        'size': size,
+        'digest': digest.hexdigest()
+    }
 
-def check_ats_friendliness(text: str, file_path: str) -> dict:
-    """Check ATS compatibility of the resume"""
-    text_lower = text.lower()
+@asynccontextmanager
+async def spooled_uploads(*uploads: UploadFile, max_bytes: int = None):
+    """Spool uploads to disk for the duration of the block, then delete the ones still there"""
+    spooled = []
+    try:
+        for upload in uploads:
+            spooled.append(await spool_upload(upload, max_bytes))
+        yield spooled
+    finally:
+        for item in spooled:
+            await run_blocking(discard_spooled, item['path'])
+
+def discard_spooled(path: str):
+    """Delete a spooled upload unless it was handed over (the job queue moves its files)"""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+async def load_spooled_document(spooled: dict, taxonomy: TaxonomySnapshot = None) -> dict:
+    """Extract text and keywords from a spooled upload, reusing cached results for repeat files"""
+    taxonomy = taxonomy or current_taxonomy()
+    cache_key = ExtractionCache.key_for_digest(
+        spooled['digest'], os.path.splitext(spooled['filename'])[1], taxonomy.version
+    )
+    cached = await run_blocking(get_extraction_cache().get, cache_key)
+    if cached is not None:
+        return cached
+    
+    document = await run_in_analysis_pool(
+        extract_in_worker, extract_document_from_path, spooled['path'], spooled['filename'], spooled['size'],
+        taxonomy, stage='parse'
+    )
+    await run_blocking(get_extraction_cache().put, cache_key, document['text'], document['skills'])
+    return document
+
+# Patterns for quantifiable achievements
+QUANTIFIABLE_PATTERNS = [
+    r'increased by\s*(\d+%?)',
+    r'decreased by\s*(\d+%?)',
+    r'reduced by\s*(\d+%?)',
+    r'improved by\s*(\d+%?)',
+    r'saved\s*(\$?\d+)',
+    r'achieved\s*(\d+%?)',
+    r'managed\s*(\$?\d+)',
+    r'led\s*team of\s*(\d+)',
+    r'handled\s*(\d+)'
+]
+
+# Quality rule sets compiled once at import time. The quantifiable patterns
+# stay separate: each has a literal prefix that re can scan for, which beats
+# one fused alternation tried at every offset.
+QUANTIFIABLE_REGEXES = [re.compile(pattern) for pattern in QUANTIFIABLE_PATTERNS]
+
+# Only the largest number matters, so EXPERIENCE_PATTERNS collapse into one
+# regex: every number the "experience ... N years" variants capture is (a
+# suffix of) a number already followed by "years", which this one matches.
+EXPERIENCE_YEARS_REGEX = re.compile(r'(\d+)\s*\+?\s*y(?:ears?|rs?)')
+
+def find_experience_years(text_lower: str) -> int:
+    """Largest year count mentioned in already-lowercased text"""
+    return max(map(int, EXPERIENCE_YEARS_REGEX.findall(text_lower)), default=0)
+
+def score_ats_rules(text_lower: str, word_count: int) -> dict:
+    """ATS checks on already-lowercased text"""
     score = 100
     issues = []
     
@@ -230,20 +725,12 @@ def check_ats_friendliness(text: str, file_path: str) -> dict:
             score -= 10
             issues.append(f"Contains {element}")
     
-    # Check file format
-    if file_path.endswith('.pdf'):
-        # Additional PDF checks can be added here
-        pass
-    elif file_path.endswith('.docx'):
-        # Additional DOCX checks
-        pass
-    
     # Check for proper structure
-    if len(text.split()) < 100:
+    if word_count < 100:
         score -= 20
         issues.append("Resume too short")
     
-    if len(text.split()) > 800:
+    if word_count > 800:
         score -= 10
         issues.append("Resume too long")
     
@@ -253,9 +740,8 @@ def check_ats_friendliness(text: str, file_path: str) -> dict:
         'is_ats_friendly': score >= 70
     }
 
-def check_section_completeness(text: str) -> dict:
-    """Check if all required sections are present"""
-    text_lower = text.lower()
+def score_sections(text_lower: str) -> dict:
+    """Section completeness on already-lowercased text"""
     sections_found = []
     missing_sections = []
     
@@ -273,19 +759,11 @@ def check_section_completeness(text: str) -> dict:
         'missing_sections': missing_sections
     }
 
-def analyze_action_verbs(text: str) -> dict:
-    """Analyze usage of strong vs weak action verbs"""
-    text_lower = text.lower()
-    strong_verbs_found = []
-    weak_verbs_found = []
-    
-    for verb in ACTION_VERBS['strong']:
-        if re.search(r'\b' + re.escape(verb) + r'\b', text_lower):
-            strong_verbs_found.append(verb)
-    
-    for verb in ACTION_VERBS['weak']:
-        if re.search(r'\b' + re.escape(verb) + r'\b', text_lower):
-            weak_verbs_found.append(verb)
+def score_action_verbs(text_lower: str, taxonomy: TaxonomySnapshot = None) -> dict:
+    """Strong vs weak action verbs in already-lowercased text, found in one regex pass"""
+    found = match_keywords(text_lower, (taxonomy or current_taxonomy()).action_verb_matcher)
+    strong_verbs_found = [verb for verb, strength in found.items() if strength == 'strong']
+    weak_verbs_found = [verb for verb, strength in found.items() if strength == 'weak']
     
     total_verbs = len(strong_verbs_found) + len(weak_verbs_found)
     if total_verbs > 0:
@@ -300,25 +778,11 @@ def analyze_action_verbs(text: str) -> dict:
         'total_verbs': total_verbs
     }
 
-def check_quantifiable_impact(text: str) -> dict:
-    """Check for quantifiable achievements and metrics"""
-    # Patterns for quantifiable achievements
-    patterns = [
-        r'increased by\s*(\d+%?)',
-        r'decreased by\s*(\d+%?)',
-        r'reduced by\s*(\d+%?)',
-        r'improved by\s*(\d+%?)',
-        r'saved\s*(\$?\d+)',
-        r'achieved\s*(\d+%?)',
-        r'managed\s*(\$?\d+)',
-        r'led\s*team of\s*(\d+)',
-        r'handled\s*(\d+)'
-    ]
-    
+def score_quantifiable_impact(text_lower: str) -> dict:
+    """Quantifiable achievements in already-lowercased text"""
     quantifiable_found = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text.lower())
-        quantifiable_found.extend(matches)
+    for pattern in QUANTIFIABLE_REGEXES:
+        quantifiable_found.extend(pattern.findall(text_lower))
     
     score = min(len(quantifiable_found) * 10, 100)
     
@@ -328,14 +792,60 @@ def check_quantifiable_impact(text: str) -> dict:
         'count': len(quantifiable_found)
     }
 
+@timed_stage("quality_analysis")
+def analyze_resume_quality(text: str, taxonomy: TaxonomySnapshot = None) -> dict:
+    """Run every resume quality check on a single lowercased copy of the text.
+    
+    Returns the same dicts as the individual check functions below, plus the
+    years of experience.
+    """
+    text_lower = text.lower()
+    
+    return {
+        'ats_analysis': score_ats_rules(text_lower, len(text.split())),
+        'completeness_analysis': score_sections(text_lower),
+        'action_verbs_analysis': score_action_verbs(text_lower, taxonomy),
+        'quantifiable_impact_analysis': score_quantifiable_impact(text_lower),
+        'experience_years': find_experience_years(text_lower)
+    }
+
+@timed_stage("extract_experience")
+def extract_experience(text: str) -> int:
+    """Extract years of experience from text"""
+    return find_experience_years(text.lower())
+
+@timed_stage("ats_check")
+def check_ats_friendliness(text: str, file_path: str) -> dict:
+    """Check ATS compatibility of the resume"""
+    return score_ats_rules(text.lower(), len(text.split()))
+
+@timed_stage("completeness_check")
+def check_section_completeness(text: str) -> dict:
+    """Check if all required sections are present"""
+    return score_sections(text.lower())
+
+@timed_stage("action_verbs")
+def analyze_action_verbs(text: str) -> dict:
+    """Analyze usage of strong vs weak action verbs"""
+    return score_action_verbs(text.lower())
+
+@timed_stage("quantifiable_impact")
+def check_quantifiable_impact(text: str) -> dict:
+    """Check for quantifiable achievements and metrics"""
+    return score_quantifiable_impact(text.lower())
+
+MISSING_SKILLS_SUGGESTION = "Add these key skills from JD: "
+
+def missing_skills_suggestion(missing_keywords: list) -> str:
+    return MISSING_SKILLS_SUGGESTION + ', '.join(missing_keywords[:5])  # Top 5 missing
+
 def generate_improvement_suggestions(analysis_results: dict) -> list:
     """Generate specific improvement suggestions"""
     suggestions = []
     
     # Skills match suggestions
     if analysis_results['missing_keywords']:
-        missing_skills = analysis_results['missing_keywords'][:5]  # Top 5 missing
-        suggestions.append(f"Add these key skills from JD: {', '.join(missing_skills)}")
+        suggestions.append(missing_skills_suggestion(analysis_results['missing_keywords']))
     
     # ATS suggestions
     ats_issues = analysis_results['ats_analysis']['issues']
@@ -361,15 +871,17 @@ def generate_improvement_suggestions(analysis_results: dict) -> list:
     
     return suggestions[:6]  # Return top 6 suggestions
 
-def calculate_match_score(resume_skills: dict, jd_skills: dict, additional_analysis: dict) -> tuple:
+@timed_stage("match_score")
+def calculate_match_score(resume_skills: dict, jd_skills: dict, additional_analysis: dict,
+                          taxonomy: TaxonomySnapshot = None) -> tuple:
     """Calculate comprehensive match score with detailed breakdown"""
     
     if not jd_skills:
         return 0.0, [], {}, {}
     
     # Find matching skills
-    matched_skills = set(resume_skills.keys()).intersection(set(jd_skills.keys()))
-    missing_skills = set(jd_skills.keys()) - set(resume_skills.keys())
+    matched_skills = resume_skills.keys() & jd_skills.keys()
+    missing_skills = jd_skills.keys() - resume_skills.keys()
     
     # Calculate weighted scores
     jd_total_weight = sum(jd_skills.values())
@@ -391,14 +903,14 @@ def calculate_match_score(resume_skills: dict, jd_skills: dict, additional_analy
     final_score = (base_score * 0.5) + ats_score + completeness_score + action_verbs_score + quantifiable_score
     
     # Bonus for high-value skills match
-    high_value_skills = ['python', 'java', 'javascript', 'aws', 'docker', 'kubernetes', 'react', 'machine learning']
+    high_value_skills = (taxonomy or current_taxonomy()).high_value_skills
     high_value_matches = matched_skills.intersection(high_value_skills)
     if high_value_matches:
         bonus = min(len(high_value_matches) * 3, 15)
         final_score += bonus
     
     # Penalty for too many missing key skills
-    key_skills = set(high_value_skills).intersection(set(jd_skills.keys()))
+    key_skills = jd_skills.keys() & high_value_skills
     missing_key_skills = key_skills - matched_skills
     if key_skills:
         penalty = (len(missing_key_skills) / len(key_skills)) * 20
@@ -426,314 +938,839 @@ def calculate_match_score(resume_skills: dict, jd_skills: dict, additional_analy
     
     return round(final_score, 2), sorted(list(matched_skills)), sorted(list(missing_skills)), breakdown
 
-def save_analysis_history(session_id: str, resume_filename: str, jd_filename: str, 
-                         match_score: float, matched_keywords: list, missing_keywords: list,
-                         resume_skills: list, jd_skills: list, breakdown: dict,
-                         ats_score: float, completeness_score: float, 
-                         action_verbs_score: float, quantifiable_impact_score: float,
-                         improvement_suggestions: list):
-    conn = sqlite3.connect('resume_matcher_enhanced.db', check_same_thread=False)
-    cursor = conn.cursor()
-    cursor.execute(
-        """INSERT INTO analysis_history 
-           (session_id, resume_filename, jd_filename, match_score, matched_keywords, missing_keywords,
-            resume_skills, jd_skills, breakdown, ats_score, completeness_score, 
-            action_verbs_score, quantifiable_impact_score, improvement_suggestions) 
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        (session_id, resume_filename, jd_filename, match_score, 
-         json.dumps(matched_keywords), json.dumps(missing_keywords),
-         json.dumps(resume_skills), json.dumps(jd_skills), json.dumps(breakdown),
-         ats_score, completeness_score, action_verbs_score, quantifiable_impact_score,
-         json.dumps(improvement_suggestions))
-    )
-    conn.commit()
-    conn.close()
-
-def get_analysis_history(session_id: str):
-    conn = sqlite3.connect('resume_matcher_enhanced.db', check_same_thread=False)
-    cursor = conn.cursor()
-    cursor.execute(
-        """SELECT id, resume_filename, jd_filename, match_score, created_at, 
-                  matched_keywords, missing_keywords, improvement_suggestions
-           FROM analysis_history 
-           WHERE session_id = ? 
-           ORDER BY created_at DESC 
-           LIMIT 20""",
-        (session_id,)
+def batch_calculate_match_scores(resume_skill_sets: list, jd_skills: dict, additional_analyses: list,
+                                 vocabulary: KeywordVocabulary = None, taxonomy: TaxonomySnapshot = None) -> list:
+    """Final scores for many resumes at once; same values as calculate_match_score(...)[0]"""
+    if vocabulary is None:
+        vocabulary = KeywordVocabulary()
+    resume_matrix = vocabulary.encode(resume_skill_sets)
+    components = batch_match_scores(
+        resume_matrix, vocabulary, jd_skills, quality_matrix(additional_analyses),
+        (taxonomy or current_taxonomy()).high_value_skills
     )
-    history = cursor.fetchall()
-    conn.close()
-    return [dict(row) for row in history]
-
-def highlight_text(text: str, keywords: set) -> str:
-    """Wrap matched keywords in HTML highlight tags"""
-    for keyword in keywords:
-        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-        text = pattern.sub(f'<mark class="highlight">{keyword}</mark>', text)
-    return text
+    return round_scores(components['final_score'])
 
-def generate_pdf_report(analysis_data: dict) -> str:
-    """Generate PDF report for the analysis with proper error handling"""
+def score_resume_for_comparison(filename: str, jd_skills: dict, spooled: dict = None, document: dict = None,
+                                taxonomy: TaxonomySnapshot = None) -> dict:
+    """Extract (unless already cached) and score one resume for multi-resume comparison.
+    
+    Runs inside analysis worker processes, so errors are re-raised as plain
+    exceptions that survive pickling. Callers pass the taxonomy snapshot
+    explicitly, since a worker's own registry does not see reloads.
+    """
     try:
-        print("Generating PDF report with data:", analysis_data.keys() if analysis_data else "No data")
-        
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        story = []
-        
-        # Title
-        title = Paragraph("Resume Analysis Report", styles['Heading1'])
-        story.append(title)
-        story.append(Spacer(1, 12))
-        
-        # Basic Information - Use .get() for safe access
-        basic_info = [
-            ["Resume File", analysis_data.get('resume', 'N/A')],
-            ["Job Description File", analysis_data.get('job_description', 'N/A')],
-            ["Overall Match Score", f"{analysis_data.get('match_score', 0)}%"],
-            ["Analysis Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
-        ]
-        
-        basic_table = Table(basic_info, colWidths=[200, 200])
-        basic_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(basic_table)
-        story.append(Spacer(1, 12))
-        
-        # Score Breakdown
-        breakdown_title = Paragraph("Score Breakdown", styles['Heading2'])
-        story.append(breakdown_title)
-        
-        breakdown_data = [["Category", "Score"]]
-        breakdown = analysis_data.get('breakdown', {})
-        
-        # Add breakdown scores
-        for category, score in breakdown.items():
-            if isinstance(score, (int, float)):
-                breakdown_data.append([category.replace('_', ' ').title(), f"{score}%"])
-        
-        # Add additional scores if not in breakdown
-        additional_scores = [
-            ("ATS Score", analysis_data.get('ats_analysis', {}).get('score', 0)),
-            ("Completeness Score", analysis_data.get('completeness_analysis', {}).get('score', 0)),
-            ("Action Verbs Score", analysis_data.get('action_verbs_analysis', {}).get('score', 0)),
-            ("Quantifiable Impact", analysis_data.get('quantifiable_impact_analysis', {}).get('score', 0))
-        ]
-        
-        for category, score in additional_scores:
-            if score > 0:
-                breakdown_data.append([category, f"{score}%"])
-        
-        breakdown_table = Table(breakdown_data, colWidths=[300, 100])
-        breakdown_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(breakdown_table)
-        story.append(Spacer(1, 12))
-        
-        # Skills Analysis
-        skills_title = Paragraph("Skills Analysis", styles['Heading2'])
-        story.append(skills_title)
-        
-        matched_skills = analysis_data.get('matched_keywords', [])
-        missing_skills = analysis_data.get('missing_keywords', [])
-        
-        skills_data = [
-            ["Matched Skills", f"{len(matched_skills)} skills"],
-            ["Missing Skills", f"{len(missing_skills)} skills"],
-            ["Total JD Skills", f"{breakdown.get('total_jd_skills', 0)} skills"],
-            ["Coverage", f"{breakdown.get('coverage_percentage', 0)}%"]
-        ]
-        
-        skills_table = Table(skills_data, colWidths=[200, 200])
-        skills_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgreen),
-            ('BACKGROUND', (0, 1), (-1, 1), colors.lightcoral),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(skills_table)
-        story.append(Spacer(1, 12))
-        
-        # Quality Analysis
-        quality_title = Paragraph("Resume Quality Analysis", styles['Heading2'])
-        story.append(quality_title)
-        
-        quality_data = [
-            ["ATS Score", f"{analysis_data.get('ats_analysis', {}).get('score', 0)}%"],
-            ["Section Completeness", f"{analysis_data.get('completeness_analysis', {}).get('score', 0)}%"],
-            ["Action Verbs Score", f"{analysis_data.get('action_verbs_analysis', {}).get('score', 0)}%"],
-            ["Quantifiable Impact", f"{analysis_data.get('quantifiable_impact_analysis', {}).get('score', 0)}%"]
-        ]
-        
-        quality_table = Table(quality_data, colWidths=[200, 200])
-        quality_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(quality_table)
-        story.append(Spacer(1, 12))
-        
-        # Improvement Suggestions
-        suggestions_title = Paragraph("Improvement Suggestions", styles['Heading2'])
-        story.append(suggestions_title)
-        
-        suggestions = analysis_data.get('improvement_suggestions', [])
-        if suggestions:
-            for i, suggestion in enumerate(suggestions[:6], 1):
-                suggestion_text = Paragraph(f"{i}. {suggestion}", styles['BodyText'])
-                story.append(suggestion_text)
-        else:
-            story.append(Paragraph("No specific suggestions available.", styles['BodyText']))
-        
-        doc.build(story)
-        buffer.seek(0)
-        
-        # Save PDF temporarily
-        filename = f"report_{uuid.uuid4().hex[:8]}.pdf"
-        with open(filename, 'wb') as f:
-            f.write(buffer.getvalue())
-        
-        print(f"PDF report generated successfully: {filename}")
-        return filename
-        
-    except Exception as e:
-        print(f"PDF Generation Error: {str(e)}")
-        raise
-
-@app.get("/")
-async def read_root():
+        if document is None:
+            document = extract_document_from_path(spooled['path'], filename, spooled['size'], taxonomy)
+    except HTTPException as e:
+        raise RuntimeError(e.detail)
+    
+    resume_text = document['text']
+    
+    # Basic analysis for comparison
+    resume_lower = resume_text.lower()
+    ats_analysis = score_ats_rules(resume_lower, len(resume_text.split()))
+    completeness_analysis = score_sections(resume_lower)
+    action_verbs_analysis = score_action_verbs(resume_lower, taxonomy)
+    
+    additional_analysis = {
+        'ats_score': ats_analysis['score'],
+        'completeness_score': completeness_analysis['score'],
+        'action_verbs_score': action_verbs_analysis['score'],
+        'quantifiable_impact_score': 50  # Default for quick comparison
+    }
+    
+    score, matched_keywords, missing_keywords, breakdown = calculate_match_score(
+        document['skills'], jd_skills, additional_analysis, taxonomy
+    )
+    
     return {
-        "message": "AI-Powered Resume & JD Matcher API - Enhanced Version", 
-        "version": "3.0",
-        "status": "No authentication required",
-        "features": [
-            "Match Score Analysis",
-            "Keyword Match/Mismatch",
-            "ATS-Friendliness Check", 
-            "Section Completeness",
-            "Action Verbs Analysis",
-            "Quantifiable Impact Check",
-            "Improvement Suggestions",
-            "PDF Report Export",
-            "Multiple Resume Comparison"
-        ]
+        'document': document,
+        'fingerprint': text_fingerprint(resume_text),
+        'result': ComparisonResult(
+            filename, score, len(matched_keywords), len(missing_keywords),
+            ats_analysis['score'], completeness_analysis['score']
+        )
     }
 
-@app.post("/match/")
-async def match_resume(resume: UploadFile = File(...), jd: UploadFile = File(...)):
-    """Enhanced resume matching with comprehensive analysis"""
+async def compare_spooled_resume(spooled: dict, jd_skills: dict,
+                                 taxonomy: TaxonomySnapshot = None) -> ComparisonResult:
+    """Score one spooled resume upload, offloading extraction and analysis to the process pool"""
+    taxonomy = taxonomy or current_taxonomy()
+    filename = spooled['filename']
+    cache_key = ExtractionCache.key_for_digest(spooled['digest'], os.path.splitext(filename)[1], taxonomy.version)
+    cached = await run_blocking(get_extraction_cache().get, cache_key)
     
-    # Validate file types
-    if not (resume.filename.endswith(('.pdf', '.docx')) and jd.filename.endswith(('.pdf', '.docx'))):
-        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+    # Cached documents are sent to the worker instead of the file to parse
+    scored = await run_in_analysis_pool(
+        score_resume_for_comparison, filename, jd_skills, None if cached is not None else spooled, cached, taxonomy,
+        stage='parse'
+    )
+    
+    if cached is None:
+        await run_blocking(get_extraction_cache().put, cache_key, scored['document']['text'], scored['document']['skills'])
+    
+    # Flag copies of resumes seen before, in this comparison or earlier ones
+    result = scored['result']
+    result.near_duplicates = await run_blocking(duplicate_index.check_and_add, scored['fingerprint'], filename)
+    return result
+
+def screen_archive_member(filename: str, jd_skills: dict, content: bytes = None, document: dict = None,
+                          taxonomy: TaxonomySnapshot = None) -> dict:
+    """Extract (unless already cached) and fully analyze one resume from a bulk archive.
     
+    Runs inside analysis worker processes; see score_resume_for_comparison.
+    """
     try:
-        # Save files temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(resume.filename)[1]) as resume_temp:
-            resume_content = await resume.read()
-            resume_temp.write(resume_content)
-            resume_path = resume_temp.name
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(jd.filename)[1]) as jd_temp:
-            jd_content = await jd.read()
-            jd_temp.write(jd_content)
-            jd_path = jd_temp.name
-        
+        if document is None:
+            document = extract_document(content, filename, taxonomy)
+    except HTTPException as e:
+        raise RuntimeError(e.detail)
+    
+    if not document['text']:
+        raise RuntimeError("Could not extract text from file")
+    
+    return {'document': document, 'analysis': build_match_analysis(document, filename, jd_skills, taxonomy)}
+
+async def screen_archive(archive_path: str, jd_filename: str, jd_skills: dict, session_id: str,
+                         taxonomy: TaxonomySnapshot) -> dict:
+    """Score every resume in an archive against JD keywords, reading one member at a time.
+    
+    At most BULK_SCREEN_CONCURRENCY members are in memory or being scored at
+    once. Identical files are scored once; each scored resume gets its own
+    history row under session_id.
+    """
+    semaphore = asyncio.Semaphore(BULK_SCREEN_CONCURRENCY)
+    first_seen = {}
+    duplicates = []
+    errors = []
+    tasks = []
+    
+    async def screen(name: str, content: bytes, cache_key: str):
         try:
-            # Extract text
-            resume_text = extract_text_from_file(resume_path)
-            jd_text = extract_text_from_file(jd_path)
-            
-            if not resume_text or not jd_text:
-                raise HTTPException(status_code=400, detail="Could not extract text from files")
+            cached = await run_blocking(get_extraction_cache().get, cache_key)
+            screened = await run_in_analysis_pool(
+                screen_archive_member, name, jd_skills, None if cached is not None else content, cached, taxonomy,
+                stage='parse'
+            )
+            if cached is None:
+                await run_blocking(
+                    get_extraction_cache().put, cache_key, screened['document']['text'], screened['document']['skills']
+                )
             
-            # Extract skills and qualifications with weights
-            resume_skills = extract_skills_and_qualifications(resume_text)
-            jd_skills = extract_skills_and_qualifications(jd_text)
+            analysis = screened['analysis']
+            await run_blocking(save_match_analysis, session_id, analysis, jd_filename, jd_skills, taxonomy)
+            return ComparisonResult(
+                name, analysis['match_score'], len(analysis['matched_keywords']), len(analysis['missing_keywords']),
+                analysis['ats_analysis']['score'], analysis['completeness_analysis']['score']
+            )
+        except Exception as e:
+            errors.append({"member": name, "detail": str(e)})
+            return None
+        finally:
+            semaphore.release()
+    
+    members = iter_archive_members(archive_path, MAX_UPLOAD_BYTES, BULK_MAX_MEMBERS)
+    try:
+        while True:
+            # Wait for a free slot before reading the next member into memory
+            await semaphore.acquire()
+            try:
+                member = await run_blocking(next, members, None)
+            except Exception as e:
+                semaphore.release()
+                errors.append({"member": None, "detail": f"Archive is corrupt, stopped reading: {str(e)}"})
+                break
             
-            # Comprehensive analysis
-            ats_analysis = check_ats_friendliness(resume_text, resume_path)
-            completeness_analysis = check_section_completeness(resume_text)
-            action_verbs_analysis = analyze_action_verbs(resume_text)
-            quantifiable_impact_analysis = check_quantifiable_impact(resume_text)
-            experience_years = extract_experience(resume_text)
+            if member is None:
+                semaphore.release()
+                break
             
-            additional_analysis = {
-                'ats_score': ats_analysis['score'],
-                'completeness_score': completeness_analysis['score'],
-                'action_verbs_score': action_verbs_analysis['score'],
-                'quantifiable_impact_score': quantifiable_impact_analysis['score']
-            }
+            name = member['name']
+            if member['error'] is not None:
+                semaphore.release()
+                errors.append({"member": name, "detail": member['error']})
+                continue
             
-            # Calculate comprehensive match score
-            score, matched_keywords, missing_keywords, breakdown = calculate_match_score(
-                resume_skills, jd_skills, additional_analysis
+            cache_key = await run_blocking(
+                ExtractionCache.make_key, member['content'], os.path.splitext(name)[1], taxonomy.version
             )
+            if cache_key in first_seen:
+                semaphore.release()
+                duplicates.append({"member": name, "duplicate_of": first_seen[cache_key]})
+                continue
             
-            # Generate improvement suggestions
-            analysis_context = {
-                'missing_keywords': missing_keywords,
-                'ats_analysis': ats_analysis,
-                'completeness_analysis': completeness_analysis,
-                'action_verbs_analysis': action_verbs_analysis,
-                'quantifiable_impact_analysis': quantifiable_impact_analysis,
-                'experience_years': experience_years
-            }
-            
-            improvement_suggestions = generate_improvement_suggestions(analysis_context)
-            
-            # Generate session ID
+            first_seen[cache_key] = name
+            tasks.append(asyncio.create_task(screen(name, member['content'], cache_key)))
+        
+        results = [result for result in await asyncio.gather(*tasks) if result is not None]
+    finally:
+        # Request was cancelled or the archive broke mid-read
+        for task in tasks:
+            task.cancel()
+        members.close()
+    
+    return {
+        "results": sorted(results, key=lambda x: x.match_score, reverse=True),
+        "duplicates": duplicates,
+        "errors": errors
+    }
+
+INSERT_ANALYSIS_SQL = """INSERT INTO analysis_history 
+   (session_id, resume_filename, jd_filename, match_score, matched_keywords, missing_keywords,
+    resume_skills, jd_skills, breakdown, ats_score, completeness_score, 
+    action_verbs_score, quantifiable_impact_score, improvement_suggestions) 
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+INSERT_COMPARISON_SQL = """INSERT INTO comparison_history 
+   (session_id, jd_filename, resume_filenames, scores, best_match) 
+   VALUES (?, ?, ?, ?, ?)"""
+
+SELECT_SESSION_HISTORY_SQL = """SELECT id, resume_filename, jd_filename, match_score, created_at, 
+          matched_keywords, missing_keywords, improvement_suggestions
+   FROM analysis_history 
+   WHERE session_id = ? 
+   ORDER BY created_at DESC 
+   LIMIT 20"""
+
+def save_analysis_history(session_id: str, resume_filename: str, jd_filename: str, 
+                         match_score: float, matched_keywords: list, missing_keywords: list,
+                         resume_skills: list, jd_skills: list, breakdown: dict,
+                         ats_score: float, completeness_score: float, 
+                         action_verbs_score: float, quantifiable_impact_score: float,
+                         improvement_suggestions: list):
+    """Queue an analysis row for the background writer (keyword lists stored as packed IDs)"""
+    history_writer.submit(
+        INSERT_ANALYSIS_SQL,
+        (session_id, resume_filename, jd_filename, match_score, 
+         keyword_table.encode(matched_keywords), keyword_table.encode(missing_keywords),
+         keyword_table.encode(resume_skills), keyword_table.encode(jd_skills), json.dumps(breakdown),
+         ats_score, completeness_score, action_verbs_score, quantifiable_impact_score,
+         json.dumps(improvement_suggestions))
+    )
+
+def save_comparison_history(session_id: str, jd_filename: str, results: list, best_match: ComparisonResult):
+    """Queue a comparison row for the background writer"""
+    history_writer.submit(
+        INSERT_COMPARISON_SQL,
+        (session_id, jd_filename, json.dumps([r.filename for r in results]),
+         json.dumps([r.match_score for r in results]), best_match.filename)
+    )
+
+SELECT_ANALYTICS_SYNC_SQL = """SELECT id, CAST(strftime('%s', created_at) AS INTEGER) AS created_at, jd_filename,
+          match_score, ats_score, completeness_score, action_verbs_score, quantifiable_impact_score,
+          matched_keywords, missing_keywords
+   FROM analysis_history
+   WHERE id > ?
+   ORDER BY id
+   LIMIT ?"""
+
+def sync_analytics_store() -> int:
+    """Copy history rows newer than the analytics store's last row into it; returns rows added"""
+    history_writer.flush()
+    added = 0
+    while True:
+        with db_pool.connection() as conn:
+            rows = conn.execute(
+                SELECT_ANALYTICS_SYNC_SQL, (get_analytics_store().last_history_id(), ANALYTICS_SYNC_BATCH)
+            ).fetchall()
+        if not rows:
+            return added
+        
+        # The only place history keyword columns are decoded for analytics, once per row and straight to IDs
+        added += get_analytics_store().append([
+            {
+                'history_id': row['id'],
+                'created_at': row['created_at'] or 0,
+                'jd_filename': row['jd_filename'],
+                **{name: row[name] for name in SCORE_COLUMNS},
+                'matched': keyword_table.decode_ids(row['matched_keywords']),
+                'missing': keyword_table.decode_ids(row['missing_keywords'])
+            }
+            for row in rows
+        ])
+
+def get_analysis_history(session_id: str):
+    # Make sure this session's own queued writes are visible
+    history_writer.flush()
+    with db_pool.connection() as conn:
+        history = conn.execute(SELECT_SESSION_HISTORY_SQL, (session_id,)).fetchall()
+    return [
+        {
+            **dict(row),
+            "matched_keywords": keyword_table.decode(row["matched_keywords"]),
+            "missing_keywords": keyword_table.decode(row["missing_keywords"])
+        }
+        for row in history
+    ]
+
+# Columns /history can return; keyword and JSON ones are only read and decoded when asked for
+HISTORY_SCALAR_FIELDS = (
+    'id', 'session_id', 'resume_filename', 'jd_filename', 'match_score', 'created_at',
+    'ats_score', 'completeness_score', 'action_verbs_score', 'quantifiable_impact_score'
+)
+HISTORY_JSON_FIELDS = (
+    'matched_keywords', 'missing_keywords', 'resume_skills', 'jd_skills', 'breakdown', 'improvement_suggestions'
+)
+HISTORY_KEYWORD_FIELDS = ('matched_keywords', 'missing_keywords', 'resume_skills', 'jd_skills')
+DEFAULT_HISTORY_FIELDS = ('id', 'session_id', 'resume_filename', 'jd_filename', 'match_score', 'created_at')
+MAX_HISTORY_PAGE = 500
+
+def encode_history_cursor(row: dict) -> str:
+    """Opaque cursor pointing just past a row in (created_at, id) order"""
+    return base64.urlsafe_b64encode(json.dumps([row['created_at'], row['id']]).encode('utf-8')).decode('ascii')
+
+def decode_history_cursor(cursor: str) -> tuple:
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return str(created_at), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def history_timestamp(value: str, name: str) -> str:
+    """ISO date or datetime in the format created_at is stored in (UTC)"""
+    try:
+        return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{name} must be an ISO date or datetime")
+
+def query_analysis_history(filters: dict, fields: list, limit: int, cursor: str = None, order: str = 'desc') -> dict:
+    """One page of analysis history using keyset pagination on (created_at, id).
+
+    filters may hold session_id, resume_filename, jd_filename (exact match),
+    min_score/max_score and since/until (created_at bounds, inclusive/exclusive).
+    """
+    conditions = []
+    params = []
+    for column in ('session_id', 'resume_filename', 'jd_filename'):
+        if filters.get(column) is not None:
+            conditions.append(f"{column} = ?")
+            params.append(filters[column])
+    if filters.get('min_score') is not None:
+        conditions.append("match_score >= ?")
+        params.append(filters['min_score'])
+    if filters.get('max_score') is not None:
+        conditions.append("match_score <= ?")
+        params.append(filters['max_score'])
+    if filters.get('since') is not None:
+        conditions.append("created_at >= ?")
+        params.append(filters['since'])
+    if filters.get('until') is not None:
+        conditions.append("created_at < ?")
+        params.append(filters['until'])
+    
+    comparison, direction = ('<', 'DESC') if order == 'desc' else ('>', 'ASC')
+    if cursor is not None:
+        conditions.append(f"(created_at, id) {comparison} (?, ?)")
+        params.extend(decode_history_cursor(cursor))
+    
+    # id and created_at are always read because the cursor is built from them
+    columns = list(dict.fromkeys(['id', 'created_at', *fields]))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    sql = (f"SELECT {', '.join(columns)} FROM analysis_history {where} "
+           f"ORDER BY created_at {direction}, id {direction} LIMIT ?")
+    
+    history_writer.flush()
+    with db_pool.connection() as conn:
+        # One extra row tells us whether another page exists
+        rows = conn.execute(sql, (*params, limit + 1)).fetchall()
+    
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            value = row[field]
+            if field in HISTORY_KEYWORD_FIELDS:
+                value = keyword_table.decode(value)
+            elif field in HISTORY_JSON_FIELDS and value is not None:
+                value = json.loads(value)
+            item[field] = value
+        items.append(item)
+    
+    return {
+        "items": items,
+        "next_cursor": encode_history_cursor(dict(rows[-1])) if has_more else None
+    }
+
+async def ingest_resume(spooled: dict) -> dict:
+    """Analyze a spooled resume upload once and store it in the searchable corpus"""
+    filename = spooled['filename']
+    taxonomy = current_taxonomy()
+    document = await load_spooled_document(spooled, taxonomy)
+    resume_text = document['text']
+    if not resume_text:
+        raise ValueError("Could not extract text from file")
+    
+    quality = await run_in_analysis_pool(analyze_resume_quality, resume_text, taxonomy)
+    scores = {
+        'ats_score': quality['ats_analysis']['score'],
+        'completeness_score': quality['completeness_analysis']['score'],
+        'action_verbs_score': quality['action_verbs_analysis']['score'],
+        'quantifiable_impact_score': quality['quantifiable_impact_analysis']['score']
+    }
+    
+    content_hash = ExtractionCache.key_for_digest(spooled['digest'], os.path.splitext(filename)[1])
+    resume_id, created = await run_blocking(
+        store_corpus_resume, content_hash, filename, document, scores, quality['experience_years']
+    )
+    return {"filename": filename, "resume_id": resume_id, "created": created}
+
+def store_corpus_resume(content_hash: str, filename: str, document: dict, scores: dict,
+                        experience_years: int) -> tuple:
+    """Add an analyzed resume to the corpus and the semantic index. Returns (resume_id, created)"""
+    resume_id, created = resume_corpus.add_resume(content_hash, filename, document['skills'], scores, experience_years)
+    
+    # Re-uploading a resume stored before semantic indexing existed backfills its vector
+    if content_hash not in get_semantic_index():
+        with stage_timer("semantic_index"):
+            get_semantic_index().add(content_hash, semantic_encoder.encode(document['text']))
+    return resume_id, created
+
+def rank_corpus(jd_skills: dict, top_k: int, taxonomy: TaxonomySnapshot = None, jd_vector=None) -> tuple:
+    """Rank stored resumes against JD keywords using the inverted index.
+
+    With jd_vector (a semantic encoder vector), results also carry their semantic_score.
+    """
+    taxonomy = taxonomy or current_taxonomy()
+    candidates = resume_corpus.find_candidates(list(jd_skills.keys()))
+    
+    # Resumes sharing no keyword all get the same penalty, so the best of them
+    # by quality score are the only ones that can still reach the top K
+    candidate_ids = {c['resume_id'] for c in candidates}
+    candidates.extend(resume_corpus.top_by_quality(top_k, exclude=candidate_ids))
+    
+    if not candidates:
+        return [], 0
+    
+    # Score every candidate in one vectorized pass, then build details for the top K only
+    scores = batch_calculate_match_scores(
+        [candidate['matched'] for candidate in candidates], jd_skills,
+        [candidate['scores'] for candidate in candidates], taxonomy=taxonomy
+    )
+    top_indexes = heapq.nlargest(top_k, range(len(candidates)), key=scores.__getitem__)
+    
+    ranked = []
+    for index in top_indexes:
+        candidate = candidates[index]
+        # Only keys matter for scoring, and only the shared ones affect the result
+        score, matched_keywords, missing_keywords, breakdown = calculate_match_score(
+            dict.fromkeys(candidate['matched'], 1.0), jd_skills, candidate['scores'], taxonomy
+        )
+        ranked.append({
+            "resume_id": candidate['resume_id'],
+            "filename": candidate['filename'],
+            "match_score": score,
+            "matched_keywords": matched_keywords,
+            "missing_keywords": missing_keywords,
+            "ats_score": candidate['scores']['ats_score'],
+            "completeness_score": candidate['scores']['completeness_score']
+        })
+        if jd_vector is not None:
+            vector = get_semantic_index().get(candidate['content_hash'])
+            ranked[-1]['semantic_score'] = None if vector is None else similarity_to_score(float(vector @ jd_vector))
+    
+    return ranked, len(candidate_ids)
+
+def rank_corpus_semantic(jd_vector, top_k: int) -> list:
+    """Top stored resumes by semantic similarity alone: one blocked matrix product over the vector index"""
+    with stage_timer("semantic_search"):
+        hits = get_semantic_index().search(jd_vector, top_k)
+    resumes = resume_corpus.find_by_hashes([key for key, _ in hits])
+    return [
+        {
+            "resume_id": resumes[key]['resume_id'],
+            "filename": resumes[key]['filename'],
+            "semantic_score": similarity_to_score(score)
+        }
+        for key, score in hits if key in resumes
+    ]
+
+@lru_cache(maxsize=256)
+def compile_highlight_pattern(keywords: tuple):
+    """One case-insensitive matcher for a set of keywords, longest first"""
+    alternation = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    # Lookahead so a keyword starting inside another match is still found
+    return re.compile(r'\b(?=(' + alternation + r')\b)', re.IGNORECASE)
+
+def find_keyword_spans(text: str, keywords: set) -> list:
+    """Find keyword occurrences in one pass and merge overlapping ones into spans"""
+    if not keywords:
+        return []
+    
+    pattern = compile_highlight_pattern(tuple(sorted(keywords)))
+    spans = []
+    for match in pattern.finditer(text):
+        start = match.start()
+        end = start + len(match.group(1))
+        keyword = match.group(1).lower()
+        
+        # Matches arrive in start order, so only the last span can overlap
+        if spans and start < spans[-1]['end']:
+            last = spans[-1]
+            last['end'] = max(last['end'], end)
+            if keyword not in last['keywords']:
+                last['keywords'].append(keyword)
+        else:
+            spans.append({'start': start, 'end': end, 'keywords': [keyword]})
+    
+    return spans
+
+@timed_stage("highlight")
+def highlight_text(text: str, keywords: set) -> str:
+    """Wrap matched keywords in HTML highlight tags"""
+    parts = []
+    position = 0
+    for span in find_keyword_spans(text, keywords):
+        parts.append(html.escape(text[position:span['start']]))
+        parts.append(f'<mark class="highlight">{html.escape(text[span["start"]:span["end"]])}</mark>')
+        position = span['end']
+    parts.append(html.escape(text[position:]))
+    return ''.join(parts)
+
+@timed_stage("match_analysis")
+def build_match_analysis(resume_doc: dict, resume_filename: str, jd_skills: dict,
+                         taxonomy: TaxonomySnapshot = None) -> dict:
+    """Score a loaded resume against JD keywords with the full quality analysis (no history write)"""
+    resume_text = resume_doc['text']
+    resume_skills = resume_doc['skills']
+    
+    # Comprehensive analysis
+    quality = analyze_resume_quality(resume_text, taxonomy)
+    ats_analysis = quality['ats_analysis']
+    completeness_analysis = quality['completeness_analysis']
+    action_verbs_analysis = quality['action_verbs_analysis']
+    quantifiable_impact_analysis = quality['quantifiable_impact_analysis']
+    experience_years = quality['experience_years']
+    
+    additional_analysis = {
+        'ats_score': ats_analysis['score'],
+        'completeness_score': completeness_analysis['score'],
+        'action_verbs_score': action_verbs_analysis['score'],
+        'quantifiable_impact_score': quantifiable_impact_analysis['score']
+    }
+    
+    # Calculate comprehensive match score
+    score, matched_keywords, missing_keywords, breakdown = calculate_match_score(
+        resume_skills, jd_skills, additional_analysis, taxonomy
+    )
+    
+    # Generate improvement suggestions
+    analysis_context = {
+        'missing_keywords': missing_keywords,
+        'ats_analysis': ats_analysis,
+        'completeness_analysis': completeness_analysis,
+        'action_verbs_analysis': action_verbs_analysis,
+        'quantifiable_impact_analysis': quantifiable_impact_analysis,
+        'experience_years': experience_years
+    }
+    
+    return {
+        "resume": resume_filename,
+        "match_score": score,
+        "matched_keywords": matched_keywords,
+        "missing_keywords": missing_keywords,
+        "resume_skills_found": list(resume_skills.keys()),
+        "breakdown": breakdown,
+        "ats_analysis": ats_analysis,
+        "completeness_analysis": completeness_analysis,
+        "action_verbs_analysis": action_verbs_analysis,
+        "quantifiable_impact_analysis": quantifiable_impact_analysis,
+        "experience_years": experience_years,
+        "improvement_suggestions": generate_improvement_suggestions(analysis_context)
+    }
+
+def save_match_analysis(session_id: str, analysis: dict, jd_filename: str, jd_skills: dict,
+                        taxonomy: TaxonomySnapshot = None):
+    """Queue the history row for a build_match_analysis result, plus its state for JD re-scoring"""
+    save_analysis_history(
+        session_id, analysis['resume'], jd_filename, analysis['match_score'],
+        analysis['matched_keywords'], analysis['missing_keywords'],
+        analysis['resume_skills_found'], list(jd_skills.keys()),
+        analysis['breakdown'], analysis['ats_analysis']['score'], analysis['completeness_analysis']['score'],
+        analysis['action_verbs_analysis']['score'], analysis['quantifiable_impact_analysis']['score'],
+        analysis['improvement_suggestions']
+    )
+    # Same writer queue, so these run after the row above is inserted
+    for sql, params in MatchState.record_statements(
+        session_id, analysis['resume'], jd_filename, jd_skills, analysis['matched_keywords'],
+        (taxonomy or current_taxonomy()).high_value_skills, keyword_table.ids(analysis['resume_skills_found'])
+    ):
+        history_writer.submit(sql, params)
+
+def find_cached_analysis(resume_text: str, jd_text: str, taxonomy: TaxonomySnapshot) -> tuple:
+    """(resume fingerprint, dedup key, stored (session_id, result) or None) for a resume/JD pair"""
+    fingerprint = text_fingerprint(resume_text)
+    dedup_key = DuplicateIndex.analysis_key(fingerprint['text_hash'], normalized_text_hash(jd_text), taxonomy.version)
+    return fingerprint, dedup_key, duplicate_index.cached_analysis(dedup_key)
+
+def remember_analysis(fingerprint: dict, resume_filename: str, dedup_key: str, session_id: str, result: dict):
+    duplicate_index.add(fingerprint, resume_filename)
+    duplicate_index.store_analysis(dedup_key, session_id, result)
+
+async def analyze_match(resume_doc: dict, resume_filename: str, jd_doc: dict, jd_filename: str,
+                        taxonomy: TaxonomySnapshot = None, semantic: bool = None) -> dict:
+    """Run the full resume vs JD analysis on loaded documents and record it in history.
+    
+    A resume whose text was already analyzed against the same JD text gets
+    the stored result and session back instead of a new analysis and row.
+    Scoring runs in the analysis pool and lookups on the blocking-work threads.
+    """
+    if not resume_doc['text'] or not jd_doc['text']:
+        raise HTTPException(status_code=400, detail="Could not extract text from files")
+    
+    taxonomy = taxonomy or current_taxonomy()
+    if semantic is None:
+        semantic = SEMANTIC_SCORING
+    
+    fingerprint, dedup_key, cached = await run_blocking(
+        find_cached_analysis, resume_doc['text'], jd_doc['text'], taxonomy
+    )
+    if cached is not None:
+        session_id, result = cached
+        # The stored result names the files of the upload that produced it
+        result['resume'] = resume_filename
+        result['job_description'] = jd_filename
+        result['duplicate'] = True
+        result['message'] = "Identical resume already analyzed against this job description"
+        if semantic:
+            result['semantic_score'] = await run_blocking(semantic_score, resume_doc['text'], jd_doc['text'])
+        
+        entry = {
+            'resume_text': resume_doc['text'],
+            'jd_text': jd_doc['text'],
+            'resume_skills': resume_doc['skills'],
+            'jd_skills': jd_doc['skills'],
+            'analysis': result
+        }
+        stored = analysis_store.get(session_id)
+        if stored is not None and (
+            stored['resume_text'] != entry['resume_text'] or stored['jd_text'] != entry['jd_text']
+            or stored['analysis'].get('resume') != resume_filename
+            or stored['analysis'].get('job_description') != jd_filename
+        ):
+            # Keep the earlier caller's session intact; this upload gets a session of its own
             session_id = str(uuid.uuid4())
-            
-            # Save to history
-            save_analysis_history(
-                session_id, resume.filename, jd.filename, score,
-                matched_keywords, missing_keywords, 
-                list(resume_skills.keys()), list(jd_skills.keys()), 
-                breakdown, ats_analysis['score'], completeness_analysis['score'],
-                action_verbs_analysis['score'], quantifiable_impact_analysis['score'],
-                improvement_suggestions
-            )
-            
-            return {
-                "resume": resume.filename,
-                "job_description": jd.filename,
-                "match_score": score,
-                "matched_keywords": matched_keywords,
-                "missing_keywords": missing_keywords,
-                "resume_skills_found": list(resume_skills.keys()),
-                "jd_skills_required": list(jd_skills.keys()),
-                "breakdown": breakdown,
-                "ats_analysis": ats_analysis,
-                "completeness_analysis": completeness_analysis,
-                "action_verbs_analysis": action_verbs_analysis,
-                "quantifiable_impact_analysis": quantifiable_impact_analysis,
-                "experience_years": experience_years,
-                "improvement_suggestions": improvement_suggestions,
-                "session_id": session_id,
-                "message": "Comprehensive analysis completed successfully"
+            result['session_id'] = session_id
+        analysis_store.put(session_id, entry)
+        return result
+    
+    jd_skills = jd_doc['skills']
+    analysis = await run_in_analysis_pool(build_match_analysis, resume_doc, resume_filename, jd_skills, taxonomy)
+    
+    # Generate session ID
+    session_id = str(uuid.uuid4())
+    
+    # Save to history (may intern new keywords in the database)
+    await run_blocking(save_match_analysis, session_id, analysis, jd_filename, jd_skills, taxonomy)
+    
+    result = {
+        "resume": resume_filename,
+        "job_description": jd_filename,
+        "match_score": analysis['match_score'],
+        "matched_keywords": analysis['matched_keywords'],
+        "missing_keywords": analysis['missing_keywords'],
+        "resume_skills_found": analysis['resume_skills_found'],
+        "jd_skills_required": list(jd_skills.keys()),
+        "breakdown": analysis['breakdown'],
+        "ats_analysis": analysis['ats_analysis'],
+        "completeness_analysis": analysis['completeness_analysis'],
+        "action_verbs_analysis": analysis['action_verbs_analysis'],
+        "quantifiable_impact_analysis": analysis['quantifiable_impact_analysis'],
+        "experience_years": analysis['experience_years'],
+        "improvement_suggestions": analysis['improvement_suggestions'],
+        "session_id": session_id,
+        "message": "Comprehensive analysis completed successfully"
+    }
+    await run_blocking(remember_analysis, fingerprint, resume_filename, dedup_key, session_id, result)
+    if semantic:
+        result['semantic_score'] = await run_blocking(semantic_score, resume_doc['text'], jd_doc['text'])
+    
+    # Keep the documents so follow-up requests need no re-upload
+    analysis_store.put(session_id, {
+        'resume_text': resume_doc['text'],
+        'jd_text': jd_doc['text'],
+        'resume_skills': resume_doc['skills'],
+        'jd_skills': jd_skills,
+        'analysis': result
+    })
+    return result
+
+def patch_missing_skills_suggestion(suggestions: list, missing_keywords: list) -> list:
+    """Stored suggestions with the missing-skills line rebuilt for new missing keywords"""
+    others = [suggestion for suggestion in suggestions if not suggestion.startswith(MISSING_SKILLS_SUGGESTION)]
+    if missing_keywords:
+        others.insert(0, missing_skills_suggestion(missing_keywords))
+    return others[:6]
+
+def rescore_job_description(jd_filename: str, jd_skills: dict, taxonomy: TaxonomySnapshot = None) -> dict:
+    """Update every stored analysis against jd_filename to an edited version of the JD.
+    
+    Rows are grouped by the JD keyword set they were scored against. For each
+    group only the keywords whose weight or high-value status changed are
+    looked up in the stored resume keywords; the matched-weight sums are
+    adjusted by those and the scores recomputed from the sums and the stored
+    quality scores. Resumes are never re-parsed.
+    """
+    history_writer.flush()
+    key_skills = sorted(jd_skills.keys() & set((taxonomy or current_taxonomy()).high_value_skills))
+    new_key_skills = set(key_skills)
+    jd_total_weight = sum(jd_skills.values())
+    jd_keywords = keyword_table.encode(jd_skills)
+    
+    versions = []
+    results = []
+    updates = []
+    for old_key, (old_skills, old_key_skills) in match_state.keyword_sets(jd_filename).items():
+        diff = diff_keyword_sets(old_skills, old_key_skills, jd_skills, key_skills)
+        changed = sorted(set().union(*diff.values()))
+        if not changed:
+            continue
+        
+        rows, hits = match_state.load(jd_filename, old_key, changed)
+        versions.append({**diff, 'analyses': len(rows), 'analyses_with_changed_keywords': len(hits)})
+        if not rows:
+            continue
+        
+        # Adjust the stored sums by the changed keywords each resume actually has
+        old_key_skills = set(old_key_skills)
+        added = set(diff['added'])
+        matched_weight = np.empty(len(rows))
+        high_value_matches = np.empty(len(rows), dtype=np.int64)
+        matched_lists = []
+        for i, row in enumerate(rows):
+            weight = row['matched_weight']
+            high_value = row['high_value_matches']
+            present = hits.get(row['analysis_id'], ())
+            for keyword in present:
+                weight += jd_skills.get(keyword, 0) - old_skills.get(keyword, 0)
+                high_value += (keyword in new_key_skills) - (keyword in old_key_skills)
+            matched_weight[i] = weight
+            high_value_matches[i] = high_value
+            matched_lists.append(sorted(
+                [keyword for keyword in keyword_table.decode(row['matched_keywords']) if keyword in jd_skills]
+                + [keyword for keyword in present if keyword in added]
+            ))
+        
+        quality = np.array([[row[column] or 0.0 for column in QUALITY_COLUMNS] for row in rows], dtype=np.float64)
+        components = scores_from_sums(
+            matched_weight, high_value_matches, np.array([len(matched) for matched in matched_lists]),
+            quality, jd_total_weight, len(key_skills)
+        )
+        final_scores = round_scores(components['final_score'])
+        
+        for i, row in enumerate(rows):
+            matched = matched_lists[i]
+            missing = sorted(jd_skills.keys() - set(matched))
+            base_score = float(components['base_score'][i])
+            breakdown = {
+                'base_score': round(base_score, 2),
+                'skills_match_score': round(base_score, 2),
+                **{column: round(row[column] or 0.0, 2) for column in QUALITY_COLUMNS},
+                'skills_matched': len(matched),
+                'total_jd_skills': len(jd_skills),
+                'coverage_percentage': round((len(matched) / len(jd_skills)) * 100, 2),
+                'bonus_points': min(int(high_value_matches[i]) * 3, 15),
+                'penalty_points': float(components['penalty'][i]),
+                'high_value_matches': [keyword for keyword in matched if keyword in new_key_skills],
+                'missing_key_skills': [keyword for keyword in key_skills if keyword not in matched]
             }
+            suggestions = patch_missing_skills_suggestion(json.loads(row['improvement_suggestions'] or '[]'), missing)
+            updates.append({
+                'analysis_id': row['analysis_id'],
+                'match_score': final_scores[i],
+                'matched_keywords': keyword_table.encode(matched),
+                'missing_keywords': keyword_table.encode(missing),
+                'jd_skills': jd_keywords,
+                'breakdown': json.dumps(breakdown),
+                'improvement_suggestions': json.dumps(suggestions),
+                'matched_weight': float(matched_weight[i]),
+                'high_value_matches': int(high_value_matches[i])
+            })
+            results.append({
+                'analysis_id': row['analysis_id'],
+                'resume_filename': row['resume_filename'],
+                'previous_score': row['match_score'],
+                'match_score': final_scores[i]
+            })
+    
+    if updates:
+        match_state.save(jd_skills, key_skills, updates)
+    return {
+        'jd_filename': jd_filename,
+        'versions': versions,
+        'rescored': len(results),
+        'results': sorted(results, key=lambda x: x['match_score'], reverse=True)
+    }
+
+async def run_comparison(jd_file: dict, resume_files: list) -> dict:
+    """Score spooled resume uploads against a spooled JD and record the comparison"""
+    # One taxonomy snapshot for the whole comparison, even if it is reloaded meanwhile
+    taxonomy = current_taxonomy()
+    jd_filename = jd_file['filename']
+    
+    # Process JD first
+    jd_skills = (await load_spooled_document(jd_file, taxonomy))['skills']
+    
+    # Score resumes in parallel; gather keeps upload order
+    results = await asyncio.gather(*[
+        compare_spooled_resume(resume_file, jd_skills, taxonomy) for resume_file in resume_files
+    ])
+    
+    # Find best match
+    best_match = max(results, key=lambda x: x.match_score)
+    
+    # Save comparison history
+    session_id = str(uuid.uuid4())
+    save_comparison_history(session_id, jd_filename, results, best_match)
+    
+    return {
+        "job_description": jd_filename,
+        "results": [result.to_dict() for result in sorted(results, key=lambda x: x.match_score, reverse=True)],
+        "best_match": best_match.to_dict(),
+        "total_comparisons": len(results),
+        "session_id": session_id
+    }
+
+@app.get("/")
+async def read_root():
+    return {
+        "message": "AI-Powered Resume & JD Matcher API - Enhanced Version", 
+        "version": "3.0",
+        "status": "No authentication required",
+        "features": [
+            "Match Score Analysis",
+            "Keyword Match/Mismatch",
+            "ATS-Friendliness Check", 
+            "Section Completeness",
+            "Action Verbs Analysis",
+            "Quantifiable Impact Check",
+            "Improvement Suggestions",
+            "PDF Report Export",
+            "Multiple Resume Comparison"
+        ]
+    }
+
+@app.post("/match/")
+async def match_resume(resume: UploadFile = File(...), jd: UploadFile = File(...),
+                       semantic: bool = Query(None)):
+    """Enhanced resume matching with comprehensive analysis"""
+    
+    # Validate file types
+    if not (resume.filename.endswith(('.pdf', '.docx')) and jd.filename.endswith(('.pdf', '.docx'))):
+        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+    
+    # Spool outside the try so an oversized upload surfaces as 413
+    async with spooled_uploads(resume, jd) as (resume_file, jd_file):
+        try:
+            # Extract text and keywords (cached by content hash)
+            taxonomy = current_taxonomy()
+            resume_doc = await load_spooled_document(resume_file, taxonomy)
+            jd_doc = await load_spooled_document(jd_file, taxonomy)
+            return await analyze_match(resume_doc, resume.filename, jd_doc, jd.filename, taxonomy, semantic)
             
-        finally:
-            # Clean up temporary files
-            os.unlink(resume_path)
-            os.unlink(jd_path)
-            
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
 
 @app.post("/compare-multiple/")
 async def compare_multiple_resumes(jd: UploadFile = File(...), resumes: list[UploadFile] = File(...)):
@@ -741,171 +1778,422 @@ async def compare_multiple_resumes(jd: UploadFile = File(...), resumes: list[Upl
     if len(resumes) < 2:
         raise HTTPException(status_code=400, detail="Please upload at least 2 resumes for comparison")
     
-    try:
-        # Process JD first
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(jd.filename)[1]) as jd_temp:
-            jd_content = await jd.read()
-            jd_temp.write(jd_content)
-            jd_path = jd_temp.name
-        
-        jd_text = extract_text_from_file(jd_path)
-        jd_skills = extract_skills_and_qualifications(jd_text)
-        
-        results = []
-        resume_files_data = []
-        
-        # Process each resume
-        for resume in resumes:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(resume.filename)[1]) as resume_temp:
-                resume_content = await resume.read()
-                resume_temp.write(resume_content)
-                resume_path = resume_temp.name
-            
-            resume_text = extract_text_from_file(resume_path)
-            resume_skills = extract_skills_and_qualifications(resume_text)
-            
-            # Basic analysis for comparison
-            ats_analysis = check_ats_friendliness(resume_text, resume_path)
-            completeness_analysis = check_section_completeness(resume_text)
-            action_verbs_analysis = analyze_action_verbs(resume_text)
-            
-            additional_analysis = {
-                'ats_score': ats_analysis['score'],
-                'completeness_score': completeness_analysis['score'],
-                'action_verbs_score': action_verbs_analysis['score'],
-                'quantifiable_impact_score': 50  # Default for quick comparison
-            }
-            
-            score, matched_keywords, missing_keywords, breakdown = calculate_match_score(
-                resume_skills, jd_skills, additional_analysis
-            )
+    # Spool outside the try so an oversized upload surfaces as 413
+    async with spooled_uploads(jd, *resumes) as (jd_file, *resume_files):
+        try:
+            return await run_comparison(jd_file, resume_files)
             
-            results.append({
-                "filename": resume.filename,
-                "match_score": score,
-                "matched_keywords_count": len(matched_keywords),
-                "missing_keywords_count": len(missing_keywords),
-                "ats_score": ats_analysis['score'],
-                "completeness_score": completeness_analysis['score']
-            })
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Comparison failed: {str(e)}")
+
+def encode_stream_event(event: str, data: dict, stream_format: str) -> str:
+    """Encode one streamed event as an NDJSON line or a Server-Sent Event"""
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"type": event, **data}) + "\n"
+
+async def stream_comparison_events(jd_filename: str, jd_skills: dict, resumes: list, stream_format: str,
+                                   taxonomy: TaxonomySnapshot):
+    """Yield each resume's score as soon as it is ready, then a ranked summary"""
+    semaphore = asyncio.Semaphore(COMPARE_STREAM_CONCURRENCY)
+    
+    async def score_upload(index: int, resume: UploadFile):
+        # Uploads are spooled only when a slot frees up, so at most a few are on disk at once
+        async with semaphore:
+            try:
+                async with spooled_uploads(resume) as (resume_file,):
+                    result = await compare_spooled_resume(resume_file, jd_skills, taxonomy)
+                return index, resume.filename, result, None
+            except Exception as e:
+                return index, resume.filename, None, getattr(e, 'detail', None) or str(e)
+    
+    tasks = [asyncio.create_task(score_upload(i, resume)) for i, resume in enumerate(resumes)]
+    ranking = []
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            index, filename, result, error = await next_done
+            if error is not None:
+                yield encode_stream_event("error", {"index": index, "filename": filename, "detail": error}, stream_format)
+                continue
             
-            resume_files_data.append({
-                'path': resume_path,
-                'filename': resume.filename
-            })
+            ranking.append(result)
+            yield encode_stream_event("result", {"index": index, **result.to_dict()}, stream_format)
         
-        # Find best match
-        best_match = max(results, key=lambda x: x['match_score'])
+        ranking.sort(key=lambda x: x.match_score, reverse=True)
+        best_match = ranking[0] if ranking else None
         
-        # Save comparison history
         session_id = str(uuid.uuid4())
-        conn = sqlite3.connect('resume_matcher_enhanced.db', check_same_thread=False)
-        cursor = conn.cursor()
-        cursor.execute(
-            """INSERT INTO comparison_history 
-               (session_id, jd_filename, resume_filenames, scores, best_match) 
-               VALUES (?, ?, ?, ?, ?)""",
-            (session_id, jd.filename, json.dumps([r['filename'] for r in results]),
-             json.dumps([r['match_score'] for r in results]), best_match['filename'])
-        )
-        conn.commit()
-        conn.close()
-        
-        # Cleanup temporary files
-        os.unlink(jd_path)
-        for data in resume_files_data:
-            os.unlink(data['path'])
+        if best_match is not None:
+            save_comparison_history(session_id, jd_filename, ranking, best_match)
         
-        return {
-            "job_description": jd.filename,
-            "results": sorted(results, key=lambda x: x['match_score'], reverse=True),
-            "best_match": best_match,
-            "total_comparisons": len(results),
+        yield encode_stream_event("summary", {
+            "job_description": jd_filename,
+            "results": [result.to_dict() for result in ranking],
+            "best_match": best_match.to_dict() if best_match is not None else None,
+            "total_comparisons": len(ranking),
+            "failed": len(resumes) - len(ranking),
             "session_id": session_id
-        }
+        }, stream_format)
+    finally:
+        # Client went away before we finished
+        for task in tasks:
+            task.cancel()
+
+@app.post("/compare-multiple/stream")
+async def compare_multiple_resumes_stream(jd: UploadFile = File(...), resumes: list[UploadFile] = File(...),
+                                          stream_format: str = Query("ndjson", alias="format")):
+    """Stream per-resume comparison results as NDJSON or Server-Sent Events"""
+    if len(resumes) < 2:
+        raise HTTPException(status_code=400, detail="Please upload at least 2 resumes for comparison")
+    
+    if stream_format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'sse'")
+    
+    taxonomy = current_taxonomy()
+    async with spooled_uploads(jd) as (jd_file,):
+        try:
+            jd_skills = (await load_spooled_document(jd_file, taxonomy))['skills']
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Comparison failed: {str(e)}")
+    
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_comparison_events(jd.filename, jd_skills, resumes, stream_format, taxonomy),
+        media_type=media_type
+    )
+
+@app.post("/bulk/screen/")
+async def bulk_screen_resumes(jd: UploadFile = File(...), archive: UploadFile = File(...)):
+    """Screen every PDF/DOCX resume in a ZIP or tar archive against one job description.
+    
+    Files that fail are listed under "errors" without failing the request, and
+    identical files are scored once and listed under "duplicates".
+    """
+    if not jd.filename.endswith(('.pdf', '.docx')):
+        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+    
+    async with spooled_uploads(jd) as (jd_file,), \
+            spooled_uploads(archive, max_bytes=MAX_ARCHIVE_BYTES) as (archive_file,):
+        taxonomy = current_taxonomy()
+        try:
+            jd_skills = (await load_spooled_document(jd_file, taxonomy))['skills']
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Screening failed: {str(e)}")
         
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Comparison failed: {str(e)}")
+        session_id = str(uuid.uuid4())
+        try:
+            screened = await screen_archive(archive_file['path'], jd.filename, jd_skills, session_id, taxonomy)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    results = screened['results']
+    best_match = results[0] if results else None
+    if best_match is not None:
+        save_comparison_history(session_id, jd.filename, results, best_match)
+    
+    return {
+        "job_description": jd.filename,
+        "archive": archive.filename,
+        "results": [result.to_dict() for result in results],
+        "best_match": best_match.to_dict() if best_match is not None else None,
+        "total_screened": len(results),
+        "duplicates": screened['duplicates'],
+        "errors": screened['errors'],
+        "session_id": session_id
+    }
+
+@app.post("/jd/rescore")
+async def rescore_jd(jd: UploadFile = File(...), jd_filename: str = Query(None)):
+    """Re-score stored /match/ and bulk screening analyses after a job description was edited.
+    
+    The edited JD is matched to earlier analyses by file name (the upload's
+    name unless jd_filename is given). Only the resume keywords that differ
+    between the versions are consulted.
+    """
+    if not jd.filename.endswith(('.pdf', '.docx')):
+        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+    
+    async with spooled_uploads(jd) as (jd_file,):
+        taxonomy = current_taxonomy()
+        try:
+            jd_skills = (await load_spooled_document(jd_file, taxonomy))['skills']
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Re-scoring failed: {str(e)}")
+    if not jd_skills:
+        raise HTTPException(status_code=400, detail="No skills found in job description")
+    
+    return await run_blocking(rescore_job_description, jd_filename or jd.filename, jd_skills, taxonomy)
+
+@timed_stage("render_report")
+def generate_pdf_report(analysis_data: dict) -> bytes:
+    """Render the analysis report to PDF bytes (no file is written)"""
+    # reportlab is only loaded by processes that actually render reports
+    from report_renderer import render_report
+    
+    return render_report(analysis_data)
 
 @app.post("/generate-report/")
 async def generate_report(analysis_data: dict):
     """Generate PDF report from analysis data"""
+    # Validate analysis data
+    if not analysis_data:
+        raise HTTPException(status_code=400, detail="No analysis data provided")
+    
     try:
-        print("Received analysis data for report generation")  # Debug log
-        
-        # Validate analysis data
-        if not analysis_data:
-            raise HTTPException(status_code=400, detail="No analysis data provided")
-        
-        print(f"Analysis data keys: {analysis_data.keys()}")
-        print(f"Match score: {analysis_data.get('match_score', 'Not found')}")
-        
-        # Generate PDF report
-        pdf_filename = generate_pdf_report(analysis_data)
-        
-        # Return file response
-        response = FileResponse(
-            pdf_filename, 
-            media_type='application/pdf',
-            filename=f"resume_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        # Render in the analysis pool so the event loop keeps serving other requests
+        pdf = await run_in_analysis_pool(generate_pdf_report, analysis_data, stage='render')
+    except Exception as e:
+        metrics.REPORT_FAILURES.inc(endpoint='generate-report')
+        raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
+    
+    filename = f"resume_analysis_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    return Response(
+        content=pdf,
+        media_type='application/pdf',
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.post("/generate-reports/")
+async def generate_reports(reports: list[dict]):
+    """Render a PDF report for each analysis and return them together as a ZIP"""
+    if not reports or not all(reports):
+        raise HTTPException(status_code=400, detail="No analysis data provided")
+    if len(reports) > MAX_BATCH_REPORTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_REPORTS} reports per request")
+    
+    from report_renderer import report_filename, bundle_reports
+    
+    try:
+        # Reports render in parallel across the pool workers
+        pdfs = await asyncio.gather(*[
+            run_in_analysis_pool(generate_pdf_report, data, stage='render') for data in reports
+        ])
+        archive = await run_blocking(
+            bundle_reports, [(report_filename(data, i), pdf) for i, (data, pdf) in enumerate(zip(reports, pdfs))]
         )
-        
-        print("PDF response prepared successfully")
-        return response
-        
     except Exception as e:
-        print(f"Report generation error: {str(e)}")  # Debug log
+        metrics.REPORT_FAILURES.inc(endpoint='generate-reports')
         raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
+    
+    filename = f"resume_analysis_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return Response(
+        content=archive,
+        media_type='application/zip',
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+def build_highlight_response(resume_text: str, jd_text: str, resume_skills: dict, jd_skills: dict,
+                             output: str) -> dict:
+    """Highlighted documents (output=html) or plain text with match offsets (output=spans)"""
+    # Find matches
+    matched_keywords = resume_skills.keys() & jd_skills.keys()
+    
+    if output == "spans":
+        return {
+            "resume_text": resume_text,
+            "jd_text": jd_text,
+            "resume_spans": find_keyword_spans(resume_text, matched_keywords),
+            "jd_spans": find_keyword_spans(jd_text, matched_keywords),
+            "matched_keywords": list(matched_keywords)
+        }
+    
+    # Highlight keywords in text
+    highlighted_resume = highlight_text(resume_text, matched_keywords)
+    highlighted_jd = highlight_text(jd_text, matched_keywords)
+    
+    return {
+        "highlighted_resume": highlighted_resume,
+        "highlighted_jd": highlighted_jd,
+        "matched_keywords": list(matched_keywords)
+    }
 
 @app.post("/highlight-keywords/")
-async def highlight_keywords(resume: UploadFile = File(...), jd: UploadFile = File(...)):
-    """Extract and highlight matching keywords in both documents"""
+async def highlight_keywords(resume: UploadFile = File(...), jd: UploadFile = File(...),
+                             output: str = Query("html", pattern="^(html|spans)$")):
+    """Extract and highlight matching keywords in both documents.
     
-    try:
-        # Save files temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(resume.filename)[1]) as resume_temp:
-            resume_content = await resume.read()
-            resume_temp.write(resume_content)
-            resume_path = resume_temp.name
-        
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(jd.filename)[1]) as jd_temp:
-            jd_content = await jd.read()
-            jd_temp.write(jd_content)
-            jd_path = jd_temp.name
-        
+    output=html returns marked-up text; output=spans returns the plain text with
+    [start, end) offsets of each highlighted span instead.
+    """
+    
+    async with spooled_uploads(resume, jd) as (resume_file, jd_file):
         try:
-            # Extract text
-            resume_text = extract_text_from_file(resume_path)
-            jd_text = extract_text_from_file(jd_path)
-            
-            # Extract keywords
-            resume_skills = extract_skills_and_qualifications(resume_text)
-            jd_skills = extract_skills_and_qualifications(jd_text)
-            
-            # Find matches
-            matched_keywords = set(resume_skills.keys()).intersection(set(jd_skills.keys()))
-            
-            # Highlight keywords in text
-            highlighted_resume = highlight_text(resume_text, matched_keywords)
-            highlighted_jd = highlight_text(jd_text, matched_keywords)
-            
-            return {
-                "highlighted_resume": highlighted_resume,
-                "highlighted_jd": highlighted_jd,
-                "matched_keywords": list(matched_keywords)
-            }
+            # Extract text and keywords (cached by content hash)
+            taxonomy = current_taxonomy()
+            resume_doc = await load_spooled_document(resume_file, taxonomy)
+            jd_doc = await load_spooled_document(jd_file, taxonomy)
             
-        finally:
-            # Clean up temporary files
-            os.unlink(resume_path)
-            os.unlink(jd_path)
+            return await run_blocking(
+                build_highlight_response,
+                resume_doc['text'], jd_doc['text'], resume_doc['skills'], jd_doc['skills'], output
+            )
             
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+
+def get_stored_analysis(session_id: str) -> dict:
+    stored = analysis_store.get(session_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired; run /match/ again")
+    return stored
+
+@app.get("/sessions/{session_id}")
+async def get_session_analysis(session_id: str):
+    """Return the /match/ result stored for a session"""
+    return get_stored_analysis(session_id)['analysis']
+
+@app.get("/sessions/{session_id}/highlight-keywords")
+async def highlight_session_keywords(session_id: str, output: str = Query("html", pattern="^(html|spans)$")):
+    """Same as /highlight-keywords/, using the documents from an earlier /match/ call"""
+    stored = get_stored_analysis(session_id)
+    return await run_blocking(
+        build_highlight_response,
+        stored['resume_text'], stored['jd_text'], stored['resume_skills'], stored['jd_skills'], output
+    )
+
+@app.get("/sessions/{session_id}/report")
+async def generate_session_report(session_id: str):
+    """Same as /generate-report/, using the analysis stored for an earlier /match/ call"""
+    return await generate_report(get_stored_analysis(session_id)['analysis'])
+
+@app.post("/corpus/resumes/")
+async def add_corpus_resumes(resumes: list[UploadFile] = File(...)):
+    """Analyze resumes once and add them to the searchable corpus"""
+    ingested = []
+    errors = []
+    
+    for resume in resumes:
+        if not resume.filename.endswith(('.pdf', '.docx')):
+            errors.append({"filename": resume.filename, "detail": "Only PDF and DOCX files are supported"})
+            continue
+        try:
+            async with spooled_uploads(resume) as (resume_file,):
+                ingested.append(await ingest_resume(resume_file))
+        except Exception as e:
+            errors.append({"filename": resume.filename, "detail": getattr(e, 'detail', None) or str(e)})
+    
+    return {
+        "ingested": ingested,
+        "errors": errors,
+        "corpus_size": await run_blocking(resume_corpus.count)
+    }
+
+@app.post("/corpus/match/")
+async def match_corpus(jd: UploadFile = File(...), top_k: int = Query(10, ge=1, le=1000),
+                       semantic: bool = Query(None)):
+    """Find the best stored resumes for a job description without re-parsing them"""
+    try:
+        taxonomy = current_taxonomy()
+        async with spooled_uploads(jd) as (jd_file,):
+            jd_doc = await load_spooled_document(jd_file, taxonomy)
+        jd_skills = jd_doc['skills']
+        if not jd_skills:
+            raise HTTPException(status_code=400, detail="No skills found in job description")
+        
+        if semantic is None:
+            semantic = SEMANTIC_SCORING
+        jd_vector = await run_blocking(semantic_encoder.encode_cached, jd_doc['text']) if semantic else None
+        results, candidates_considered = await run_blocking(rank_corpus, jd_skills, top_k, taxonomy, jd_vector)
+        
+        response = {
+            "job_description": jd.filename,
+            "jd_skills_required": list(jd_skills.keys()),
+            "results": results,
+            "candidates_considered": candidates_considered,
+            "corpus_size": await run_blocking(resume_corpus.count)
+        }
+        if semantic:
+            # Also surface resumes that are close in meaning but share few exact keywords
+            response["semantic_results"] = await run_blocking(rank_corpus_semantic, jd_vector, top_k)
+        return response
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Corpus search failed: {str(e)}")
+
+async def run_match_job(files: list, params: dict) -> dict:
+    uploads = {spooled['field']: spooled for spooled in files}
+    resume_file, jd_file = uploads['resume'], uploads['jd']
+    
+    taxonomy = current_taxonomy()
+    resume_doc = await load_spooled_document(resume_file, taxonomy)
+    jd_doc = await load_spooled_document(jd_file, taxonomy)
+    return await analyze_match(resume_doc, resume_file['filename'], jd_doc, jd_file['filename'], taxonomy)
+
+async def run_comparison_job(files: list, params: dict) -> dict:
+    jd_file = next(spooled for spooled in files if spooled['field'] == 'jd')
+    return await run_comparison(jd_file, [spooled for spooled in files if spooled['field'] == 'resumes'])
+
+job_queue.register('match', run_match_job)
+job_queue.register('compare-multiple', run_comparison_job)
+
+def queue_full_error(e: QueueFull) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+def ensure_job_capacity():
+    """Refuse a job while the queue is full, before any of its uploads are read"""
+    try:
+        job_queue.check_capacity()
+    except QueueFull as e:
+        raise queue_full_error(e)
+
+async def submit_job(kind: str, files: list) -> JSONResponse:
+    try:
+        # Checked again here: other submits may have filled the queue while this one spooled its uploads
+        job_id = await job_queue.submit(kind, files)
+    except QueueFull as e:
+        raise queue_full_error(e)
+    return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+
+@app.post("/jobs/match/")
+async def submit_match_job(resume: UploadFile = File(...), jd: UploadFile = File(...)):
+    """Queue a /match/ analysis and return a job ID immediately"""
+    if not (resume.filename.endswith(('.pdf', '.docx')) and jd.filename.endswith(('.pdf', '.docx'))):
+        raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
+    
+    ensure_job_capacity()
+    # The queue moves the spooled files into the job's directory
+    async with spooled_uploads(resume, jd) as (resume_file, jd_file):
+        return await submit_job('match', [('resume', resume_file), ('jd', jd_file)])
+
+@app.post("/jobs/compare-multiple/")
+async def submit_comparison_job(jd: UploadFile = File(...), resumes: list[UploadFile] = File(...)):
+    """Queue a /compare-multiple/ run and return a job ID immediately"""
+    if len(resumes) < 2:
+        raise HTTPException(status_code=400, detail="Please upload at least 2 resumes for comparison")
+    
+    ensure_job_capacity()
+    async with spooled_uploads(jd, *resumes) as (jd_file, *resume_files):
+        return await submit_job(
+            'compare-multiple', [('jd', jd_file)] + [('resumes', resume_file) for resume_file in resume_files]
+        )
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    job.pop('result')
+    return job
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = await asyncio.to_thread(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job['status'] == FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job['error']}")
+    if job['status'] != COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    
+    return job['result']
 
 @app.get("/history/{session_id}")
 async def get_history(session_id: str):
-    history = get_analysis_history(session_id)
+    history = await asyncio.to_thread(get_analysis_history, session_id)
     return {
         "history": [
             {
@@ -914,17 +2202,180 @@ async def get_history(session_id: str):
                 "jd_filename": item["jd_filename"],
                 "match_score": item["match_score"],
                 "created_at": item["created_at"],
-                "matched_keywords": json.loads(item["matched_keywords"]),
-                "missing_keywords": json.loads(item["missing_keywords"]),
+                "matched_keywords": item["matched_keywords"],
+                "missing_keywords": item["missing_keywords"],
                 "improvement_suggestions": json.loads(item["improvement_suggestions"])
             }
             for item in history
         ]
     }
 
+@app.get("/history")
+async def list_history(session_id: str = Query(None), resume_filename: str = Query(None),
+                       jd_filename: str = Query(None), min_score: float = Query(None, ge=0, le=100),
+                       max_score: float = Query(None, ge=0, le=100), since: str = Query(None),
+                       until: str = Query(None), fields: str = Query(None),
+                       limit: int = Query(50, ge=1, le=MAX_HISTORY_PAGE), cursor: str = Query(None),
+                       order: str = Query("desc", pattern="^(asc|desc)$")):
+    """Page through analysis history across sessions.
+    
+    Pass next_cursor from the previous page as cursor to continue. fields is a
+    comma-separated projection; by default only the light columns are returned.
+    """
+    selected = [field.strip() for field in fields.split(',') if field.strip()] if fields else list(DEFAULT_HISTORY_FIELDS)
+    unknown = [field for field in selected if field not in HISTORY_SCALAR_FIELDS + HISTORY_JSON_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    
+    filters = {
+        'session_id': session_id,
+        'resume_filename': resume_filename,
+        'jd_filename': jd_filename,
+        'min_score': min_score,
+        'max_score': max_score,
+        'since': history_timestamp(since, 'since') if since else None,
+        'until': history_timestamp(until, 'until') if until else None
+    }
+    page = await asyncio.to_thread(query_analysis_history, filters, selected, limit, cursor, order)
+    return {**page, "limit": limit, "fields": selected}
+
+def analytics_since(days: int):
+    """Unix time `days` days ago, or None for all time"""
+    return time.time() - days * 86400 if days else None
+
+def query_missing_skills(jd_filename: str, since: float, limit: int) -> dict:
+    """Bring the analytics store up to date with history, then count missing skills"""
+    sync_analytics_store()
+    with stage_timer("analytics_query"):
+        return get_analytics_store().missing_skills(jd_filename, since, limit)
+
+def query_score_distribution(column: str, since: float, jd_filename: str, bins: int) -> dict:
+    """Bring the analytics store up to date with history, then bin one score column"""
+    sync_analytics_store()
+    with stage_timer("analytics_query"):
+        return get_analytics_store().score_distribution(column, since, jd_filename, bins)
+
+@app.get("/analytics/missing-skills")
+async def analytics_missing_skills(jd_filename: str = Query(None), days: int = Query(None, ge=1),
+                                   limit: int = Query(20, ge=1, le=500)):
+    """Skills most often missing from analyzed resumes, optionally for one JD file and recent days only"""
+    result = await run_blocking(query_missing_skills, jd_filename, analytics_since(days), limit)
+    return {"jd_filename": jd_filename, "days": days, **result}
+
+@app.get("/analytics/score-distribution")
+async def analytics_score_distribution(days: int = Query(30, ge=1), jd_filename: str = Query(None),
+                                       column: str = Query("match_score"), bins: int = Query(10, ge=1, le=100)):
+    """Histogram and summary statistics of a score over the last `days` days"""
+    if column not in SCORE_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"column must be one of: {', '.join(SCORE_COLUMNS)}")
+    
+    result = await run_blocking(query_score_distribution, column, analytics_since(days), jd_filename, bins)
+    return {"jd_filename": jd_filename, "days": days, **result}
+
+async def watch_taxonomy_file():
+    """Reload the taxonomy whenever TAXONOMY_FILE changes on disk"""
+    while True:
+        await asyncio.sleep(TAXONOMY_RELOAD_INTERVAL)
+        try:
+            if await asyncio.to_thread(taxonomy_registry.reload_if_changed):
+                print(f"Taxonomy reloaded: version {current_taxonomy().version}")
+        except Exception as e:
+            print(f"Taxonomy reload failed, keeping version {current_taxonomy().version}: {str(e)}")
+
+@app.get("/taxonomy")
+async def get_taxonomy():
+    """Version and size of the taxonomy currently used for matching"""
+    return current_taxonomy().describe()
+
+@app.post("/taxonomy/reload")
+async def reload_taxonomy():
+    """Rebuild the taxonomy from its file or the database and swap it in"""
+    previous = current_taxonomy()
+    try:
+        # Compiling a large taxonomy takes a while; requests keep using the old snapshot meanwhile
+        snapshot = await asyncio.to_thread(taxonomy_registry.reload)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Taxonomy reload failed: {str(e)}")
+    
+    return {**snapshot.describe(), "previous_version": previous.version, "changed": snapshot is not previous}
+
+# Compile matchers and run a tiny analysis before serving traffic; WARMUP_PRELOAD
+# also imports the parser/report libraries and starts the analysis pool workers
+WARMUP_ON_STARTUP = os.getenv('WARMUP_ON_STARTUP', '1').lower() in ('1', 'true', 'yes')
+WARMUP_PRELOAD = os.getenv('WARMUP_PRELOAD', '0').lower() in ('1', 'true', 'yes')
+
+WARMUP_TEXT = """Summary
+Experience: 5 years developing Python and React services on AWS; increased throughput by 30%.
+Education: Bachelor of Science
+Skills: Docker, Kubernetes, SQL
+Contact: name@example.com"""
+
+def warm_process(preload: bool = False) -> str:
+    """Build the taxonomy snapshot and exercise the analysis regexes in this process"""
+    taxonomy = current_taxonomy()
+    extract_skills_and_qualifications(WARMUP_TEXT, taxonomy)
+    analyze_resume_quality(WARMUP_TEXT, taxonomy)
+    semantic_encoder.encode(WARMUP_TEXT)
+    if preload:
+        import PyPDF2, docx, report_renderer  # noqa: F401
+    return taxonomy.version
+
+async def warmup(preload: bool = False) -> dict:
+    """Pay one-off startup costs up front instead of on the first requests"""
+    start = time.perf_counter()
+    taxonomy_version = await asyncio.to_thread(warm_process, preload)
+    
+    workers = 0
+    if preload and get_analysis_pool() is not None:
+        # Workers fork from this already warmed process; one task each makes them start now
+        await asyncio.gather(*[run_in_analysis_pool(warm_process, True) for _ in range(ANALYSIS_WORKERS)])
+        workers = ANALYSIS_WORKERS
+    
+    return {
+        "taxonomy_version": taxonomy_version,
+        "preloaded": preload,
+        "pool_workers_started": workers,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+def collect_runtime_metrics() -> list:
+    cache_stats = get_extraction_cache().stats()
+    writer_stats = history_writer.stats()
+    store_stats = analysis_store.stats()
+    return [
+        ('resume_matcher_extraction_cache_hits_total', 'counter', 'Extraction cache hits (memory and disk)', cache_stats['hits']),
+        ('resume_matcher_extraction_cache_misses_total', 'counter', 'Extraction cache misses', cache_stats['misses']),
+        ('resume_matcher_extraction_cache_evictions_total', 'counter', 'Extraction cache memory evictions', cache_stats['evictions']),
+        ('resume_matcher_history_rows_written_total', 'counter', 'History rows committed by the background writer', writer_stats['rows_written']),
+        ('resume_matcher_history_write_errors_total', 'counter', 'History rows dropped after write errors', writer_stats['errors']),
+        ('resume_matcher_history_pending_writes', 'gauge', 'History rows waiting for the background writer', writer_stats['pending']),
+        ('resume_matcher_pending_jobs', 'gauge', 'Background jobs waiting for a worker', job_queue.pending()),
+        ('resume_matcher_analysis_store_items', 'gauge', 'Session analyses held in memory', store_stats['items']),
+        ('resume_matcher_analysis_store_bytes', 'gauge', 'Approximate memory used by stored session analyses', store_stats['bytes'])
+    ]
+
+metrics.REGISTRY.add_collector(collect_runtime_metrics)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text-format metrics"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "resume-matcher-enhanced", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "service": "resume-matcher-enhanced",
+        "timestamp": datetime.now().isoformat(),
+        "extraction_cache": get_extraction_cache().stats(),
+        "history_writer": history_writer.stats(),
+        "pending_jobs": job_queue.pending(),
+        "analysis_store": analysis_store.stats(),
+        "taxonomy_version": current_taxonomy().version,
+        "semantic_index": get_semantic_index().stats(),
+        "analytics_store": get_analytics_store().stats(),
+        "duplicate_index": duplicate_index.stats()
+    }
 
 if __name__ == "__main__":
     import uvicorn
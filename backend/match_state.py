@@ -0,0 +1,176 @@
+import hashlib
+import json
+import sqlite3
+
+from database import ConnectionPool
+from keyword_table import KeywordTable
+
+# The analysis row the state belongs to is written by the same FIFO writer just
+# before these statements, so it is the newest row for its session and resume
+LATEST_ANALYSIS_SQL = """SELECT id FROM analysis_history
+   WHERE session_id = ? AND resume_filename = ?
+   ORDER BY id DESC LIMIT 1"""
+
+INSERT_JD_KEYWORD_SET_SQL = "INSERT OR IGNORE INTO jd_keyword_sets (jd_key, skills, key_skills) VALUES (?, ?, ?)"
+
+INSERT_MATCH_STATE_SQL = f"""INSERT OR REPLACE INTO analysis_match_state
+   (analysis_id, jd_filename, jd_key, matched_weight, high_value_matches)
+   SELECT id, ?, ?, ?, ? FROM ({LATEST_ANALYSIS_SQL})"""
+
+INSERT_RESUME_KEYWORDS_SQL = f"""INSERT OR IGNORE INTO analysis_keyword_ids (keyword_id, analysis_id)
+   SELECT json_each.value, h.id FROM ({LATEST_ANALYSIS_SQL}) h, json_each(?)"""
+
+SELECT_MATCH_STATE_SQL = """SELECT s.analysis_id, s.matched_weight, s.high_value_matches,
+          h.resume_filename, h.match_score, h.matched_keywords, h.improvement_suggestions,
+          h.ats_score, h.completeness_score, h.action_verbs_score, h.quantifiable_impact_score
+   FROM analysis_match_state s JOIN analysis_history h ON h.id = s.analysis_id
+   WHERE s.jd_filename = ? AND s.jd_key = ?
+   ORDER BY s.analysis_id"""
+
+
+def jd_keyword_key(jd_skills: dict, key_skills) -> str:
+    """Content hash of a JD keyword set, its weights and which keywords count as high-value"""
+    spec = {'skills': jd_skills, 'key_skills': sorted(key_skills)}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def diff_keyword_sets(old_skills: dict, old_key_skills, new_skills: dict, new_key_skills) -> dict:
+    """Keywords added, removed, reweighted or moved in or out of the high-value set between two JD versions"""
+    old_key_skills = set(old_key_skills)
+    new_key_skills = set(new_key_skills)
+    shared = old_skills.keys() & new_skills.keys()
+    return {
+        'added': sorted(new_skills.keys() - old_skills.keys()),
+        'removed': sorted(old_skills.keys() - new_skills.keys()),
+        'reweighted': sorted(keyword for keyword in shared if old_skills[keyword] != new_skills[keyword]),
+        'key_changed': sorted(
+            keyword for keyword in shared if (keyword in old_key_skills) != (keyword in new_key_skills)
+        )
+    }
+
+
+class MatchState:
+    """Per-analysis running totals that let stored match scores follow JD edits.
+
+    For every analysis_history row it keeps the JD keyword set it was scored
+    against, the summed JD weight and count of high-value keywords the resume
+    matched, and the resume's keywords in a keyword -> analysis index. A JD
+    edit then only needs the rows whose resume contains a changed keyword to
+    adjust their totals; nothing is re-extracted.
+    """
+
+    def __init__(self, pool: ConnectionPool, keyword_table: KeywordTable):
+        self.pool = pool
+        self.keyword_table = keyword_table
+
+    @staticmethod
+    def create_schema(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jd_keyword_sets (
+                jd_key TEXT PRIMARY KEY,
+                skills TEXT NOT NULL,
+                key_skills TEXT NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_match_state (
+                analysis_id INTEGER PRIMARY KEY,
+                jd_filename TEXT NOT NULL,
+                jd_key TEXT NOT NULL,
+                matched_weight REAL NOT NULL,
+                high_value_matches INTEGER NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_keyword_ids (
+                keyword_id INTEGER NOT NULL,
+                analysis_id INTEGER NOT NULL,
+                PRIMARY KEY (keyword_id, analysis_id)
+            ) WITHOUT ROWID
+        ''')
+        # Move the earlier keyword-text index over to IDs (needs the keyword_ids table)
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'analysis_resume_keywords'"
+        ).fetchone():
+            conn.execute(
+                'INSERT OR IGNORE INTO keyword_ids (keyword) SELECT DISTINCT keyword FROM analysis_resume_keywords'
+            )
+            conn.execute('''
+                INSERT OR IGNORE INTO analysis_keyword_ids (keyword_id, analysis_id)
+                SELECT i.id, r.analysis_id FROM analysis_resume_keywords r JOIN keyword_ids i ON i.keyword = r.keyword
+            ''')
+            conn.execute('DROP TABLE analysis_resume_keywords')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_analysis_match_state_jd
+            ON analysis_match_state(jd_filename, jd_key)
+        ''')
+        conn.commit()
+
+    @staticmethod
+    def record_statements(session_id: str, resume_filename: str, jd_filename: str, jd_skills: dict,
+                          matched_keywords: list, high_value_skills, resume_keyword_ids: list) -> list:
+        """(sql, params) writes that attach state to the analysis row queued just before them"""
+        key_skills = sorted(jd_skills.keys() & set(high_value_skills))
+        jd_key = jd_keyword_key(jd_skills, key_skills)
+        matched_weight = sum(jd_skills[keyword] for keyword in matched_keywords)
+        high_value_matches = len(set(matched_keywords).intersection(key_skills))
+        return [
+            (INSERT_JD_KEYWORD_SET_SQL, (jd_key, json.dumps(jd_skills), json.dumps(key_skills))),
+            (INSERT_MATCH_STATE_SQL,
+             (jd_filename, jd_key, matched_weight, high_value_matches, session_id, resume_filename)),
+            (INSERT_RESUME_KEYWORDS_SQL, (session_id, resume_filename, json.dumps(resume_keyword_ids)))
+        ]
+
+    def keyword_sets(self, jd_filename: str) -> dict:
+        """jd_key -> (keyword weights, high-value keywords) for every version of a JD with stored analyses"""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                '''SELECT k.jd_key, k.skills, k.key_skills FROM jd_keyword_sets k
+                   WHERE k.jd_key IN (SELECT DISTINCT jd_key FROM analysis_match_state WHERE jd_filename = ?)''',
+                (jd_filename,)
+            ).fetchall()
+        return {row['jd_key']: (json.loads(row['skills']), json.loads(row['key_skills'])) for row in rows}
+
+    def load(self, jd_filename: str, jd_key: str, keywords: list) -> tuple:
+        """Stored rows scored against one JD version, and analysis_id -> which of keywords its resume has"""
+        with self.pool.connection() as conn:
+            rows = conn.execute(SELECT_MATCH_STATE_SQL, (jd_filename, jd_key)).fetchall()
+            hits = {}
+            if keywords and rows:
+                keyword_ids = self.keyword_table.ids(keywords)
+                placeholders = ','.join('?' * len(keyword_ids))
+                for row in conn.execute(
+                    f'''SELECT k.keyword_id, k.analysis_id FROM analysis_keyword_ids k
+                        JOIN analysis_match_state s ON s.analysis_id = k.analysis_id
+                        WHERE k.keyword_id IN ({placeholders}) AND s.jd_filename = ? AND s.jd_key = ?''',
+                    (*keyword_ids, jd_filename, jd_key)
+                ):
+                    hits.setdefault(row['analysis_id'], set()).add(row['keyword_id'])
+        return rows, {
+            analysis_id: set(self.keyword_table.keywords(ids)) for analysis_id, ids in hits.items()
+        }
+
+    def save(self, jd_skills: dict, key_skills: list, updates: list) -> str:
+        """Write re-scored rows and move them to the new JD version's key, which is returned.
+
+        Each update holds analysis_id, the history columns to overwrite (keyword
+        and JSON columns already encoded) and the new matched_weight/high_value_matches.
+        """
+        jd_key = jd_keyword_key(jd_skills, key_skills)
+        with self.pool.connection() as conn:
+            with conn:
+                conn.execute(INSERT_JD_KEYWORD_SET_SQL, (jd_key, json.dumps(jd_skills), json.dumps(sorted(key_skills))))
+                conn.executemany(
+                    '''UPDATE analysis_history SET match_score = :match_score, matched_keywords = :matched_keywords,
+                           missing_keywords = :missing_keywords, jd_skills = :jd_skills, breakdown = :breakdown,
+                           improvement_suggestions = :improvement_suggestions
+                       WHERE id = :analysis_id''',
+                    updates
+                )
+                conn.executemany(
+                    '''UPDATE analysis_match_state SET jd_key = :jd_key, matched_weight = :matched_weight,
+                           high_value_matches = :high_value_matches
+                       WHERE analysis_id = :analysis_id''',
+                    [{**update, 'jd_key': jd_key} for update in updates]
+                )
+        return jd_key
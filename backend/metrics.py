@@ -0,0 +1,203 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds; covers sub-millisecond regex checks up to very slow PDFs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Set on a thread while capture() is active; updates go to this list instead of the metric
+_capture = threading.local()
+
+
+def _captured(name: str, value: float, labels: dict) -> bool:
+    updates = getattr(_capture, 'updates', None)
+    if updates is None:
+        return False
+    updates.append((name, value, labels))
+    return True
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if _captured(self.name, amount, labels):
+            return
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if _captured(self.name, value, labels):
+            return
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['buckets'][i] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self) -> list:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series['buckets']):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f'{self.name}_bucket{labels} {series["count"]}')
+                lines.append(f'{self.name}_sum{_format_labels(self.labelnames, key)} {series["sum"]}')
+                lines.append(f'{self.name}_count{_format_labels(self.labelnames, key)} {series["count"]}')
+        return lines
+
+
+class Registry:
+    """Holds metrics and renders them in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics[name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics[name] = metric
+        return metric
+
+    def apply(self, updates: list):
+        """Record updates gathered by capture(), e.g. in a worker process"""
+        for name, value, labels in updates:
+            metric = self._metrics[name]
+            if isinstance(metric, Counter):
+                metric.inc(value, **labels)
+            else:
+                metric.observe(value, **labels)
+
+    def add_collector(self, collector):
+        """collector() returns (name, type, documentation, value) tuples read at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, metric_type, documentation, value in collector():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+STAGE_DURATION = REGISTRY.histogram(
+    'resume_matcher_stage_duration_seconds', 'Time spent in each analysis pipeline stage', ('stage',)
+)
+STAGE_ERRORS = REGISTRY.counter(
+    'resume_matcher_stage_errors_total', 'Exceptions raised by each analysis pipeline stage', ('stage',)
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    'resume_matcher_request_duration_seconds', 'HTTP request latency by route', ('method', 'path', 'status')
+)
+DOCUMENTS_PARSED = REGISTRY.counter(
+    'resume_matcher_documents_parsed_total', 'Documents run through text extraction', ('format',)
+)
+BYTES_PROCESSED = REGISTRY.counter(
+    'resume_matcher_bytes_processed_total', 'Bytes of uploaded documents run through text extraction'
+)
+TRUNCATED_DOCUMENTS = REGISTRY.counter(
+    'resume_matcher_truncated_documents_total', 'Documents cut short by the page or character cap', ('limit',)
+)
+SLOW_DOCUMENTS = REGISTRY.counter(
+    'resume_matcher_slow_documents_total', 'Documents whose text extraction exceeded the slow threshold'
+)
+REPORT_FAILURES = REGISTRY.counter(
+    'resume_matcher_report_failures_total', 'Report requests that failed to render or bundle', ('endpoint',)
+)
+
+
+@contextmanager
+def capture():
+    """Collect the metric updates made on this thread instead of recording them.
+
+    Worker processes have their own REGISTRY that is never scraped; they
+    capture what a call records and send it back for REGISTRY.apply() in
+    the server process.
+    """
+    updates = []
+    _capture.updates = updates
+    try:
+        yield updates
+    finally:
+        _capture.updates = None
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Record how long a block takes, and count it as an error if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - start, stage=stage)
+
+
+def timed_stage(stage: str):
+    """Decorator form of stage_timer"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
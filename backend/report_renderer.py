@@ -0,0 +1,156 @@
+import io
+import re
+import zipfile
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+# Styles are read-only during rendering, so one set is shared by every report
+STYLES = getSampleStyleSheet()
+
+BASIC_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+BREAKDOWN_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+SKILLS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightgreen),
+    ('BACKGROUND', (0, 1), (-1, 1), colors.lightcoral),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+QUALITY_TABLE_STYLE = BREAKDOWN_TABLE_STYLE
+
+
+def build_report_story(analysis_data: dict) -> list:
+    """Flowables for one analysis report"""
+    story = []
+
+    # Title
+    story.append(Paragraph("Resume Analysis Report", STYLES['Heading1']))
+    story.append(Spacer(1, 12))
+
+    # Basic Information - Use .get() for safe access
+    basic_info = [
+        ["Resume File", analysis_data.get('resume', 'N/A')],
+        ["Job Description File", analysis_data.get('job_description', 'N/A')],
+        ["Overall Match Score", f"{analysis_data.get('match_score', 0)}%"],
+        ["Analysis Date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+    ]
+
+    basic_table = Table(basic_info, colWidths=[200, 200])
+    basic_table.setStyle(BASIC_TABLE_STYLE)
+    story.append(basic_table)
+    story.append(Spacer(1, 12))
+
+    # Score Breakdown
+    story.append(Paragraph("Score Breakdown", STYLES['Heading2']))
+
+    breakdown_data = [["Category", "Score"]]
+    breakdown = analysis_data.get('breakdown', {})
+
+    # Add breakdown scores
+    for category, score in breakdown.items():
+        if isinstance(score, (int, float)):
+            breakdown_data.append([category.replace('_', ' ').title(), f"{score}%"])
+
+    # Add additional scores if not in breakdown
+    additional_scores = [
+        ("ATS Score", analysis_data.get('ats_analysis', {}).get('score', 0)),
+        ("Completeness Score", analysis_data.get('completeness_analysis', {}).get('score', 0)),
+        ("Action Verbs Score", analysis_data.get('action_verbs_analysis', {}).get('score', 0)),
+        ("Quantifiable Impact", analysis_data.get('quantifiable_impact_analysis', {}).get('score', 0))
+    ]
+
+    for category, score in additional_scores:
+        if score > 0:
+            breakdown_data.append([category, f"{score}%"])
+
+    breakdown_table = Table(breakdown_data, colWidths=[300, 100])
+    breakdown_table.setStyle(BREAKDOWN_TABLE_STYLE)
+    story.append(breakdown_table)
+    story.append(Spacer(1, 12))
+
+    # Skills Analysis
+    story.append(Paragraph("Skills Analysis", STYLES['Heading2']))
+
+    matched_skills = analysis_data.get('matched_keywords', [])
+    missing_skills = analysis_data.get('missing_keywords', [])
+
+    skills_data = [
+        ["Matched Skills", f"{len(matched_skills)} skills"],
+        ["Missing Skills", f"{len(missing_skills)} skills"],
+        ["Total JD Skills", f"{breakdown.get('total_jd_skills', 0)} skills"],
+        ["Coverage", f"{breakdown.get('coverage_percentage', 0)}%"]
+    ]
+
+    skills_table = Table(skills_data, colWidths=[200, 200])
+    skills_table.setStyle(SKILLS_TABLE_STYLE)
+    story.append(skills_table)
+    story.append(Spacer(1, 12))
+
+    # Quality Analysis
+    story.append(Paragraph("Resume Quality Analysis", STYLES['Heading2']))
+
+    quality_data = [
+        ["ATS Score", f"{analysis_data.get('ats_analysis', {}).get('score', 0)}%"],
+        ["Section Completeness", f"{analysis_data.get('completeness_analysis', {}).get('score', 0)}%"],
+        ["Action Verbs Score", f"{analysis_data.get('action_verbs_analysis', {}).get('score', 0)}%"],
+        ["Quantifiable Impact", f"{analysis_data.get('quantifiable_impact_analysis', {}).get('score', 0)}%"]
+    ]
+
+    quality_table = Table(quality_data, colWidths=[200, 200])
+    quality_table.setStyle(QUALITY_TABLE_STYLE)
+    story.append(quality_table)
+    story.append(Spacer(1, 12))
+
+    # Improvement Suggestions
+    story.append(Paragraph("Improvement Suggestions", STYLES['Heading2']))
+
+    suggestions = analysis_data.get('improvement_suggestions', [])
+    if suggestions:
+        for i, suggestion in enumerate(suggestions[:6], 1):
+            story.append(Paragraph(f"{i}. {suggestion}", STYLES['BodyText']))
+    else:
+        story.append(Paragraph("No specific suggestions available.", STYLES['BodyText']))
+
+    return story
+
+
+def render_report(analysis_data: dict) -> bytes:
+    """Render one analysis report to PDF bytes in memory"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build(build_report_story(analysis_data))
+    return buffer.getvalue()
+
+
+def report_filename(analysis_data: dict, index: int) -> str:
+    """Name for a report inside a batch ZIP, derived from the resume file name"""
+    stem = re.sub(r'[^A-Za-z0-9_-]+', '_', str(analysis_data.get('resume', 'resume')).rsplit('.', 1)[0])
+    return f"{index + 1:03d}_{stem.strip('_') or 'resume'}_report.pdf"
+
+
+def bundle_reports(reports: list) -> bytes:
+    """Pack (filename, pdf bytes) pairs into one ZIP in memory"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for filename, pdf in reports:
+            archive.writestr(filename, pdf)
+    return buffer.getvalue()
@@ -0,0 +1,150 @@
+import json
+import sqlite3
+
+from database import ConnectionPool
+
+# Share of the final score contributed by the quality checks (see calculate_match_score)
+QUALITY_WEIGHTS = {
+    'ats_score': 0.15,
+    'completeness_score': 0.10,
+    'action_verbs_score': 0.10,
+    'quantifiable_impact_score': 0.15
+}
+
+# Separator for group_concat; cannot appear in normalized keywords
+KEYWORD_SEPARATOR = '\x1f'
+
+
+class ResumeCorpus:
+    """Stored resumes with their keyword sets, quality scores and a keyword -> resume inverted index"""
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    @staticmethod
+    def create_schema(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS resume_corpus (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_hash TEXT NOT NULL UNIQUE,
+                filename TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                ats_score REAL NOT NULL,
+                completeness_score REAL NOT NULL,
+                action_verbs_score REAL NOT NULL,
+                quantifiable_impact_score REAL NOT NULL,
+                quality_points REAL NOT NULL,
+                experience_years INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS resume_keywords (
+                keyword TEXT NOT NULL,
+                resume_id INTEGER NOT NULL,
+                PRIMARY KEY (keyword, resume_id)
+            ) WITHOUT ROWID
+        ''')
+        conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_resume_corpus_quality ON resume_corpus(quality_points DESC)'
+        )
+        conn.commit()
+
+    def add_resume(self, content_hash: str, filename: str, skills: dict, scores: dict,
+                   experience_years: int = 0) -> tuple:
+        """Store a resume and index its keywords. Returns (resume_id, created)"""
+        quality_points = sum(scores[name] * weight for name, weight in QUALITY_WEIGHTS.items())
+        with self.pool.connection() as conn:
+            with conn:
+                row = conn.execute(
+                    'SELECT id FROM resume_corpus WHERE content_hash = ?', (content_hash,)
+                ).fetchone()
+                if row is not None:
+                    return row['id'], False
+
+                cursor = conn.execute(
+                    """INSERT INTO resume_corpus
+                       (content_hash, filename, skills, ats_score, completeness_score,
+                        action_verbs_score, quantifiable_impact_score, quality_points, experience_years)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (content_hash, filename, json.dumps(skills), scores['ats_score'],
+                     scores['completeness_score'], scores['action_verbs_score'],
+                     scores['quantifiable_impact_score'], quality_points, experience_years)
+                )
+                resume_id = cursor.lastrowid
+                conn.executemany(
+                    'INSERT OR IGNORE INTO resume_keywords (keyword, resume_id) VALUES (?, ?)',
+                    [(keyword, resume_id) for keyword in skills]
+                )
+                return resume_id, True
+
+    def find_candidates(self, keywords: list) -> list:
+        """Return resumes sharing at least one keyword, with the keywords they share"""
+        if not keywords:
+            return []
+
+        placeholders = ', '.join('?' for _ in keywords)
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"""SELECT c.id, c.content_hash, c.filename, c.ats_score, c.completeness_score,
+                           c.action_verbs_score, c.quantifiable_impact_score,
+                           group_concat(k.keyword, ?) AS matched
+                    FROM resume_keywords k
+                    JOIN resume_corpus c ON c.id = k.resume_id
+                    WHERE k.keyword IN ({placeholders})
+                    GROUP BY c.id""",
+                (KEYWORD_SEPARATOR, *keywords)
+            ).fetchall()
+
+        candidates = []
+        for row in rows:
+            candidate = self._scores_from_row(row)
+            candidate['matched'] = row['matched'].split(KEYWORD_SEPARATOR)
+            candidates.append(candidate)
+        return candidates
+
+    def top_by_quality(self, limit: int, exclude: set) -> list:
+        """Best resumes by quality score alone, skipping ids in exclude"""
+        results = []
+        with self.pool.connection() as conn:
+            cursor = conn.execute(
+                """SELECT id, content_hash, filename, ats_score, completeness_score,
+                          action_verbs_score, quantifiable_impact_score
+                   FROM resume_corpus
+                   ORDER BY quality_points DESC"""
+            )
+            for row in cursor:
+                if row['id'] in exclude:
+                    continue
+                candidate = self._scores_from_row(row)
+                candidate['matched'] = []
+                results.append(candidate)
+                if len(results) >= limit:
+                    break
+        return results
+
+    def find_by_hashes(self, content_hashes: list) -> dict:
+        """Map content hashes to {'resume_id', 'filename'} for the ones stored"""
+        if not content_hashes:
+            return {}
+
+        placeholders = ', '.join('?' for _ in content_hashes)
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f'SELECT id, content_hash, filename FROM resume_corpus WHERE content_hash IN ({placeholders})',
+                content_hashes
+            ).fetchall()
+        return {row['content_hash']: {'resume_id': row['id'], 'filename': row['filename']} for row in rows}
+
+    def count(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM resume_corpus').fetchone()[0]
+
+    @staticmethod
+    def _scores_from_row(row) -> dict:
+        return {
+            'resume_id': row['id'],
+            'content_hash': row['content_hash'],
+            'filename': row['filename'],
+            'scores': {name: row[name] for name in QUALITY_WEIGHTS}
+        }
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from taxonomy import build_keyword_matcher, match_keywords
+
+TOKEN_REGEX = re.compile(r'[a-z0-9][a-z0-9+#/]*(?:\.[a-z0-9]+)*')
+
+STOP_WORDS = frozenset('''
+    a about above after all also am an and any are as at be been being below between both but by can
+    could did do does doing during each few for from had has have having he her here hers him his how
+    i if in into is it its just me more most my no nor not of off on once only or other our ours out
+    over own same she should so some such than that the their theirs them then there these they this
+    those through to too under until up very was we were what when where which while who whom why will
+    with would you your yours
+'''.split())
+
+# Rows scored per matrix product when ranking, so memory stays bounded on large indexes
+SEARCH_BLOCK_ROWS = 16384
+
+
+class SemanticEncoder:
+    """Turns text into fixed-size vectors whose dot product measures topical similarity.
+
+    Features are words, adjacent word pairs and taxonomy concepts (the
+    category of each matched term), weighted by log term frequency and hashed
+    into `dimensions` buckets. Concepts let "deep learning" and "machine
+    learning" score as related even though they share only one word. Nothing
+    is fitted on a corpus, so a document's vector depends only on its text
+    and can be cached by hash for as long as the encoder version is unchanged.
+
+    Long documents are split into overlapping word windows and the normalized
+    window vectors averaged, so one long section cannot drown out the rest.
+    """
+
+    def __init__(self, concepts: dict, dimensions: int = 1024, chunk_words: int = 150,
+                 chunk_overlap: int = 30, concept_weight: float = 2.0, cache_size: int = 1024):
+        self.dimensions = dimensions
+        self.chunk_words = chunk_words
+        self.chunk_overlap = chunk_overlap
+        self.concept_weight = concept_weight
+        self.cache_size = cache_size
+        self.concept_matcher = build_keyword_matcher(concepts)
+        self.term_concepts = {
+            term: category for category, data in concepts.items() for term in data['keywords']
+        }
+        spec = {
+            'concepts': concepts, 'dimensions': dimensions, 'chunk_words': chunk_words,
+            'chunk_overlap': chunk_overlap, 'concept_weight': concept_weight
+        }
+        self.version = hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def encode(self, text: str) -> np.ndarray:
+        """Unit-length float32 vector for text (all zeros if it has no words)"""
+        tokens = TOKEN_REGEX.findall(text.lower())
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        step = self.chunk_words - self.chunk_overlap
+        for start in range(0, max(len(tokens) - self.chunk_overlap, 1), step):
+            chunk = tokens[start:start + self.chunk_words]
+            if chunk:
+                vector += self._chunk_vector(chunk)
+        return _normalize(vector)
+
+    def encode_cached(self, text: str) -> np.ndarray:
+        """encode() with an LRU cache keyed by the text's hash"""
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self._stats['hits'] += 1
+                return vector
+            self._stats['misses'] += 1
+
+        vector = self.encode(text)
+        vector.flags.writeable = False
+        with self._lock:
+            self._cache[key] = vector
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+
+    def similarity(self, text: str, other: str) -> float:
+        """Cosine similarity of two texts, 0..1"""
+        return float(self.encode_cached(text) @ self.encode_cached(other))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, 'cached': len(self._cache), 'version': self.version}
+
+    def _chunk_vector(self, tokens: list) -> np.ndarray:
+        words = [token for token in tokens if token not in STOP_WORDS]
+        features = Counter(words)
+        features.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in features.items():
+            vector[self._bucket(feature)] += 1.0 + math.log(count)
+
+        # Concepts are matched on the raw window so multi-word terms spanning stop words still count
+        for term in match_keywords(' '.join(tokens), self.concept_matcher):
+            vector[self._bucket('concept:' + self.term_concepts[term])] += self.concept_weight
+        return _normalize(vector)
+
+    def _bucket(self, feature: str) -> int:
+        # crc32 rather than hash(), which is salted per process
+        return zlib.crc32(feature.encode('utf-8')) % self.dimensions
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+class VectorIndex:
+    """Append-only, memory-mapped matrix of unit vectors addressed by string key.
+
+    Vectors live in a raw float32 file that grows by doubling, keys in a
+    sidecar text file (line number = row). Both are named after the encoder
+    version, so changing the encoder starts a fresh index instead of mixing
+    incompatible vectors. A vector is written before its key, so a process
+    crash can at worst leave an unreferenced row that the next add overwrites.
+    """
+
+    def __init__(self, directory: str, dimensions: int, version: str):
+        os.makedirs(directory, exist_ok=True)
+        self.dimensions = dimensions
+        self.version = version
+        self.vectors_path = os.path.join(directory, f"vectors-{version}.f32")
+        self.keys_path = os.path.join(directory, f"keys-{version}.txt")
+        self._lock = threading.Lock()
+
+        self._keys = []
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, encoding='utf-8') as f:
+                self._keys = [line.rstrip('\n') for line in f if line.strip()]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+
+        self._capacity = 0
+        self._vectors = None
+        if os.path.exists(self.vectors_path):
+            self._map(os.path.getsize(self.vectors_path) // (dimensions * 4))
+        # Vectors are written before keys, so this only happens if the vectors file was replaced
+        if len(self._keys) > self._capacity:
+            raise ValueError(f"{self.vectors_path} is shorter than its key file; delete both to rebuild")
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key: str):
+        return key in self._rows
+
+    def get(self, key: str):
+        """Stored vector for key, or None"""
+        with self._lock:
+            row = self._rows.get(key)
+            return None if row is None else np.array(self._vectors[row])
+
+    def add(self, key: str, vector: np.ndarray) -> int:
+        """Store (or replace) the vector for key and return its row"""
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._keys)
+                self._grow(row + 1)
+            # Shared mapping: the write is in the file's page cache before the key is appended
+            self._vectors[row] = vector
+            if row == len(self._keys):
+                with open(self.keys_path, 'a', encoding='utf-8') as f:
+                    f.write(key + '\n')
+                self._keys.append(key)
+                self._rows[key] = row
+            return row
+
+    def similarities(self, query: np.ndarray) -> np.ndarray:
+        """Dot product of query with every stored vector, in row order"""
+        with self._lock:
+            vectors = self._vectors
+            count = len(self._keys)
+
+        scores = np.empty(count, dtype=np.float32)
+        query = np.asarray(query, dtype=np.float32)
+        for start in range(0, count, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, count)
+            scores[start:end] = vectors[start:end] @ query
+        return scores
+
+    def search(self, query: np.ndarray, top_k: int) -> list:
+        """(key, score) for the top_k most similar stored vectors, best first"""
+        scores = self.similarities(query)
+        if not len(scores):
+            return []
+        top_k = min(top_k, len(scores))
+        top_rows = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_rows = top_rows[np.argsort(-scores[top_rows], kind='stable')]
+        return [(self._keys[row], float(scores[row])) for row in top_rows]
+
+    def stats(self) -> dict:
+        # Unlocked so a scrape never waits behind add() growing the vector file
+        return {'vectors': len(self._keys), 'capacity': self._capacity, 'version': self.version}
+
+    def _grow(self, rows: int):
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, self._capacity * 2, 1024)
+        if self._vectors is not None:
+            self._vectors.flush()
+        with open(self.vectors_path, 'ab') as f:
+            f.truncate(capacity * self.dimensions * 4)
+        self._map(capacity)
+
+    def _map(self, capacity: int):
+        # Searches in flight keep the old mapping, which stays valid because the file only grows
+        self._capacity = capacity
+        self._vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode='r+', shape=(capacity, self.dimensions)
+        ) if capacity else None
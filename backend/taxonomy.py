@@ -0,0 +1,276 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from database import ConnectionPool
+
+
+def _trie_pattern(terms) -> str:
+    """Regex for a set of literal terms, nested as a character trie.
+
+    re tries alternatives one by one, so a flat "a|b|c..." alternation costs
+    O(terms) at every offset. Branching on one character at a time keeps the
+    cost per offset bounded by term length however large the taxonomy gets.
+    Greedy optional groups try the longest term first, like a longest-first
+    alternation would.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return body + '?' if len(branches) > 1 else '(?:' + body + ')?'
+        return body
+
+    return emit(trie)
+
+
+def build_keyword_matcher(*taxonomies, synonyms: dict = None) -> dict:
+    """Compile keyword taxonomies into a single regex that finds every term in one pass.
+
+    synonyms maps alternative spellings to taxonomy terms ("k8s" -> "kubernetes");
+    matches on an alias are reported under the term it stands for.
+    """
+    weights = {}
+    for taxonomy in taxonomies:
+        for category, data in taxonomy.items():
+            for keyword in data['keywords']:
+                weights[keyword] = data['weight']
+
+    canonical = {
+        alias: term for alias, term in (synonyms or {}).items() if term in weights and alias not in weights
+    }
+    terms = list(weights) + list(canonical)
+
+    # Zero-width lookahead lets overlapping terms ("scrum master", "master") all match
+    pattern = re.compile(r'\b(?=(' + _trie_pattern(terms) + r')\b)' if terms else r'(?!)')
+
+    # Shorter terms that can start at the same offset as a longer one
+    term_set = set(terms)
+    prefixes = {}
+    for term in terms:
+        shorter = [term[:i] for i in range(1, len(term)) if term[:i] in term_set]
+        if shorter:
+            prefixes[term] = [(other, re.compile(re.escape(other) + r'\b')) for other in reversed(shorter)]
+
+    return {
+        'pattern': pattern,
+        'weights': weights,
+        'order': {term: i for i, term in enumerate(weights)},
+        'canonical': canonical,
+        'prefixes': prefixes,
+        'max_term_words': max((len(term.split()) for term in terms), default=1)
+    }
+
+
+def match_keywords(text: str, matcher: dict) -> dict:
+    """Find all taxonomy terms in normalized text and return them with their weights"""
+    canonical = matcher['canonical']
+    found = set()
+    for match in matcher['pattern'].finditer(text):
+        term = match.group(1)
+        found.add(canonical.get(term, term))
+        for other, other_pattern in matcher['prefixes'].get(term, ()):
+            if canonical.get(other, other) not in found and other_pattern.match(text, match.start()):
+                found.add(canonical.get(other, other))
+
+    # Keep taxonomy order so results are stable across calls
+    weights = matcher['weights']
+    return {term: weights[term] for term in sorted(found, key=matcher['order'].__getitem__)}
+
+
+_built_snapshots = {}
+_built_lock = threading.Lock()
+
+
+def snapshot_from_spec(spec: dict) -> 'TaxonomySnapshot':
+    """Build (or reuse) the snapshot for a taxonomy spec; used when snapshots cross process boundaries"""
+    version = TaxonomySnapshot.spec_version(spec)
+    with _built_lock:
+        snapshot = _built_snapshots.get(version)
+    if snapshot is None:
+        snapshot = TaxonomySnapshot(spec)
+        with _built_lock:
+            # Keep a few so workers switching between versions during a reload don't rebuild
+            if len(_built_snapshots) >= 4:
+                _built_snapshots.pop(next(iter(_built_snapshots)))
+            _built_snapshots[version] = snapshot
+    return snapshot
+
+
+class TaxonomySnapshot:
+    """Compiled, read-only view of one taxonomy version.
+
+    Never mutated after construction, so requests can hold on to the snapshot
+    they started with while a reload swaps in a new one. Pickles as its spec,
+    so worker processes rebuild it once per version.
+    """
+
+    __slots__ = ('spec', 'version', 'skill_keywords', 'qualification_keywords', 'action_verbs',
+                 'high_value_skills', 'synonyms', 'keyword_matcher', 'action_verb_matcher', 'source', 'loaded_at')
+
+    def __init__(self, spec: dict, source: str = 'builtin'):
+        self.spec = spec
+        self.version = self.spec_version(spec)
+        self.skill_keywords = spec['skills']
+        self.qualification_keywords = spec['qualifications']
+        self.action_verbs = spec['action_verbs']
+        self.high_value_skills = list(spec['high_value_skills'])
+        self.synonyms = spec['synonyms']
+        self.keyword_matcher = build_keyword_matcher(
+            self.skill_keywords, self.qualification_keywords, synonyms=self.synonyms
+        )
+        self.action_verb_matcher = build_keyword_matcher({
+            'strong': {'keywords': self.action_verbs['strong'], 'weight': 'strong'},
+            'weak': {'keywords': self.action_verbs['weak'], 'weight': 'weak'}
+        })
+        self.source = source
+        self.loaded_at = time.time()
+
+    @staticmethod
+    def spec_version(spec: dict) -> str:
+        """Content hash of a spec; equal taxonomies get equal versions wherever they were loaded from"""
+        return hashlib.sha256(json.dumps(spec, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+    def __reduce__(self):
+        return snapshot_from_spec, (self.spec,)
+
+    def describe(self) -> dict:
+        return {
+            'version': self.version,
+            'source': self.source,
+            'loaded_at': self.loaded_at,
+            'terms': len(self.keyword_matcher['weights']),
+            'synonyms': len(self.keyword_matcher['canonical']),
+            'high_value_skills': len(self.high_value_skills)
+        }
+
+
+class TaxonomyRegistry:
+    """Holds the current taxonomy snapshot and rebuilds it from a JSON file or the database.
+
+    Sources, in order: the file at file_path if set, else the taxonomy tables
+    if they have rows, else the built-in defaults. Sections missing from the
+    source fall back to the defaults (the database holds no action verbs).
+    """
+
+    def __init__(self, defaults: dict, pool: ConnectionPool, file_path: str = None):
+        self.defaults = defaults
+        self.pool = pool
+        self.file_path = file_path
+        self._current = None
+        self._file_mtime = None
+        self._reload_lock = threading.Lock()
+
+    @staticmethod
+    def create_schema(conn: sqlite3.Connection):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS taxonomy_categories (
+                name TEXT PRIMARY KEY,
+                kind TEXT NOT NULL DEFAULT 'skill',
+                weight REAL NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS taxonomy_terms (
+                term TEXT PRIMARY KEY,
+                category TEXT NOT NULL REFERENCES taxonomy_categories(name),
+                high_value INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS taxonomy_synonyms (
+                alias TEXT PRIMARY KEY,
+                term TEXT NOT NULL
+            )
+        ''')
+        conn.commit()
+
+    def current(self) -> TaxonomySnapshot:
+        """Snapshot to use for a request; loaded on first call"""
+        snapshot = self._current
+        if snapshot is None:
+            with self._reload_lock:
+                if self._current is None:
+                    self._current = self._load()
+                snapshot = self._current
+        return snapshot
+
+    def reload(self) -> TaxonomySnapshot:
+        """Rebuild from the source and swap it in; requests already running keep their snapshot"""
+        with self._reload_lock:
+            snapshot = self._load()
+            if self._current is None or snapshot.version != self._current.version:
+                self._current = snapshot
+            return self._current
+
+    def reload_if_changed(self) -> bool:
+        """Reload when the taxonomy file was modified since it was last read"""
+        if not self.file_path:
+            return False
+        try:
+            mtime = os.path.getmtime(self.file_path)
+        except OSError:
+            return False
+        if mtime == self._file_mtime:
+            return False
+        previous = self._current
+        return self.reload() is not previous
+
+    def _load(self) -> TaxonomySnapshot:
+        if self.file_path:
+            self._file_mtime = os.path.getmtime(self.file_path)
+            with open(self.file_path) as f:
+                return TaxonomySnapshot(self._with_defaults(json.load(f)), source=f"file:{self.file_path}")
+
+        spec = self._load_from_db()
+        if spec is not None:
+            return TaxonomySnapshot(self._with_defaults(spec), source='database')
+        return TaxonomySnapshot(self._with_defaults({}), source='builtin')
+
+    def _with_defaults(self, spec: dict) -> dict:
+        return {section: spec.get(section, default) for section, default in self.defaults.items()}
+
+    def _load_from_db(self):
+        with self.pool.connection() as conn:
+            # Schema not created yet (init_db runs at startup): nothing overrides the defaults
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'taxonomy_terms'"
+            ).fetchone() is None:
+                return None
+            terms = conn.execute('''
+                SELECT t.term, c.kind, c.name, c.weight, t.high_value
+                FROM taxonomy_terms t JOIN taxonomy_categories c ON c.name = t.category
+                ORDER BY c.rowid, t.rowid
+            ''').fetchall()
+            synonyms = conn.execute('SELECT alias, term FROM taxonomy_synonyms ORDER BY alias').fetchall()
+        if not terms:
+            return None
+
+        sections = {'skill': {}, 'qualification': {}}
+        high_value = []
+        for term, kind, category, weight, is_high_value in terms:
+            categories = sections.setdefault(kind, {})
+            data = categories.setdefault(category, {'keywords': [], 'weight': weight})
+            data['keywords'].append(term)
+            if is_high_value:
+                high_value.append(term)
+
+        spec = {'skills': sections['skill'], 'qualifications': sections['qualification']}
+        if high_value:
+            spec['high_value_skills'] = high_value
+        if synonyms:
+            spec['synonyms'] = {alias: term for alias, term in synonyms}
+        return spec